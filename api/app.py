@@ -1,21 +1,34 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
 from datetime import date as Date
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from fastapi import FastAPI, HTTPException, Query
 
+from data_fetch.clients import aclose_http_clients, close_http_clients
 from data_fetch.game_story import GameStoryFetchError
 from data_fetch.play_by_play import PlayByPlayFetchError
 from data_fetch.schedule import ScheduleFetchError
 from engine.batch import summarize_date
+from engine.date_index import deferred_index_updates, wait_for_index_flushes
 from engine.summarize_game import summarize_game
 from models.game_summary import GameSummary
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="NHL Commentary API", version="1.0.0")
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Let pending index flushes finish before dropping pooled connections.
+    wait_for_index_flushes(timeout=30)
+    close_http_clients()
+    await aclose_http_clients()
+
+
+app = FastAPI(title="NHL Commentary API", version="1.0.0", lifespan=_lifespan)
 
 
 @app.get("/v1/games/{game_id}/summary", response_model=GameSummary)
@@ -25,7 +38,9 @@ def get_game_summary(
     use_ai: bool = Query(default=True),
 ) -> GameSummary:
     try:
-        return summarize_game(game_id, date=date, use_ai=use_ai)
+        # Index upkeep is flushed on a worker thread, after the response.
+        with deferred_index_updates(background=True):
+            return summarize_game(game_id, date=date, use_ai=use_ai)
     except (PlayByPlayFetchError, GameStoryFetchError) as exc:
         logger.warning("NHL API fetch failed for game %s: %s", game_id, exc)
         raise HTTPException(status_code=502, detail=str(exc))
@@ -41,7 +56,8 @@ def get_date_summaries(
 ) -> List[GameSummary]:
     date_str = date.isoformat()
     try:
-        return summarize_date(date_str, use_ai=use_ai)
+        with deferred_index_updates(background=True):
+            return summarize_date(date_str, use_ai=use_ai)
     except ScheduleFetchError as exc:
         logger.warning("Schedule fetch failed for %s: %s", date_str, exc)
         raise HTTPException(status_code=502, detail=str(exc))
@@ -17,7 +17,54 @@ class Settings:
     gcs_bucket_name: str
     openai_api_key: str
     openai_model: str
-
+    # Blob storage backend: "gcs", "local" (files under storage_local_root) or "memory"
+    storage_backend: str = "gcs"
+    storage_local_root: str = ".storage"
+    # Tiered read-through cache for raw/ blobs (0 bytes disables it)
+    raw_cache_max_bytes: int = 64 * 1024 * 1024
+    raw_cache_dir: str = ""
+    # Encoding for JSON blobs: "gzip" (default), "zstd" (needs zstandard) or "identity"
+    storage_codec: str = "gzip"
+    # Shared HTTP connection pool used for NHL API and Forge requests
+    http_max_connections: int = 32
+    http_max_keepalive_connections: int = 16
+    http_timeout: float = 10.0
+    # Per-host request governor: token-bucket rate (requests/second, 0 = off)
+    # and burst, concurrent request cap, and retries of 429/5xx responses with
+    # jittered exponential backoff starting at http_backoff_base seconds
+    http_rate_limit: float = 10.0
+    http_rate_burst: int = 20
+    http_max_in_flight: int = 16
+    http_max_retries: int = 3
+    http_backoff_base: float = 0.5
+    http_backoff_max: float = 30.0
+    # How long "no editorial recap yet" is trusted before Forge is asked again:
+    # the short TTL applies to games up to editorial_recent_days old
+    editorial_miss_ttl_recent: float = 15 * 60
+    editorial_miss_ttl_old: float = 24 * 60 * 60
+    editorial_recent_days: int = 3
+    # Schedules for dates that are not over yet are re-fetched after this many
+    # seconds; past dates whose games are all final are cached for good
+    schedule_cache_ttl: float = 300.0
+    # Cached play-by-play / game story for games that are not final are
+    # re-fetched after these many seconds (final games are cached for good)
+    live_cache_ttl: float = 30.0
+    upcoming_cache_ttl: float = 300.0
+    # Record/replay of upstream HTTP ("off", "record" or "replay"): fixtures
+    # live under http_replay_dir; replay adds http_replay_latency seconds per
+    # request and fails a seeded http_replay_error_rate fraction with 503
+    http_replay_mode: str = "off"
+    http_replay_dir: str = "fixtures/http"
+    http_replay_latency: float = 0.0
+    http_replay_error_rate: float = 0.0
+    http_replay_seed: int = 0
+    # Games summarized concurrently by engine.backfill
+    backfill_workers: int = 8
+
+
+STORAGE_BACKENDS = ("gcs", "local", "memory")
+STORAGE_CODECS = ("identity", "gzip", "zstd")
+HTTP_REPLAY_MODES = ("off", "record", "replay")
 
 _override_stack: list[Settings] = []
 _default_settings: Settings | None = None
@@ -33,10 +80,56 @@ def _build_settings() -> Settings:
     if not openai_api_key:
         raise RuntimeError("Missing OPENAI_API_KEY environment variable")
     openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    storage_backend = os.getenv("STORAGE_BACKEND", "gcs").strip().lower()
+    if storage_backend not in STORAGE_BACKENDS:
+        raise RuntimeError(
+            f"Invalid STORAGE_BACKEND {storage_backend!r}; "
+            f"expected one of {', '.join(STORAGE_BACKENDS)}"
+        )
+    storage_codec = os.getenv("STORAGE_CODEC", "gzip").strip().lower()
+    if storage_codec not in STORAGE_CODECS:
+        raise RuntimeError(
+            f"Invalid STORAGE_CODEC {storage_codec!r}; "
+            f"expected one of {', '.join(STORAGE_CODECS)}"
+        )
+    http_replay_mode = os.getenv("HTTP_REPLAY", "off").strip().lower() or "off"
+    if http_replay_mode not in HTTP_REPLAY_MODES:
+        raise RuntimeError(
+            f"Invalid HTTP_REPLAY {http_replay_mode!r}; "
+            f"expected one of {', '.join(HTTP_REPLAY_MODES)}"
+        )
     return Settings(
         gcs_bucket_name=bucket,
         openai_api_key=openai_api_key,
         openai_model=openai_model,
+        storage_backend=storage_backend,
+        storage_local_root=os.getenv("STORAGE_LOCAL_ROOT", ".storage"),
+        raw_cache_max_bytes=int(
+            os.getenv("RAW_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        ),
+        raw_cache_dir=os.getenv("RAW_CACHE_DIR", ""),
+        storage_codec=storage_codec,
+        http_max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "32")),
+        http_max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "16")),
+        http_timeout=float(os.getenv("HTTP_TIMEOUT", "10")),
+        http_rate_limit=float(os.getenv("HTTP_RATE_LIMIT", "10")),
+        http_rate_burst=int(os.getenv("HTTP_RATE_BURST", "20")),
+        http_max_in_flight=int(os.getenv("HTTP_MAX_IN_FLIGHT", "16")),
+        http_max_retries=int(os.getenv("HTTP_MAX_RETRIES", "3")),
+        http_backoff_base=float(os.getenv("HTTP_BACKOFF_BASE", "0.5")),
+        http_backoff_max=float(os.getenv("HTTP_BACKOFF_MAX", "30")),
+        editorial_miss_ttl_recent=float(os.getenv("EDITORIAL_MISS_TTL", "900")),
+        editorial_miss_ttl_old=float(os.getenv("EDITORIAL_MISS_TTL_OLD", "86400")),
+        editorial_recent_days=int(os.getenv("EDITORIAL_RECENT_DAYS", "3")),
+        schedule_cache_ttl=float(os.getenv("SCHEDULE_CACHE_TTL", "300")),
+        live_cache_ttl=float(os.getenv("LIVE_CACHE_TTL", "30")),
+        upcoming_cache_ttl=float(os.getenv("UPCOMING_CACHE_TTL", "300")),
+        http_replay_mode=http_replay_mode,
+        http_replay_dir=os.getenv("HTTP_REPLAY_DIR", "fixtures/http"),
+        http_replay_latency=float(os.getenv("HTTP_REPLAY_LATENCY", "0")),
+        http_replay_error_rate=float(os.getenv("HTTP_REPLAY_ERROR_RATE", "0")),
+        http_replay_seed=int(os.getenv("HTTP_REPLAY_SEED", "0")),
+        backfill_workers=int(os.getenv("BACKFILL_WORKERS", "8")),
     )
 
 
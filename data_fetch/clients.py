@@ -0,0 +1,412 @@
+"""Process-wide HTTP clients for the NHL web API and the Forge content API.
+
+Every fetcher shares one pooled ``httpx.Client`` so keep-alive connections
+and TLS sessions are reused across calls and threads instead of being
+re-established per request; async code gets the same from
+``get_async_http_client``. ``NHLApiClient`` mirrors the parts of
+``nhlpy.NHLClient`` this project uses (same method names and response
+shapes) on top of that pool; nhlpy opens a fresh connection per call.
+
+``*_if_modified`` endpoints make conditional requests from the ``ETag`` /
+``Last-Modified`` validators of an earlier response, so refreshing an
+unchanged payload costs a bodiless 304 instead of a full download.
+
+Both pools send through a governed transport, so every request is subject
+to its host's rate limit, concurrency cap and retry policy
+(see ``data_fetch.rate_limit``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional
+
+from config import get_settings
+
+from .rate_limit import get_governor
+from .replay import wrap_async_transport, wrap_transport
+
+try:  # pragma: no cover - optional dependency
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+NHL_API_BASE_URL = "https://api-web.nhle.com/v1"
+
+_lock = threading.Lock()
+_http_client: Optional["httpx.Client"] = None
+_nhl_client: Optional["NHLApiClient"] = None
+_async_nhl_client: Optional["AsyncNHLApiClient"] = None
+_async_http_clients: "weakref.WeakKeyDictionary[Any, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _require_httpx():
+    if httpx is None:
+        raise RuntimeError(
+            "httpx is required for NHL API access. Run: pip install httpx"
+        )
+    return httpx
+
+
+# Only idempotent requests are retried on 429/5xx
+_RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+if httpx is not None:
+
+    class _GovernedTransport(httpx.BaseTransport):
+        """Send each request through its host's ``HostGovernor``."""
+
+        def __init__(self, inner: httpx.BaseTransport) -> None:
+            self._inner = inner
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            return get_governor(request.url.host).send(
+                lambda: self._inner.handle_request(request),
+                lambda resp: resp.close(),
+                retry=request.method in _RETRY_METHODS,
+            )
+
+        def close(self) -> None:
+            self._inner.close()
+
+    class _AsyncGovernedTransport(httpx.AsyncBaseTransport):
+        """Async ``_GovernedTransport``."""
+
+        def __init__(self, inner: httpx.AsyncBaseTransport) -> None:
+            self._inner = inner
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            return await get_governor(request.url.host).send_async(
+                lambda: self._inner.handle_async_request(request),
+                lambda resp: resp.aclose(),
+                retry=request.method in _RETRY_METHODS,
+            )
+
+        async def aclose(self) -> None:
+            await self._inner.aclose()
+
+
+def _limits(lib: Any) -> Any:
+    settings = get_settings()
+    return lib.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+    )
+
+
+def _pool_options() -> Dict[str, Any]:
+    return {
+        "timeout": get_settings().http_timeout,
+        "follow_redirects": True,
+        "headers": {"Accept": "application/json"},
+    }
+
+
+def _make_http_client() -> "httpx.Client":
+    lib = _require_httpx()
+    transport = _GovernedTransport(
+        wrap_transport(lib.HTTPTransport(limits=_limits(lib)))
+    )
+    return lib.Client(transport=transport, **_pool_options())
+
+
+def get_http_client() -> "httpx.Client":
+    """Return the shared, thread-safe pooled HTTP client (created on first use)."""
+    global _http_client
+    client = _http_client
+    if client is None or client.is_closed:
+        with _lock:
+            if _http_client is None or _http_client.is_closed:
+                _http_client = _make_http_client()
+            client = _http_client
+    return client
+
+
+def get_async_http_client() -> "httpx.AsyncClient":
+    """Return the pooled async HTTP client for the running event loop.
+
+    ``httpx.AsyncClient`` connections belong to the loop that opened them, so
+    each loop gets its own pool (normally there is just one).
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None or client.is_closed:
+        lib = _require_httpx()
+        transport = _AsyncGovernedTransport(
+            wrap_async_transport(lib.AsyncHTTPTransport(limits=_limits(lib)))
+        )
+        client = lib.AsyncClient(transport=transport, **_pool_options())
+        _async_http_clients[loop] = client
+    return client
+
+
+# Response validators, stored as blob metadata next to cached payloads
+ETAG_METADATA_KEY = "etag"
+LAST_MODIFIED_METADATA_KEY = "lastModified"
+_VALIDATOR_HEADERS = {
+    ETAG_METADATA_KEY: ("ETag", "If-None-Match"),
+    LAST_MODIFIED_METADATA_KEY: ("Last-Modified", "If-Modified-Since"),
+}
+
+
+class Conditional(NamedTuple):
+    """Result of a conditional GET: ``data`` is None when not modified."""
+
+    data: Any
+    validators: Dict[str, str]
+
+    @property
+    def not_modified(self) -> bool:
+        return self.data is None
+
+
+def validators_from(metadata: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """Pick the stored response validators out of blob ``metadata``."""
+    return {k: metadata[k] for k in _VALIDATOR_HEADERS if metadata and metadata.get(k)}
+
+
+def conditional_headers(validators: Mapping[str, str]) -> Dict[str, str]:
+    """Request headers that ask upstream to answer 304 if nothing changed."""
+    return {
+        request_header: validators[key]
+        for key, (_, request_header) in _VALIDATOR_HEADERS.items()
+        if validators.get(key)
+    }
+
+
+def _conditional(resp: Any, validators: Mapping[str, str]) -> Conditional:
+    if resp.status_code == 304:
+        return Conditional(None, dict(validators))
+    resp.raise_for_status()
+    found = {
+        key: resp.headers[header]
+        for key, (header, _) in _VALIDATOR_HEADERS.items()
+        if resp.headers.get(header)
+    }
+    return Conditional(resp.json(), found)
+
+
+def schedule_day(data: Dict[str, Any], date: Optional[str]) -> Dict[str, Any]:
+    """Reduce a ``schedule/{date}`` week payload to nhlpy's single-day shape."""
+    day = next(
+        (d for d in data.get("gameWeek") or [] if not date or d.get("date") == date),
+        None,
+    )
+    games = (day or {}).get("games") or []
+    return {
+        "date": date or (day or {}).get("date"),
+        "games": games,
+        "numberOfGames": len(games),
+        "nextStartDate": data.get("nextStartDate"),
+        "previousStartDate": data.get("previousStartDate"),
+    }
+
+
+# The endpoint groups return whatever the owning client's ``_request`` returns:
+# decoded JSON for NHLApiClient, an awaitable of it for AsyncNHLApiClient.
+class _GameCenter:
+    def __init__(self, api: Any) -> None:
+        self._api = api
+
+    def play_by_play(self, game_id: int | str) -> Any:
+        return self._api._request(f"gamecenter/{game_id}/play-by-play")
+
+    def game_story(self, game_id: int | str) -> Any:
+        return self._api._request(f"wsc/game-story/{game_id}")
+
+    def right_rail(self, game_id: int | str) -> Any:
+        return self._api._request(f"gamecenter/{game_id}/right-rail")
+
+    def play_by_play_if_modified(
+        self, game_id: int | str, validators: Optional[Mapping[str, str]] = None
+    ) -> Any:
+        """``play_by_play`` as a ``Conditional`` (no body if unchanged)."""
+        return self._api._request_if_modified(
+            f"gamecenter/{game_id}/play-by-play", validators or {}
+        )
+
+    def game_story_if_modified(
+        self, game_id: int | str, validators: Optional[Mapping[str, str]] = None
+    ) -> Any:
+        """``game_story`` as a ``Conditional`` (no body if unchanged)."""
+        return self._api._request_if_modified(
+            f"wsc/game-story/{game_id}", validators or {}
+        )
+
+
+class _Schedule:
+    def __init__(self, api: Any) -> None:
+        self._api = api
+
+    def get_schedule(self, date: Optional[str] = None) -> Any:
+        """Return ``{"date", "games": [...]}`` for one day (today when omitted)."""
+        return self._api._request(
+            f"schedule/{date or 'now'}", lambda data: schedule_day(data, date)
+        )
+
+    def get_schedule_week(self, date: Optional[str] = None) -> Any:
+        """Return the raw ``gameWeek`` payload (one entry per day) from ``date``."""
+        return self._api._request(f"schedule/{date or 'now'}")
+
+
+class _Standings:
+    def __init__(self, api: Any) -> None:
+        self._api = api
+
+    def get_standings(self, date: Optional[str] = None) -> Any:
+        return self._api._request(f"standings/{date or 'now'}")
+
+
+def _identity(data: Any) -> Any:
+    return data
+
+
+class NHLApiClient:
+    """Minimal NHL web API client backed by a shared ``httpx.Client``."""
+
+    def __init__(
+        self,
+        http: Optional["httpx.Client"] = None,
+        *,
+        base_url: str = NHL_API_BASE_URL,
+    ) -> None:
+        self._http = http
+        self.base_url = base_url.rstrip("/")
+        self.game_center = _GameCenter(self)
+        self.schedule = _Schedule(self)
+        self.standings = _Standings(self)
+
+    def get_json(self, path: str) -> Any:
+        """GET ``base_url/path`` and return the decoded JSON body.
+
+        Raises:
+            httpx.HTTPStatusError: On 4xx/5xx responses.
+        """
+        http = self._http or get_http_client()
+        resp = http.get(f"{self.base_url}/{path.lstrip('/')}")
+        resp.raise_for_status()
+        return resp.json()
+
+    def _request(self, path: str, transform: Callable[[Any], Any] = _identity) -> Any:
+        return transform(self.get_json(path))
+
+    def _request_if_modified(
+        self, path: str, validators: Mapping[str, str]
+    ) -> Conditional:
+        http = self._http or get_http_client()
+        resp = http.get(
+            f"{self.base_url}/{path.lstrip('/')}",
+            headers=conditional_headers(validators),
+        )
+        return _conditional(resp, validators)
+
+
+class AsyncNHLApiClient:
+    """Async counterpart of ``NHLApiClient``; every endpoint is awaitable."""
+
+    def __init__(
+        self,
+        http: Optional["httpx.AsyncClient"] = None,
+        *,
+        base_url: str = NHL_API_BASE_URL,
+    ) -> None:
+        self._http = http
+        self.base_url = base_url.rstrip("/")
+        self.game_center = _GameCenter(self)
+        self.schedule = _Schedule(self)
+        self.standings = _Standings(self)
+
+    async def get_json(self, path: str) -> Any:
+        """GET ``base_url/path`` and return the decoded JSON body.
+
+        Raises:
+            httpx.HTTPStatusError: On 4xx/5xx responses.
+        """
+        http = self._http or get_async_http_client()
+        resp = await http.get(f"{self.base_url}/{path.lstrip('/')}")
+        resp.raise_for_status()
+        return resp.json()
+
+    async def _request(
+        self, path: str, transform: Callable[[Any], Any] = _identity
+    ) -> Any:
+        return transform(await self.get_json(path))
+
+    async def _request_if_modified(
+        self, path: str, validators: Mapping[str, str]
+    ) -> Conditional:
+        http = self._http or get_async_http_client()
+        resp = await http.get(
+            f"{self.base_url}/{path.lstrip('/')}",
+            headers=conditional_headers(validators),
+        )
+        return _conditional(resp, validators)
+
+
+def get_nhl_client() -> NHLApiClient:
+    """Return the process-wide NHL API client."""
+    global _nhl_client
+    if _nhl_client is None:
+        with _lock:
+            if _nhl_client is None:
+                _nhl_client = NHLApiClient()
+    return _nhl_client
+
+
+def get_async_nhl_client() -> AsyncNHLApiClient:
+    """Return the process-wide async NHL API client."""
+    global _async_nhl_client
+    if _async_nhl_client is None:
+        with _lock:
+            if _async_nhl_client is None:
+                _async_nhl_client = AsyncNHLApiClient()
+    return _async_nhl_client
+
+
+async def aclose_http_clients() -> None:
+    """Close the running loop's async pool (e.g. on application shutdown)."""
+    client = _async_http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_http_clients() -> None:
+    """Close pooled connections; the next call opens a fresh pool."""
+    global _http_client
+    with _lock:
+        client, _http_client = _http_client, None
+    if client is not None:
+        try:
+            client.close()
+        except Exception:  # pragma: no cover - best effort at shutdown
+            logger.debug("Error closing shared HTTP client", exc_info=True)
+
+
+atexit.register(close_http_clients)
+
+
+__all__ = [
+    "ETAG_METADATA_KEY",
+    "LAST_MODIFIED_METADATA_KEY",
+    "NHL_API_BASE_URL",
+    "AsyncNHLApiClient",
+    "Conditional",
+    "NHLApiClient",
+    "aclose_http_clients",
+    "close_http_clients",
+    "conditional_headers",
+    "get_async_http_client",
+    "get_async_nhl_client",
+    "get_http_client",
+    "get_nhl_client",
+    "schedule_day",
+    "validators_from",
+]
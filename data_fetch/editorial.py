@@ -1,17 +1,37 @@
-"""Fetch NHL editorial game recaps from the NHL Forge DAPI."""
+"""Fetch NHL editorial game recaps from the NHL Forge DAPI.
+
+Recaps are cached under ``raw/``. A lookup that finds no recap is cached
+too, in memory and as a small marker blob, for a TTL from ``Settings``: short
+for recent games (a recap may land any minute), long for old ones.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date as Date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from config import get_settings
-from gcp_ingestion import check_file_exists, download_json, upload_json
+from gcp_ingestion import (
+    delete_blob,
+    download_json_or_none,
+    exists_many,
+    upload_json,
+    upload_many,
+)
+
+from .clients import get_async_http_client, get_http_client
 
 try:  # engine module may not be available in all runtimes
-    from engine.date_index import mark_artifact
+    from engine.date_index import IndexUpdate, mark_artifact, queue_index_updates
 except Exception:  # pragma: no cover - optional dependency
     mark_artifact = None  # type: ignore[assignment]
+    queue_index_updates = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +39,25 @@ FORGE_INDEX_URL = (
     "https://forge-dapi.d3.nhle.com/v2/content/en-us/stories"
     "?context.slug=nhl&tags.slug=gameid-{game_id}&$limit=1"
 )
+# Slate lookups: a comma-separated tag list matches stories carrying any tag
+FORGE_BATCH_INDEX_URL = (
+    "https://forge-dapi.d3.nhle.com/v2/content/en-us/stories"
+    "?context.slug=nhl&tags.slug={tags}&$limit={limit}&$skip={skip}"
+)
 FORGE_STORY_URL = "https://forge-dapi.d3.nhle.com{self_url}"
 
 EDITORIAL_BLOB = "raw/editorial/{game_id}.json"
+# Kept outside raw/: a marker is deleted once its recap lands, and copies in
+# other processes' raw/ cache tiers would outlive the delete
+EDITORIAL_MISS_BLOB = "misses/editorial/{game_id}.json"
 
 _HTTPX_TIMEOUT = 15.0
 
+_BATCH_TAGS_PER_QUERY = 20
+_BATCH_PAGE_SIZE = 50
+_BATCH_MAX_PAGES = 5
+_PREFETCH_MAX_WORKERS = 8
+
 
 class EditorialFetchError(Exception):
     """Raised when fetching editorial content fails unexpectedly."""
@@ -34,6 +67,83 @@ def _bucket_name() -> str:
     return get_settings().gcs_bucket_name
 
 
+_misses: Dict[int, float] = {}  # game_id -> expiry (epoch seconds)
+_misses_lock = threading.Lock()
+
+
+def clear_editorial_misses() -> None:
+    """Forget in-memory "no recap yet" entries (marker blobs are kept)."""
+    with _misses_lock:
+        _misses.clear()
+
+
+def _miss_ttl(date: Optional[str]) -> float:
+    """Seconds to trust a miss; games of unknown date count as recent."""
+    settings = get_settings()
+    try:
+        age_days = (Date.today() - Date.fromisoformat(date or "")).days
+    except ValueError:
+        return settings.editorial_miss_ttl_recent
+    if age_days > settings.editorial_recent_days:
+        return settings.editorial_miss_ttl_old
+    return settings.editorial_miss_ttl_recent
+
+
+def _known_miss(game_id: int) -> Optional[bool]:
+    """True while a miss is cached, False if it expired, None if never seen.
+
+    Checks memory first, then the marker blob. Read errors count as unseen.
+    """
+    now = time.time()
+    with _misses_lock:
+        expires_at = _misses.get(game_id)
+    if expires_at is None:
+        try:
+            marker = download_json_or_none(
+                _bucket_name(), EDITORIAL_MISS_BLOB.format(game_id=game_id)
+            )
+        except Exception:
+            return None
+        if not isinstance(marker, dict) or "expires_at" not in marker:
+            return None
+        expires_at = float(marker["expires_at"])
+        with _misses_lock:
+            _misses[game_id] = expires_at
+    return expires_at > now
+
+
+def _miss_marker(game_id: int, date: Optional[str]) -> Dict[str, Any]:
+    """Remember "no recap yet" in memory and return the marker to persist."""
+    now = time.time()
+    expires_at = now + _miss_ttl(date)
+    with _misses_lock:
+        _misses[game_id] = expires_at
+    return {"game_id": game_id, "checked_at": now, "expires_at": expires_at}
+
+
+def _record_miss(game_id: int, date: Optional[str]) -> None:
+    """Cache "no recap yet" in memory and, best effort, as a marker blob."""
+    marker = _miss_marker(game_id, date)
+    try:
+        upload_json(_bucket_name(), EDITORIAL_MISS_BLOB.format(game_id=game_id), marker)
+    except Exception:
+        logger.warning(
+            "Failed to upload editorial miss marker for game %s",
+            game_id,
+            exc_info=True,
+        )
+
+
+def _clear_miss(game_id: int) -> None:
+    """Drop an expired miss once the recap has been found."""
+    with _misses_lock:
+        _misses.pop(game_id, None)
+    try:
+        delete_blob(_bucket_name(), EDITORIAL_MISS_BLOB.format(game_id=game_id))
+    except Exception:
+        logger.debug("Failed to delete editorial miss marker", exc_info=True)
+
+
 def _extract_body(story: Dict[str, Any]) -> str:
     """Concatenate all markdown parts from a Forge DAPI story into plain text."""
     parts = story.get("parts", [])
@@ -46,30 +156,102 @@ def _extract_body(story: Dict[str, Any]) -> str:
     return "\n\n".join(chunks)
 
 
-def _fetch_from_forge(game_id: int) -> Optional[Dict[str, Any]]:
-    """Fetch editorial data from Forge DAPI. Returns None if no recap exists."""
+def _require_httpx() -> None:
     try:
-        import httpx
+        import httpx  # noqa: F401
     except ImportError as exc:  # pragma: no cover
         raise EditorialFetchError(
             "httpx is required for editorial fetch. Run: pip install httpx"
         ) from exc
 
-    # Step 1: search for story by game tag
-    index_url = FORGE_INDEX_URL.format(game_id=game_id)
+
+@contextmanager
+def _forge_errors(what: str, game_id: int) -> Iterator[None]:
+    """Map a failed Forge ``what`` ("index" or "story") request to our error."""
+    import httpx
+
     try:
-        resp = httpx.get(index_url, timeout=_HTTPX_TIMEOUT, follow_redirects=True)
-        resp.raise_for_status()
-        index_data = resp.json()
+        yield
     except (httpx.HTTPStatusError, httpx.TimeoutException) as exc:
         raise EditorialFetchError(
-            f"Forge DAPI index request failed for game {game_id}: {exc}"
+            f"Forge DAPI {what} request failed for game {game_id}: {exc}"
         ) from exc
     except Exception as exc:
         raise EditorialFetchError(
-            f"Failed to fetch editorial index for game {game_id}: {exc}"
+            f"Failed to fetch editorial {what} for game {game_id}: {exc}"
         ) from exc
 
+
+def _story_url(item: Dict[str, Any]) -> str:
+    return FORGE_STORY_URL.format(self_url=item["selfUrl"])
+
+
+# The sync and async Forge fetchers share every step but the requests
+
+
+def _fetch_from_forge(game_id: int) -> Optional[Dict[str, Any]]:
+    """Fetch editorial data from Forge DAPI. Returns None if no recap exists."""
+    _require_httpx()
+
+    # Step 1: search for story by game tag
+    with _forge_errors("index", game_id):
+        client = get_http_client()
+        resp = client.get(
+            FORGE_INDEX_URL.format(game_id=game_id),
+            timeout=_HTTPX_TIMEOUT,
+            follow_redirects=True,
+        )
+        resp.raise_for_status()
+        index_data = resp.json()
+
+    item = _index_item(index_data, game_id)
+    if item is None:
+        return None
+
+    # Step 2: fetch the full story for the body text
+    return _to_editorial(game_id, item, _fetch_story(client, item, game_id))
+
+
+def _fetch_story(client: Any, item: Dict[str, Any], game_id: int) -> Dict[str, Any]:
+    """GET the full Forge story behind an index item."""
+    with _forge_errors("story", game_id):
+        resp = client.get(
+            _story_url(item), timeout=_HTTPX_TIMEOUT, follow_redirects=True
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+
+async def _fetch_from_forge_async(game_id: int) -> Optional[Dict[str, Any]]:
+    """Async ``_fetch_from_forge`` on the pooled ``httpx.AsyncClient``."""
+    _require_httpx()
+
+    with _forge_errors("index", game_id):
+        client = get_async_http_client()
+        resp = await client.get(
+            FORGE_INDEX_URL.format(game_id=game_id),
+            timeout=_HTTPX_TIMEOUT,
+            follow_redirects=True,
+        )
+        resp.raise_for_status()
+        index_data = resp.json()
+
+    item = _index_item(index_data, game_id)
+    if item is None:
+        return None
+
+    with _forge_errors("story", game_id):
+        resp = await client.get(
+            _story_url(item), timeout=_HTTPX_TIMEOUT, follow_redirects=True
+        )
+        resp.raise_for_status()
+        story_data = resp.json()
+
+    return _to_editorial(game_id, item, story_data)
+
+
+def _index_item(index_data: Dict[str, Any], game_id: int) -> Optional[Dict[str, Any]]:
+    """Return the first index item with its ``selfUrl`` resolved, or None."""
     items = index_data.get("items", [])
     if not items:
         logger.debug("No editorial found for game %s", game_id)
@@ -80,7 +262,13 @@ def _fetch_from_forge(game_id: int) -> Optional[Dict[str, Any]]:
     if not self_url:
         logger.debug("Editorial index item missing selfUrl for game %s", game_id)
         return None
+    return {**item, "selfUrl": self_url}
+
 
+def _to_editorial(
+    game_id: int, item: Dict[str, Any], story_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build the cached editorial record from an index item and its story."""
     headline = item.get("headline", {})
     if isinstance(headline, dict):
         headline_text = headline.get("default", "")
@@ -95,21 +283,6 @@ def _fetch_from_forge(game_id: int) -> Optional[Dict[str, Any]]:
 
     content_date = item.get("contentDate") or item.get("date", "")
 
-    # Step 2: fetch the full story for the body text
-    story_url = FORGE_STORY_URL.format(self_url=self_url)
-    try:
-        resp2 = httpx.get(story_url, timeout=_HTTPX_TIMEOUT, follow_redirects=True)
-        resp2.raise_for_status()
-        story_data = resp2.json()
-    except (httpx.HTTPStatusError, httpx.TimeoutException) as exc:
-        raise EditorialFetchError(
-            f"Forge DAPI story request failed for game {game_id}: {exc}"
-        ) from exc
-    except Exception as exc:
-        raise EditorialFetchError(
-            f"Failed to fetch editorial story for game {game_id}: {exc}"
-        ) from exc
-
     body = _extract_body(story_data)
 
     return {
@@ -117,7 +290,7 @@ def _fetch_from_forge(game_id: int) -> Optional[Dict[str, Any]]:
         "headline": headline_text,
         "summary": summary_text,
         "body": body,
-        "self_url": self_url,
+        "self_url": item["selfUrl"],
         "content_date": content_date,
     }
 
@@ -152,6 +325,40 @@ def _maybe_mark_index(
         )
 
 
+def _lookup(game_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[bool]]:
+    """Return the cached recap, or None and what ``_known_miss`` says."""
+    try:
+        cached = download_json_or_none(
+            _bucket_name(), EDITORIAL_BLOB.format(game_id=game_id)
+        )
+    except Exception:
+        cached = None  # fall through to a live fetch on cache read errors
+    if isinstance(cached, dict):
+        return cached, None
+    return None, _known_miss(game_id)
+
+
+def _settle(
+    game_id: int,
+    date: Optional[str],
+    editorial: Optional[Dict[str, Any]],
+    seen_miss: Optional[bool],
+) -> None:
+    """Cache what Forge returned: the recap, or that there is none yet."""
+    if editorial is None:
+        # No recap published yet — not an error; remember it for a while
+        _record_miss(game_id, date)
+        return
+    if seen_miss is False:
+        _clear_miss(game_id)
+    try:
+        upload_json(_bucket_name(), EDITORIAL_BLOB.format(game_id=game_id), editorial)
+    except Exception:
+        logger.warning(
+            "Failed to upload editorial cache for game %s", game_id, exc_info=True
+        )
+
+
 def get_editorial(
     game_id: int,
     *,
@@ -168,7 +375,8 @@ def get_editorial(
 
     Args:
         game_id: Unique NHL game identifier.
-        force_refresh: Bypass cache and fetch from Forge DAPI.
+        force_refresh: Bypass both caches (recap and "no recap yet") and
+            fetch from Forge DAPI.
         date: YYYY-MM-DD for index marking (optional).
         away_abbr: Away team abbreviation for index (optional).
         home_abbr: Home team abbreviation for index (optional).
@@ -181,49 +389,209 @@ def get_editorial(
     Raises:
         EditorialFetchError: On unexpected fetch or parsing failures.
     """
-    blob_path = EDITORIAL_BLOB.format(game_id=game_id)
-    bucket = _bucket_name()
-
-    # 1) Cache hit
-    if not force_refresh and check_file_exists(bucket, blob_path):
-        try:
-            cached = download_json(bucket, blob_path)
-            if isinstance(cached, dict):
-                _maybe_mark_index(
-                    game_id=game_id,
-                    date=date,
-                    away_abbr=away_abbr,
-                    home_abbr=home_abbr,
-                    mark=mark_index,
-                )
-                return cached
-        except Exception:
-            pass  # Fall through to live fetch on cache read error
-
-    # 2) Fetch from Forge DAPI
-    editorial = _fetch_from_forge(game_id)
+    # 1) Cached recap, else 2) a recent "no recap yet"
+    recap, seen_miss = (None, None) if force_refresh else _lookup(game_id)
+    if recap is None and not seen_miss:
+        # 3) Fetch from Forge DAPI, 4) cache the outcome
+        recap = _fetch_from_forge(game_id)
+        _settle(game_id, date, recap, seen_miss)
+    if recap is not None:
+        _maybe_mark_index(
+            game_id=game_id,
+            date=date,
+            away_abbr=away_abbr,
+            home_abbr=home_abbr,
+            mark=mark_index,
+        )
+    return recap
 
-    if editorial is None:
-        # No recap published yet — not an error, don't cache the absence
-        return None
 
-    # 3) Best-effort cache write
-    try:
-        upload_json(bucket, blob_path, editorial)
-    except Exception:
-        logger.warning(
-            "Failed to upload editorial cache for game %s", game_id, exc_info=True
-        )
+async def get_editorial_async(
+    game_id: int,
+    *,
+    force_refresh: bool = False,
+    date: Optional[str] = None,
+    away_abbr: Optional[str] = None,
+    home_abbr: Optional[str] = None,
+    mark_index: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """Async ``get_editorial``; returns None when no recap is published yet.
 
-    _maybe_mark_index(
-        game_id=game_id,
-        date=date,
-        away_abbr=away_abbr,
-        home_abbr=home_abbr,
-        mark=mark_index,
+    Raises:
+        EditorialFetchError: On unexpected fetch or parsing failures.
+    """
+    recap, seen_miss = (
+        (None, None) if force_refresh else await asyncio.to_thread(_lookup, game_id)
     )
+    if recap is None and not seen_miss:
+        recap = await _fetch_from_forge_async(game_id)
+        await asyncio.to_thread(_settle, game_id, date, recap, seen_miss)
+    if recap is not None:
+        await asyncio.to_thread(
+            _maybe_mark_index,
+            game_id=game_id,
+            date=date,
+            away_abbr=away_abbr,
+            home_abbr=home_abbr,
+            mark=mark_index,
+        )
+    return recap
+
+
+def _game_ids_in(item: Dict[str, Any]) -> List[int]:
+    """Game ids from an index item's ``gameid-<id>`` tags."""
+    ids = []
+    for tag in item.get("tags") or []:
+        slug = tag.get("slug", "") if isinstance(tag, dict) else str(tag)
+        prefix, _, value = slug.partition("-")
+        if prefix == "gameid" and value.isdigit():
+            ids.append(int(value))
+    return ids
+
+
+def _batch_index(
+    client: Any, game_ids: List[int]
+) -> Tuple[Dict[int, Dict[str, Any]], Set[int]]:
+    """Return the first (newest) index item per game for a whole slate.
+
+    One index query covers up to ``_BATCH_TAGS_PER_QUERY`` games, paging
+    only while stories for some of them are still missing. Also returns the
+    games known to have no story: those of chunks whose results ran out
+    before ``_BATCH_MAX_PAGES``. Games cut off by the page cap are in
+    neither.
+    """
+    import httpx
+
+    found: Dict[int, Dict[str, Any]] = {}
+    absent: Set[int] = set()
+    for start in range(0, len(game_ids), _BATCH_TAGS_PER_QUERY):
+        chunk = game_ids[start : start + _BATCH_TAGS_PER_QUERY]
+        wanted = set(chunk)
+        tags = ",".join(f"gameid-{g}" for g in chunk)
+        for page in range(_BATCH_MAX_PAGES):
+            url = FORGE_BATCH_INDEX_URL.format(
+                tags=tags, limit=_BATCH_PAGE_SIZE, skip=page * _BATCH_PAGE_SIZE
+            )
+            try:
+                resp = client.get(url, timeout=_HTTPX_TIMEOUT, follow_redirects=True)
+                resp.raise_for_status()
+                items = resp.json().get("items") or []
+            except (httpx.HTTPStatusError, httpx.TimeoutException) as exc:
+                raise EditorialFetchError(
+                    f"Forge DAPI batch index request failed: {exc}"
+                ) from exc
+            except Exception as exc:
+                raise EditorialFetchError(
+                    f"Failed to fetch batch editorial index: {exc}"
+                ) from exc
+
+            for item in items:
+                self_url = item.get("selfUrl") or item.get("url")
+                if not self_url:
+                    continue
+                for gid in _game_ids_in(item):
+                    if gid in wanted and gid not in found:
+                        found[gid] = {**item, "selfUrl": self_url}
+            if len(items) < _BATCH_PAGE_SIZE:
+                absent.update(wanted - found.keys())
+                break
+            if wanted <= found.keys():
+                break
+    return found, absent
+
+
+def prefetch_editorials(
+    game_ids: Iterable[int],
+    *,
+    date: Optional[str] = None,
+    force_refresh: bool = False,
+    max_workers: int = _PREFETCH_MAX_WORKERS,
+) -> Dict[int, Optional[Dict[str, Any]]]:
+    """Warm the editorial cache for a whole slate ahead of per-game lookups.
 
-    return editorial
+    Games whose recap is already cached are skipped. The rest are looked up
+    with batched index queries instead of one per game; story bodies are
+    then fetched concurrently and written with one bulk upload, together
+    with "no recap yet" markers for games without a story. With ``date``
+    the stored recaps are flagged as 'raw_editorial' in the date index.
 
+    Returns:
+        Recap (or None) per game that was looked up in Forge. Games whose
+        story body could not be fetched, or that the batched index did not
+        settle within its page cap, are left out; ``get_editorial`` looks
+        them up.
 
-__all__ = ["get_editorial", "EditorialFetchError"]
+    Raises:
+        EditorialFetchError: If the batch index query fails.
+    """
+    pending = list(dict.fromkeys(game_ids))
+    bucket = _bucket_name()
+    if pending and not force_refresh:
+        blobs = {EDITORIAL_BLOB.format(game_id=g): g for g in pending}
+        present = exists_many(bucket, blobs)
+        pending = [g for b, g in blobs.items() if not present.results.get(b)]
+    if not pending:
+        return {}
+
+    client = get_http_client()
+    items, absent = _batch_index(client, pending)
+
+    results: Dict[int, Optional[Dict[str, Any]]] = {}
+    payloads: Dict[str, Any] = {}
+    if items:
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(items))),
+            thread_name_prefix="forge-story",
+        ) as executor:
+            futures = {
+                gid: executor.submit(_fetch_story, client, item, gid)
+                for gid, item in items.items()
+            }
+        for gid, fut in futures.items():
+            try:
+                editorial = _to_editorial(gid, items[gid], fut.result())
+            except EditorialFetchError:
+                logger.warning(
+                    "Editorial story prefetch failed for game %s", gid, exc_info=True
+                )
+                continue
+            results[gid] = editorial
+            payloads[EDITORIAL_BLOB.format(game_id=gid)] = editorial
+            with _misses_lock:
+                _misses.pop(gid, None)
+
+    # Games beyond the page cap are left to get_editorial's per-game lookup
+    for gid in pending:
+        if gid in absent:
+            results[gid] = None
+            payloads[EDITORIAL_MISS_BLOB.format(game_id=gid)] = _miss_marker(gid, date)
+
+    upload = upload_many(bucket, payloads)
+    stored = [
+        gid
+        for gid, editorial in results.items()
+        if editorial is not None
+        and EDITORIAL_BLOB.format(game_id=gid) in upload.results
+    ]
+    if date and stored and queue_index_updates is not None:
+        try:
+            queue_index_updates(
+                bucket,
+                date,
+                [IndexUpdate(game_id=g, artifact="raw_editorial") for g in stored],
+            )
+        except Exception:
+            logger.warning(
+                "Failed to mark raw_editorial index for %s", date, exc_info=True
+            )
+    return results
+
+
+__all__ = [
+    "EDITORIAL_MISS_BLOB",
+    "EditorialFetchError",
+    "clear_editorial_misses",
+    "get_editorial",
+    "get_editorial_async",
+    "prefetch_editorials",
+]
@@ -0,0 +1,141 @@
+"""NHL ``gameState`` values and what they mean for caching.
+
+The web API reports FUT/PRE before puck drop, LIVE/CRIT while a game is on
+and FINAL then OFF once it is over. Payloads for finished games no longer
+change, so caches may keep them forever; anything else goes stale.
+Cached game payloads record the state they were fetched in, and when, as
+blob metadata so readers can tell which is which without re-fetching.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from config import get_settings
+
+UPCOMING_STATES = frozenset({"FUT", "PRE"})
+LIVE_STATES = frozenset({"LIVE", "CRIT"})
+FINAL_STATES = frozenset({"FINAL", "OFF"})
+
+
+def is_final(state: Optional[str]) -> bool:
+    """True once a game is over (its data no longer changes)."""
+    return state in FINAL_STATES
+
+
+def all_final(games: Iterable[Any]) -> bool:
+    """True if every game dict in ``games`` is final (vacuously for none)."""
+    return all(is_final((g or {}).get("gameState")) for g in games)
+
+
+# Blob metadata keys recording what a cached payload was fetched from
+STATE_METADATA_KEY = "gameState"
+FETCHED_AT_METADATA_KEY = "fetchedAt"
+
+
+def freshness_ttl(state: Optional[str]) -> Optional[float]:
+    """Seconds a payload fetched in ``state`` stays fresh; None if it never expires."""
+    if is_final(state):
+        return None
+    settings = get_settings()
+    if state in UPCOMING_STATES:
+        return settings.upcoming_cache_ttl
+    return settings.live_cache_ttl
+
+
+def cache_metadata(
+    payload: Mapping[str, Any], *, now: Optional[datetime] = None
+) -> Dict[str, str]:
+    """Blob metadata recording ``payload``'s game state and the fetch time."""
+    now = now or datetime.now(timezone.utc)
+    meta = {FETCHED_AT_METADATA_KEY: now.isoformat()}
+    state = payload.get("gameState")
+    if isinstance(state, str):
+        meta[STATE_METADATA_KEY] = state
+    return meta
+
+
+def is_fresh(
+    payload: Mapping[str, Any],
+    metadata: Mapping[str, str],
+    *,
+    now: Optional[datetime] = None,
+) -> bool:
+    """Whether a cached game payload can be served without re-fetching.
+
+    Final games are always fresh. Other states expire ``freshness_ttl``
+    seconds after ``fetchedAt``. Blobs written before this metadata existed
+    carry neither key: they are trusted only if the payload itself says the
+    game is final or names no state at all.
+    """
+    state = metadata.get(STATE_METADATA_KEY) or payload.get("gameState")
+    ttl = freshness_ttl(state)
+    if ttl is None:
+        return True
+    fetched_at = metadata.get(FETCHED_AT_METADATA_KEY)
+    if fetched_at is None:
+        return state is None
+    try:
+        fetched = datetime.fromisoformat(fetched_at)
+    except ValueError:
+        return False
+    now = now or datetime.now(timezone.utc)
+    return (now - fetched).total_seconds() < ttl
+
+
+# blob -> when upstream last confirmed (304) that the stored copy is current.
+# Kept in-process so a revalidation does not cost a blob rewrite.
+_REVALIDATED_MAX = 1024
+_revalidated: "OrderedDict[str, datetime]" = OrderedDict()
+_revalidated_lock = threading.Lock()
+
+
+def note_revalidated(blob: str, *, now: Optional[datetime] = None) -> None:
+    """Record that upstream confirmed ``blob``'s cached payload is unchanged."""
+    with _revalidated_lock:
+        _revalidated[blob] = now or datetime.now(timezone.utc)
+        _revalidated.move_to_end(blob)
+        while len(_revalidated) > _REVALIDATED_MAX:
+            _revalidated.popitem(last=False)
+
+
+def with_revalidation(blob: str, metadata: Mapping[str, str]) -> Dict[str, str]:
+    """``metadata`` with ``fetchedAt`` moved up to ``blob``'s last revalidation."""
+    meta = dict(metadata)
+    with _revalidated_lock:
+        checked = _revalidated.get(blob)
+    if checked is None:
+        return meta
+    try:
+        fetched = datetime.fromisoformat(meta[FETCHED_AT_METADATA_KEY])
+    except (KeyError, ValueError):
+        fetched = None
+    if fetched is None or checked > fetched:
+        meta[FETCHED_AT_METADATA_KEY] = checked.isoformat()
+    return meta
+
+
+def clear_revalidations() -> None:
+    """Forget in-process revalidations (stored blobs are unaffected)."""
+    with _revalidated_lock:
+        _revalidated.clear()
+
+
+__all__ = [
+    "FETCHED_AT_METADATA_KEY",
+    "FINAL_STATES",
+    "LIVE_STATES",
+    "STATE_METADATA_KEY",
+    "UPCOMING_STATES",
+    "all_final",
+    "cache_metadata",
+    "clear_revalidations",
+    "freshness_ttl",
+    "is_final",
+    "is_fresh",
+    "note_revalidated",
+    "with_revalidation",
+]
@@ -1,10 +1,25 @@
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, Optional, Tuple
-
-from nhlpy import NHLClient
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
 
 from config import get_settings
-from gcp_ingestion import check_file_exists, download_json, upload_json
+from gcp_ingestion import download_json_with_metadata, upload_json
+
+from .clients import (
+    Conditional,
+    get_async_nhl_client,
+    get_nhl_client,
+    validators_from,
+)
+from .game_state import (
+    cache_metadata,
+    is_fresh,
+    note_revalidated,
+    with_revalidation,
+)
+from .single_flight import coalesce, coalesce_async
 
 try:  # engine module may not be available in all runtimes
     from engine.date_index import mark_artifact
@@ -13,6 +28,10 @@ except Exception:  # pragma: no cover - optional dependency
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+# A stored payload and its blob metadata
+Cached = Tuple[Dict[str, Any], Dict[str, str]]
+
 
 def _bucket_name() -> str:
     return get_settings().gcs_bucket_name
@@ -100,6 +119,112 @@ def _maybe_mark_index(
             )
 
 
+def _load_cached(game_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[Cached]]:
+    """Return ``(fresh story, None)`` or ``(None, stale hit to revalidate)``."""
+    blob_path = GS_BLOB.format(game_id=game_id)
+    try:
+        hit = download_json_with_metadata(_bucket_name(), blob_path)
+    except Exception:
+        return None, None  # ignore cache errors; fall back to the API
+    if hit is None or not _looks_like_gs(hit[0]):
+        return None, None
+    story, meta = hit
+    if is_fresh(story, with_revalidation(blob_path, meta)):
+        return story, None
+    return None, hit
+
+
+def _accept(
+    game_id: int, fetched: Conditional, stale: Optional[Cached]
+) -> Tuple[Dict[str, Any], bool]:
+    """Return the story to serve for an API response and whether to store it."""
+    if fetched.not_modified and stale is not None:
+        # Unchanged upstream: serve the stored copy without rewriting it
+        note_revalidated(GS_BLOB.format(game_id=game_id))
+        return stale[0], False
+    story = fetched.data
+    if not _looks_like_gs(story):
+        raise GameStoryFetchError(
+            f"Unexpected game story shape for game {game_id}: missing 'summary'."
+        )
+    return story, True
+
+
+def _store(game_id: int, story: Dict[str, Any], validators: Dict[str, str]) -> None:
+    """Best-effort cache write."""
+    try:
+        upload_json(
+            _bucket_name(),
+            GS_BLOB.format(game_id=game_id),
+            story,
+            metadata={**cache_metadata(story), **validators},
+        )
+    except Exception:
+        logger.warning(
+            "Failed to upload game story cache for game %s", game_id, exc_info=True
+        )
+
+
+def _client(factory: Callable[[], T]) -> T:
+    try:
+        return factory()
+    except Exception as exc:  # pragma: no cover - defensive programming
+        raise GameStoryFetchError(f"Failed to create NHL client: {exc}") from exc
+
+
+@contextmanager
+def _fetch_errors(game_id: int) -> Iterator[None]:
+    try:
+        yield
+    except Exception as exc:
+        raise GameStoryFetchError(
+            f"Failed to fetch game story for game {game_id}: {exc}"
+        ) from exc
+
+
+# The sync and async fetchers share every step but the I/O calls
+
+
+def _get_game_story(game_id: int, *, force_refresh: bool = False) -> Dict[str, Any]:
+    # 1) Cache
+    stale = None
+    if not force_refresh:
+        story, stale = _load_cached(game_id)
+        if story is not None:
+            return story
+
+    # 2) API, conditional on the stale copy's validators
+    client = _client(get_nhl_client)
+    with _fetch_errors(game_id):
+        fetched = client.game_center.game_story_if_modified(
+            game_id=game_id, validators=validators_from(stale[1] if stale else None)
+        )
+        story, changed = _accept(game_id, fetched, stale)
+        if changed:
+            _store(game_id, story, fetched.validators)  # 3) cache write
+        return story
+
+
+async def _get_game_story_async(
+    game_id: int, *, force_refresh: bool = False
+) -> Dict[str, Any]:
+    stale = None
+    if not force_refresh:
+        story, stale = await asyncio.to_thread(_load_cached, game_id)
+        if story is not None:
+            return story
+
+    client = _client(get_async_nhl_client)
+    with _fetch_errors(game_id):
+        fetched = await client.game_center.game_story_if_modified(
+            game_id=game_id, validators=validators_from(stale[1] if stale else None)
+        )
+        story, changed = _accept(game_id, fetched, stale)
+        if changed:
+            await asyncio.to_thread(_store, game_id, story, fetched.validators)
+        return story
+
+
 def get_game_story(
     game_id: int,
     *,
@@ -113,6 +238,9 @@ def get_game_story(
     Fetch the game story data for a specific NHL game, using GCS as a cache.
     Optionally updates a per-date index with a 'raw_story' flag.
 
+    Concurrent calls for the same game share one fetch and its result; each
+    caller then marks the index with its own arguments.
+
     Args:
         game_id: Unique identifier for the game.
         force_refresh: If True, bypass cache and fetch from API.
@@ -125,59 +253,47 @@ def get_game_story(
     Raises:
         GameStoryFetchError: On retrieval/validation errors.
     """
-    blob_path = GS_BLOB.format(game_id=game_id)
-    bucket = _bucket_name()
+    story = coalesce(
+        ("raw_story", game_id, force_refresh),
+        functools.partial(_get_game_story, game_id, force_refresh=force_refresh),
+    )
+    # Marked per caller, so one that joined a shared fetch gets its own row
+    _maybe_mark_index(
+        story,
+        game_id=game_id,
+        date=date,
+        away_abbr=away_abbr,
+        home_abbr=home_abbr,
+        mark=mark_index,
+    )
+    return story
 
-    # 1) Cache
-    if not force_refresh and check_file_exists(bucket, blob_path):
-        try:
-            cached = download_json(bucket, blob_path)
-            if _looks_like_gs(cached):
-                _maybe_mark_index(
-                    cached,
-                    game_id=game_id,
-                    date=date,
-                    away_abbr=away_abbr,
-                    home_abbr=home_abbr,
-                    mark=mark_index,
-                )
-                return cached
-        except Exception:
-            # Ignore cache errors; fall back to API
-            pass
 
-    # 2) API
-    try:
-        client = NHLClient()
-    except Exception as exc:  # pragma: no cover - defensive programming
-        raise GameStoryFetchError(f"Failed to create NHL client: {exc}") from exc
-
-    try:
-        story = client.game_center.game_story(game_id=game_id)
-        if not _looks_like_gs(story):
-            raise GameStoryFetchError(
-                f"Unexpected game story shape for game {game_id}: missing 'summary'."
-            )
-
-        # 3) Best-effort cache write
-        try:
-            upload_json(bucket, blob_path, story)
-        except Exception:
-            logger.warning(
-                "Failed to upload game story cache for game %s", game_id, exc_info=True
-            )
-
-        _maybe_mark_index(
-            story,
-            game_id=game_id,
-            date=date,
-            away_abbr=away_abbr,
-            home_abbr=home_abbr,
-            mark=mark_index,
-        )
-        return story
+async def get_game_story_async(
+    game_id: int,
+    *,
+    force_refresh: bool = False,
+    date: Optional[str] = None,
+    away_abbr: Optional[str] = None,
+    home_abbr: Optional[str] = None,
+    mark_index: bool = True,
+) -> Dict[str, Any]:
+    """Async ``get_game_story``: same cache, validation and index marking.
 
-    except Exception as exc:
-        raise GameStoryFetchError(
-            f"Failed to fetch game story for game {game_id}: {exc}"
-        ) from exc
+    Raises:
+        GameStoryFetchError: On retrieval/validation errors.
+    """
+    story = await coalesce_async(
+        ("raw_story", game_id, force_refresh),
+        functools.partial(_get_game_story_async, game_id, force_refresh=force_refresh),
+    )
+    await asyncio.to_thread(
+        _maybe_mark_index,
+        story,
+        game_id=game_id,
+        date=date,
+        away_abbr=away_abbr,
+        home_abbr=home_abbr,
+        mark=mark_index,
+    )
+    return story
@@ -1,10 +1,25 @@
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, Optional, Tuple
-
-from nhlpy import NHLClient
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
 
 from config import get_settings
-from gcp_ingestion import check_file_exists, download_json, upload_json
+from gcp_ingestion import download_json_with_metadata, upload_json
+
+from .clients import (
+    Conditional,
+    get_async_nhl_client,
+    get_nhl_client,
+    validators_from,
+)
+from .game_state import (
+    cache_metadata,
+    is_fresh,
+    note_revalidated,
+    with_revalidation,
+)
+from .single_flight import coalesce, coalesce_async
 
 try:  # engine is optional in some environments (e.g. tests)
     from engine.date_index import mark_artifact
@@ -13,6 +28,10 @@ except Exception:  # pragma: no cover - optional dependency
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+# A stored payload and its blob metadata
+Cached = Tuple[Dict[str, Any], Dict[str, str]]
+
 
 def _bucket_name() -> str:
     return get_settings().gcs_bucket_name
@@ -85,6 +104,111 @@ def _maybe_mark_index(
             )
 
 
+def _load_cached(game_id: int) -> Tuple[Optional[Dict[str, Any]], Optional[Cached]]:
+    """Return ``(fresh payload, None)`` or ``(None, stale hit to revalidate)``."""
+    blob_path = PBP_BLOB.format(game_id=game_id)
+    hit = download_json_with_metadata(_bucket_name(), blob_path)
+    if hit is None or not _looks_like_pbp(hit[0]):
+        return None, None  # refetch if the cache is empty or malformed
+    pbp, meta = hit
+    if is_fresh(pbp, with_revalidation(blob_path, meta)):
+        return pbp, None
+    return None, hit
+
+
+def _accept(
+    game_id: int, fetched: Conditional, stale: Optional[Cached]
+) -> Tuple[Dict[str, Any], bool]:
+    """Return the payload to serve for an API response and whether to store it."""
+    if fetched.not_modified and stale is not None:
+        # Unchanged upstream: serve the stored copy without rewriting it
+        note_revalidated(PBP_BLOB.format(game_id=game_id))
+        return stale[0], False
+    pbp = fetched.data
+    if not _looks_like_pbp(pbp):
+        raise PlayByPlayFetchError(
+            f"Unexpected PBP shape for game {game_id}: missing 'plays'."
+        )
+    return pbp, True
+
+
+def _store(game_id: int, pbp: Dict[str, Any], validators: Dict[str, str]) -> None:
+    """Best-effort cache write."""
+    try:
+        upload_json(
+            _bucket_name(),
+            PBP_BLOB.format(game_id=game_id),
+            pbp,
+            metadata={**cache_metadata(pbp), **validators},
+        )
+    except Exception:
+        logger.warning(
+            "Failed to upload play-by-play cache for game %s",
+            game_id,
+            exc_info=True,
+        )
+
+
+def _client(factory: Callable[[], T]) -> T:
+    try:
+        return factory()
+    except Exception as exc:  # pragma: no cover - defensive programming
+        raise PlayByPlayFetchError(f"Failed to create NHL client: {exc}") from exc
+
+
+@contextmanager
+def _fetch_errors(game_id: int) -> Iterator[None]:
+    try:
+        yield
+    except Exception as exc:
+        raise PlayByPlayFetchError(
+            f"Failed to fetch play-by-play for game {game_id}: {exc}"
+        ) from exc
+
+
+# The sync and async fetchers share every step but the I/O calls
+
+
+def _get_play_by_play(game_id: int, *, force_refresh: bool = False) -> Dict[str, Any]:
+    # 1) Cache
+    stale = None
+    if not force_refresh:
+        pbp, stale = _load_cached(game_id)
+        if pbp is not None:
+            return pbp
+
+    # 2) API fetch, conditional on the stale copy's validators
+    client = _client(get_nhl_client)
+    with _fetch_errors(game_id):
+        fetched = client.game_center.play_by_play_if_modified(
+            game_id=game_id, validators=validators_from(stale[1] if stale else None)
+        )
+        pbp, changed = _accept(game_id, fetched, stale)
+        if changed:
+            _store(game_id, pbp, fetched.validators)  # 3) cache write
+        return pbp
+
+
+async def _get_play_by_play_async(
+    game_id: int, *, force_refresh: bool = False
+) -> Dict[str, Any]:
+    stale = None
+    if not force_refresh:
+        pbp, stale = await asyncio.to_thread(_load_cached, game_id)
+        if pbp is not None:
+            return pbp
+
+    client = _client(get_async_nhl_client)
+    with _fetch_errors(game_id):
+        fetched = await client.game_center.play_by_play_if_modified(
+            game_id=game_id, validators=validators_from(stale[1] if stale else None)
+        )
+        pbp, changed = _accept(game_id, fetched, stale)
+        if changed:
+            await asyncio.to_thread(_store, game_id, pbp, fetched.validators)
+        return pbp
+
+
 def get_play_by_play(
     game_id: int,
     *,
@@ -97,59 +221,49 @@ def get_play_by_play(
     """
     Fetch the play-by-play data for a specific NHL game, using GCS as a cache.
     Optionally updates a per-date index with a 'raw_pbp' flag.
-    """
-    blob_path = PBP_BLOB.format(game_id=game_id)
-    bucket = _bucket_name()
-
-    # 1) Cache
-    if not force_refresh and check_file_exists(bucket, blob_path):
-        pbp = download_json(bucket, blob_path)
-        if _looks_like_pbp(pbp):
-            _maybe_mark_index(
-                pbp,
-                game_id=game_id,
-                date=date,
-                away_abbr=away_abbr,
-                home_abbr=home_abbr,
-                mark=mark_index,
-            )
-            return pbp
-        # fall through to refetch if cache is malformed
-
-    # 2) API fetch
-    try:
-        client = NHLClient()
-    except Exception as exc:  # pragma: no cover - defensive programming
-        raise PlayByPlayFetchError(f"Failed to create NHL client: {exc}") from exc
-
-    try:
-        pbp = client.game_center.play_by_play(game_id=game_id)
-        if not _looks_like_pbp(pbp):
-            raise PlayByPlayFetchError(
-                f"Unexpected PBP shape for game {game_id}: missing 'plays'."
-            )
 
-        # 3) Best-effort cache write
-        try:
-            upload_json(bucket, blob_path, pbp)
-        except Exception:
-            logger.warning(
-                "Failed to upload play-by-play cache for game %s",
-                game_id,
-                exc_info=True,
-            )
+    Concurrent calls for the same game share one fetch and its result; each
+    caller then marks the index with its own arguments.
+    """
+    pbp = coalesce(
+        ("raw_pbp", game_id, force_refresh),
+        functools.partial(_get_play_by_play, game_id, force_refresh=force_refresh),
+    )
+    # Marked per caller, so one that joined a shared fetch gets its own row
+    _maybe_mark_index(
+        pbp,
+        game_id=game_id,
+        date=date,
+        away_abbr=away_abbr,
+        home_abbr=home_abbr,
+        mark=mark_index,
+    )
+    return pbp
 
-        _maybe_mark_index(
-            pbp,
-            game_id=game_id,
-            date=date,
-            away_abbr=away_abbr,
-            home_abbr=home_abbr,
-            mark=mark_index,
-        )
-        return pbp
 
-    except Exception as exc:
-        raise PlayByPlayFetchError(
-            f"Failed to fetch play-by-play for game {game_id}: {exc}"
-        ) from exc
+async def get_play_by_play_async(
+    game_id: int,
+    *,
+    force_refresh: bool = False,
+    date: Optional[str] = None,
+    away_abbr: Optional[str] = None,
+    home_abbr: Optional[str] = None,
+    mark_index: bool = True,
+) -> Dict[str, Any]:
+    """Async ``get_play_by_play``: same cache, validation and index marking."""
+    pbp = await coalesce_async(
+        ("raw_pbp", game_id, force_refresh),
+        functools.partial(
+            _get_play_by_play_async, game_id, force_refresh=force_refresh
+        ),
+    )
+    await asyncio.to_thread(
+        _maybe_mark_index,
+        pbp,
+        game_id=game_id,
+        date=date,
+        away_abbr=away_abbr,
+        home_abbr=home_abbr,
+        mark=mark_index,
+    )
+    return pbp
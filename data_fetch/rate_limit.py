@@ -0,0 +1,266 @@
+"""Per-host request governor for the NHL API and Forge.
+
+Every request made through the shared pools in ``data_fetch.clients`` passes
+through the ``HostGovernor`` of its host, which
+
+* spaces requests with a token bucket (``http_rate_limit`` per second with
+  bursts of up to ``http_rate_burst``),
+* caps concurrent requests at ``http_max_in_flight``, and
+* retries 429 and 5xx responses up to ``http_max_retries`` times with
+  jittered exponential backoff, honoring a numeric ``Retry-After``.
+
+Governors are created from the active settings on first use and keep
+counters readable through ``get_http_stats``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from config import get_settings
+
+R = TypeVar("R")
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Indirection so tests can skip real waiting
+_sleep = time.sleep
+_async_sleep = asyncio.sleep
+
+_lock = threading.Lock()
+_governors: Dict[str, "HostGovernor"] = {}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate <= 0`` disables limiting."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it.
+
+        Tokens may go negative, so callers queue up behind each other in
+        arrival order instead of racing for the next refill.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class HostGovernor:
+    """Rate limit, concurrency cap and retry policy for one upstream host."""
+
+    def __init__(
+        self,
+        host: str,
+        *,
+        rate: float,
+        burst: int,
+        max_in_flight: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        self.host = host
+        self.bucket = TokenBucket(rate, burst)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._async_slots: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, float] = dict.fromkeys(
+            (
+                "requests",
+                "retries",
+                "rate_limited",
+                "server_errors",
+                "gave_up",
+                "throttled",
+                "throttle_wait_seconds",
+                "in_flight",
+                "peak_in_flight",
+            ),
+            0,
+        )
+
+    # -- counters ---------------------------------------------------------
+
+    def _count(self, key: str, amount: float = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _enter(self) -> None:
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["in_flight"] += 1
+            self._stats["peak_in_flight"] = max(
+                self._stats["peak_in_flight"], self._stats["in_flight"]
+            )
+
+    def _leave(self) -> None:
+        self._count("in_flight", -1)
+
+    def stats(self) -> Dict[str, float]:
+        """Return a snapshot of this host's counters."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    # -- policy -----------------------------------------------------------
+
+    def _throttle_delay(self) -> float:
+        delay = self.bucket.reserve()
+        if delay > 0:
+            self._count("throttled")
+            self._count("throttle_wait_seconds", delay)
+        return delay
+
+    def _retry_delay(self, attempt: int, response: Any) -> Optional[float]:
+        """Return the backoff before retrying ``response``, or None to stop."""
+        status = getattr(response, "status_code", None)
+        if status not in RETRY_STATUSES:
+            return None
+        self._count("rate_limited" if status == 429 else "server_errors")
+        if attempt >= self.max_retries:
+            self._count("gave_up")
+            return None
+        self._count("retries")
+        retry_after = _retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # "Full jitter": spreads retries from parallel workers apart
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def send(
+        self,
+        attempt: Callable[[], R],
+        discard: Callable[[R], None],
+        *,
+        retry: bool = True,
+    ) -> R:
+        """Run ``attempt`` under the rate limit, retrying 429/5xx responses.
+
+        ``discard`` releases a response that is about to be retried.
+        """
+        tries = 0
+        while True:
+            delay = self._throttle_delay()
+            if delay:
+                _sleep(delay)
+            with self._slots:
+                self._enter()
+                try:
+                    response = attempt()
+                finally:
+                    self._leave()
+            backoff = self._retry_delay(tries, response) if retry else None
+            if backoff is None:
+                return response
+            discard(response)
+            tries += 1
+            _sleep(backoff)
+
+    async def send_async(
+        self,
+        attempt: Callable[[], Awaitable[R]],
+        discard: Callable[[R], Awaitable[None]],
+        *,
+        retry: bool = True,
+    ) -> R:
+        """Async ``send``; the in-flight cap is enforced per event loop."""
+        loop = asyncio.get_running_loop()
+        slots = self._async_slots.get(loop)
+        if slots is None:
+            slots = self._async_slots[loop] = asyncio.Semaphore(self.max_in_flight)
+        tries = 0
+        while True:
+            delay = self._throttle_delay()
+            if delay:
+                await _async_sleep(delay)
+            async with slots:
+                self._enter()
+                try:
+                    response = await attempt()
+                finally:
+                    self._leave()
+            backoff = self._retry_delay(tries, response) if retry else None
+            if backoff is None:
+                return response
+            await discard(response)
+            tries += 1
+            await _async_sleep(backoff)
+
+
+def _retry_after(response: Any) -> Optional[float]:
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None  # an HTTP date; fall back to our own backoff
+
+
+def get_governor(host: str) -> HostGovernor:
+    """Return the shared governor for ``host`` (created from settings)."""
+    governor = _governors.get(host)
+    if governor is None:
+        with _lock:
+            governor = _governors.get(host)
+            if governor is None:
+                settings = get_settings()
+                governor = _governors[host] = HostGovernor(
+                    host,
+                    rate=settings.http_rate_limit,
+                    burst=settings.http_rate_burst,
+                    max_in_flight=settings.http_max_in_flight,
+                    max_retries=settings.http_max_retries,
+                    backoff_base=settings.http_backoff_base,
+                    backoff_max=settings.http_backoff_max,
+                )
+    return governor
+
+
+def get_http_stats() -> Dict[str, Dict[str, float]]:
+    """Return request counters keyed by upstream host."""
+    with _lock:
+        governors = list(_governors.values())
+    return {g.host: g.stats() for g in governors}
+
+
+def reset_http_governors() -> None:
+    """Forget governors and counters; settings are re-read on next use."""
+    with _lock:
+        _governors.clear()
+
+
+__all__ = [
+    "RETRY_STATUSES",
+    "HostGovernor",
+    "TokenBucket",
+    "get_governor",
+    "get_http_stats",
+    "reset_http_governors",
+]
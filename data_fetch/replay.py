@@ -0,0 +1,254 @@
+"""Record/replay stand-in for the NHL API and Forge DAPI.
+
+With ``HTTP_REPLAY=record`` every upstream response that passes through the
+shared pools is also written to a fixture store (one JSON file per method and
+URL under ``HTTP_REPLAY_DIR``). With ``HTTP_REPLAY=replay`` the network is
+never touched: requests are answered from that store, after an optional
+``HTTP_REPLAY_LATENCY`` delay, and a seeded ``HTTP_REPLAY_ERROR_RATE``
+fraction of them fail with 503 so retry paths get exercised too.
+
+Replay sits below the request governor, so rate limits, concurrency caps and
+retries behave as they would against the real hosts. Combined with
+``STORAGE_BACKEND=memory`` this runs the fetch pipeline fully offline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from config import get_settings
+
+try:  # pragma: no cover - optional dependency
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_sleep = time.sleep
+_async_sleep = asyncio.sleep
+
+# Response headers worth keeping; bodies are stored decoded
+_KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+
+class ReplayMissError(LookupError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+class FixtureStore:
+    """Recorded responses on disk, keyed by request method and URL."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def path(self, method: str, url: str) -> str:
+        digest = hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.root, f"{digest[:32]}.json")
+
+    def load(
+        self, method: str, url: str
+    ) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        try:
+            with open(self.path(method, url), "r", encoding="utf-8") as fh:
+                doc = json.load(fh)
+        except FileNotFoundError:
+            return None
+        if "body_b64" in doc:
+            body = base64.b64decode(doc["body_b64"])
+        else:
+            body = doc.get("body", "").encode("utf-8")
+        return int(doc["status"]), dict(doc.get("headers") or {}), body
+
+    def save(
+        self, method: str, url: str, status: int, headers: Dict[str, str], body: bytes
+    ) -> None:
+        doc: Dict[str, Any] = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": headers,
+        }
+        try:
+            doc["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            doc["body_b64"] = base64.b64encode(body).decode("ascii")
+        os.makedirs(self.root, exist_ok=True)
+        target = self.path(method, url)
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(doc, fh, indent=1, sort_keys=True)
+        os.replace(tmp, target)
+
+
+class _Faults:
+    """Seeded latency and error injection shared by sync and async replay."""
+
+    def __init__(self, latency: float, error_rate: float, seed: int) -> None:
+        self.latency = max(0.0, latency)
+        self.error_rate = min(max(error_rate, 0.0), 1.0)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def should_fail(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.error_rate
+
+
+def _kept_headers(headers: Any) -> Dict[str, str]:
+    return {k: headers[k] for k in _KEPT_HEADERS if headers.get(k)}
+
+
+def _recordable(status: int) -> bool:
+    # 304s carry no body and 5xx are transient; neither should replace a fixture
+    return status != 304 and status < 500
+
+
+def _replayed(request: "httpx.Request", store: FixtureStore) -> "httpx.Response":
+    url = str(request.url)
+    hit = store.load(request.method, url)
+    if hit is None:
+        raise ReplayMissError(f"No recorded response for {request.method} {url}")
+    status, headers, body = hit
+    return httpx.Response(status, headers=headers, content=body, request=request)
+
+
+def _injected_error(request: "httpx.Request") -> "httpx.Response":
+    return httpx.Response(503, json={"error": "injected by replay"}, request=request)
+
+
+if httpx is not None:
+
+    class RecordingTransport(httpx.BaseTransport):
+        """Pass requests through and save each response as a fixture."""
+
+        def __init__(self, inner: httpx.BaseTransport, store: FixtureStore) -> None:
+            self._inner = inner
+            self.store = store
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            resp = self._inner.handle_request(request)
+            if not _recordable(resp.status_code):
+                return resp
+            body = resp.read()
+            resp.close()
+            headers = _kept_headers(resp.headers)
+            self.store.save(
+                request.method, str(request.url), resp.status_code, headers, body
+            )
+            logger.debug("Recorded %s %s", request.method, request.url)
+            return httpx.Response(
+                resp.status_code, headers=headers, content=body, request=request
+            )
+
+        def close(self) -> None:
+            self._inner.close()
+
+    class ReplayTransport(httpx.BaseTransport):
+        """Serve recorded responses without touching the network."""
+
+        def __init__(self, store: FixtureStore, faults: _Faults) -> None:
+            self.store = store
+            self.faults = faults
+
+        def handle_request(self, request: httpx.Request) -> httpx.Response:
+            if self.faults.latency:
+                _sleep(self.faults.latency)
+            if self.faults.should_fail():
+                return _injected_error(request)
+            return _replayed(request, self.store)
+
+    class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+        """Async ``RecordingTransport``."""
+
+        def __init__(
+            self, inner: httpx.AsyncBaseTransport, store: FixtureStore
+        ) -> None:
+            self._inner = inner
+            self.store = store
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            resp = await self._inner.handle_async_request(request)
+            if not _recordable(resp.status_code):
+                return resp
+            body = await resp.aread()
+            await resp.aclose()
+            headers = _kept_headers(resp.headers)
+            await asyncio.to_thread(
+                self.store.save,
+                request.method,
+                str(request.url),
+                resp.status_code,
+                headers,
+                body,
+            )
+            logger.debug("Recorded %s %s", request.method, request.url)
+            return httpx.Response(
+                resp.status_code, headers=headers, content=body, request=request
+            )
+
+        async def aclose(self) -> None:
+            await self._inner.aclose()
+
+    class AsyncReplayTransport(httpx.AsyncBaseTransport):
+        """Async ``ReplayTransport``."""
+
+        def __init__(self, store: FixtureStore, faults: _Faults) -> None:
+            self.store = store
+            self.faults = faults
+
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            if self.faults.latency:
+                await _async_sleep(self.faults.latency)
+            if self.faults.should_fail():
+                return _injected_error(request)
+            return _replayed(request, self.store)
+
+
+def _settings_store() -> Tuple[str, FixtureStore, _Faults]:
+    settings = get_settings()
+    faults = _Faults(
+        settings.http_replay_latency,
+        settings.http_replay_error_rate,
+        settings.http_replay_seed,
+    )
+    return settings.http_replay_mode, FixtureStore(settings.http_replay_dir), faults
+
+
+def wrap_transport(inner: Any) -> Any:
+    """Apply the configured replay mode to a sync transport."""
+    mode, store, faults = _settings_store()
+    if mode == "record":
+        return RecordingTransport(inner, store)
+    if mode == "replay":
+        return ReplayTransport(store, faults)
+    return inner
+
+
+def wrap_async_transport(inner: Any) -> Any:
+    """Apply the configured replay mode to an async transport."""
+    mode, store, faults = _settings_store()
+    if mode == "record":
+        return AsyncRecordingTransport(inner, store)
+    if mode == "replay":
+        return AsyncReplayTransport(store, faults)
+    return inner
+
+
+__all__ = [
+    "FixtureStore",
+    "ReplayMissError",
+    "wrap_async_transport",
+    "wrap_transport",
+]
@@ -1,38 +1,168 @@
+import asyncio
 import logging
-from typing import List, Optional
-
-from nhlpy import NHLClient
+import threading
+import time
+from collections import OrderedDict
+from datetime import date as Date
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
 
 from config import get_settings
+from gcp_ingestion import download_json_or_none, download_many, upload_json, upload_many
 from models.game_schedule import GameSchedule
 
+from .clients import get_async_nhl_client, get_nhl_client, schedule_day
+from .game_state import all_final
+
 # Optional: only if you want to prefill the date index
 try:
-    from engine.date_index import mark_artifact  # your simple index helper
+    from engine.date_index import (
+        IndexUpdate,
+        apply_index_updates,
+        apply_index_updates_bulk,
+    )
 except Exception:  # pragma: no cover - optional dependency
-    mark_artifact = None  # type: ignore[assignment]
+    apply_index_updates = None  # type: ignore[assignment]
+    apply_index_updates_bulk = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+# Outside raw/: entries for dates still in play are rewritten on refresh
+SCHEDULE_BLOB = "schedules/{date}.json"
+
+_MEMO_MAX_DATES = 128
+
+# (bucket, date) -> (expires_at epoch seconds, single-day schedule payload)
+_memo: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_memo_lock = threading.Lock()
+
 
 class ScheduleFetchError(Exception):
     """Raised when fetching the schedule fails."""
 
 
+def clear_schedule_cache() -> None:
+    """Drop memoized schedules (persisted copies are kept)."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _expires_at(date: str, sched: Dict[str, Any], fetched_at: float) -> float:
+    """A past date whose games are all final never changes again.
+
+    A day with no games does not count as final: an empty slate may just be
+    a gap in the response, so it is re-checked after the short TTL.
+    """
+    today = datetime.now(timezone.utc).date().isoformat()
+    games = sched.get("games") or []
+    if date < today and games and all_final(games):
+        return float("inf")
+    return fetched_at + get_settings().schedule_cache_ttl
+
+
+def _memo_get(key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+    with _memo_lock:
+        hit = _memo.get(key)
+        if hit is None:
+            return None
+        expires_at, sched = hit
+        if expires_at <= time.time():
+            del _memo[key]
+            return None
+        _memo.move_to_end(key)
+        return sched
+
+
+def _memo_put(key: Tuple[str, str], sched: Dict[str, Any], expires_at: float) -> None:
+    with _memo_lock:
+        _memo[key] = (expires_at, sched)
+        _memo.move_to_end(key)
+        while len(_memo) > _MEMO_MAX_DATES:
+            _memo.popitem(last=False)
+
+
+def _from_doc(
+    key: Tuple[str, str], doc: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Return a persisted schedule if it is still fresh (and memoize it)."""
+    if not isinstance(doc, dict) or not isinstance(doc.get("schedule"), dict):
+        return None
+    sched = doc["schedule"]
+    expires_at = _expires_at(key[1], sched, float(doc.get("fetched_at") or 0))
+    if expires_at <= time.time():
+        return None
+    _memo_put(key, sched, expires_at)
+    return sched
+
+
+def _load_cached(bucket: str, date: str) -> Optional[Dict[str, Any]]:
+    key = (bucket, date)
+    sched = _memo_get(key)
+    if sched is not None:
+        return sched
+    try:
+        doc = download_json_or_none(bucket, SCHEDULE_BLOB.format(date=date))
+    except Exception:
+        logger.warning("Failed to read schedule cache for %s", date, exc_info=True)
+        return None
+    return _from_doc(key, doc)
+
+
+def _to_doc(bucket: str, date: str, sched: Dict[str, Any]) -> Dict[str, Any]:
+    """Memoize a freshly fetched schedule and return the doc to persist."""
+    fetched_at = time.time()
+    _memo_put((bucket, date), sched, _expires_at(date, sched, fetched_at))
+    return {"date": date, "fetched_at": fetched_at, "schedule": sched}
+
+
+def _store(bucket: str, date: str, sched: Dict[str, Any]) -> None:
+    try:
+        upload_json(
+            bucket, SCHEDULE_BLOB.format(date=date), _to_doc(bucket, date, sched)
+        )
+    except Exception:
+        logger.warning("Failed to upload schedule cache for %s", date, exc_info=True)
+
+
+def _client(factory: Callable[[], T]) -> T:
+    try:
+        return factory()
+    except Exception as exc:  # pragma: no cover - defensive programming
+        raise ScheduleFetchError(f"Failed to create NHL client: {exc}") from exc
+
+
+@contextmanager
+def _request_errors(date: str) -> Iterator[None]:
+    try:
+        yield
+    except Exception as exc:  # pragma: no cover - defensive programming
+        raise ScheduleFetchError(f"Failed to fetch schedule for {date}: {exc}") from exc
+
+
 def get_schedule(
     date: str,
     *,
     bucket_name: Optional[str] = None,
     mark_index: bool = True,
+    force_refresh: bool = False,
 ) -> List[GameSchedule]:
     """
     Fetch the NHL game schedule for a specific date.
 
+    Schedules are cached in memory and in ``schedules/{date}.json``. A past
+    date whose games are all final is served from cache for good; other
+    dates are re-fetched once ``Settings.schedule_cache_ttl`` has passed.
+
     Args:
         date: 'YYYY-MM-DD'
-        bucket_name: If provided and mark_index=True, seed per-date index with matchups.
-        mark_index: When True and bucket_name is provided, create/update rows in the
-                    index for each game with away/home but without setting any artifacts yet.
+        bucket_name: Bucket for the cache and index (defaults to the configured one).
+        mark_index: When True, a freshly fetched schedule seeds the per-date index:
+                    a row for each game with away/home but no artifacts yet.
+        force_refresh: Skip the cache and fetch from the API.
 
     Returns:
         List[GameSchedule]: one per game.
@@ -40,19 +170,52 @@ def get_schedule(
     Raises:
         ScheduleFetchError: On fetch errors.
     """
-    try:
-        client = NHLClient()
-    except Exception as exc:  # pragma: no cover - defensive programming
-        raise ScheduleFetchError(f"Failed to create NHL client: {exc}") from exc
+    bucket = bucket_name or get_settings().gcs_bucket_name
+    if not force_refresh:
+        cached = _load_cached(bucket, date)
+        if cached is not None:
+            return _to_schedules(cached)
 
-    try:
+    client = _client(get_nhl_client)
+    with _request_errors(date):
         sched = client.schedule.get_schedule(date=date)
-    except Exception as exc:  # pragma: no cover - defensive programming
-        raise ScheduleFetchError(f"Failed to fetch schedule for {date}: {exc}") from exc
 
+    _store(bucket, date, sched)
+    schedules = _to_schedules(sched)
+    _seed_index(date, schedules, bucket_name=bucket, mark_index=mark_index)
+    return schedules
+
+
+async def get_schedule_async(
+    date: str,
+    *,
+    bucket_name: Optional[str] = None,
+    mark_index: bool = True,
+    force_refresh: bool = False,
+) -> List[GameSchedule]:
+    """Async ``get_schedule``; cache I/O and the index seed run off the event loop."""
+    bucket = bucket_name or get_settings().gcs_bucket_name
+    if not force_refresh:
+        cached = await asyncio.to_thread(_load_cached, bucket, date)
+        if cached is not None:
+            return _to_schedules(cached)
+
+    client = _client(get_async_nhl_client)
+    with _request_errors(date):
+        sched = await client.schedule.get_schedule(date=date)
+
+    await asyncio.to_thread(_store, bucket, date, sched)
+    schedules = _to_schedules(sched)
+    await asyncio.to_thread(
+        _seed_index, date, schedules, bucket_name=bucket, mark_index=mark_index
+    )
+    return schedules
+
+
+def _to_schedules(sched: Dict[str, Any]) -> List[GameSchedule]:
     games = sched.get("games", []) or []
 
-    schedules: List[GameSchedule] = [
+    return [
         GameSchedule(
             game_id=g.get("id"),
             season_id=g.get("season"),
@@ -62,44 +225,142 @@ def get_schedule(
             away_team=(g.get("awayTeam") or {}).get("abbrev") or "",
             away_team_score=(g.get("awayTeam") or {}).get("score"),
             winning_goal_scorer_id=(g.get("winningGoalScorer") or {}).get("playerId"),
+            game_state=g.get("gameState"),
         )
         for g in games
     ]
 
-    # Seed the simple per-date index with matchups (no artifacts yet)
+
+def _seed_index(
+    date: str,
+    schedules: List[GameSchedule],
+    *,
+    bucket_name: Optional[str],
+    mark_index: bool,
+) -> None:
+    """Seed the simple per-date index with matchups (no artifacts yet)."""
     if mark_index:
         bucket = bucket_name or get_settings().gcs_bucket_name
     else:
         bucket = None
 
-    if mark_index and bucket and mark_artifact is not None:
-        for s in schedules:
-            try:
-                mark_artifact(
-                    bucket,
-                    date=date,
-                    game_id=s.game_id,
-                    away=s.away_team,
-                    home=s.home_team,
-                    artifact="raw_pbp",  # set to False to ensure key exists
-                    exists=False,
-                )
-                # Also ensure 'raw_story' key exists (False) so your
-                # list_games_missing(...) works immediately.
-                mark_artifact(
-                    bucket,
-                    date=date,
-                    game_id=s.game_id,
-                    artifact="raw_story",
-                    exists=False,
-                )
-            except Exception:
-                # Non-fatal; schedule fetch should not fail due to index writes
-                logger.warning(
-                    "Failed to seed index for game %s on %s",
-                    s.game_id,
-                    date,
-                    exc_info=True,
+    if mark_index and bucket and apply_index_updates is not None and schedules:
+        # Register every game (with teams) so list_games_missing(...) reports
+        # raw_pbp/raw_story immediately, without clobbering artifacts already
+        # stored. One read and one write for the whole slate.
+        try:
+            apply_index_updates(bucket, date, _seed_updates(schedules))
+        except Exception:
+            # Non-fatal; schedule fetch should not fail due to index writes
+            logger.warning("Failed to seed index for %s", date, exc_info=True)
+
+
+def _seed_updates(schedules: List[GameSchedule]) -> List["IndexUpdate"]:
+    # One entry per game; an entry without a flag counts as missing it, so
+    # the raw_pbp seed also leaves the game listed as lacking raw_story
+    return [
+        IndexUpdate(
+            game_id=s.game_id,
+            artifact="raw_pbp",
+            exists=False,
+            away=s.away_team,
+            home=s.home_team,
+            overwrite=False,
+        )
+        for s in schedules
+    ]
+
+
+def get_schedule_range(
+    start: str,
+    end: str,
+    *,
+    bucket_name: Optional[str] = None,
+    mark_index: bool = True,
+    force_refresh: bool = False,
+) -> Dict[str, List[GameSchedule]]:
+    """Return the schedule for every date in [start, end], oldest first.
+
+    Fresh cached schedules are read in one parallel sweep. Missing dates are
+    fetched a week at a time (the schedule endpoint returns seven days per
+    call) and written back with one bulk upload. With ``mark_index``, the
+    fetched dates seed their date indexes in one bulk pass that writes each
+    month shard once. A season takes ~30 API calls instead of ~200.
+
+    Raises:
+        ValueError: If ``end`` is before ``start``.
+        ScheduleFetchError: On fetch errors.
+    """
+    first, last = Date.fromisoformat(start), Date.fromisoformat(end)
+    if last < first:
+        raise ValueError(f"end {end} is before start {start}")
+    dates = [
+        (first + timedelta(days=n)).isoformat() for n in range((last - first).days + 1)
+    ]
+    bucket = bucket_name or get_settings().gcs_bucket_name
+
+    days: Dict[str, Dict[str, Any]] = {}
+    if not force_refresh:
+        blobs = {SCHEDULE_BLOB.format(date=d): d for d in dates}
+        loaded = download_many(bucket, blobs)
+        for blob, d in blobs.items():
+            sched = _memo_get((bucket, d)) or _from_doc(
+                (bucket, d), loaded.results.get(blob)
+            )
+            if sched is not None:
+                days[d] = sched
+
+    missing = [d for d in dates if d not in days]
+    if missing:
+        client = _client(get_nhl_client)
+
+    fetched: Dict[str, Dict[str, Any]] = {}
+    # Days the week payloads did not list: served empty, never persisted
+    unlisted: Dict[str, Dict[str, Any]] = {}
+    wanted = set(missing)
+    for d in missing:
+        if d in fetched or d in unlisted:
+            continue
+        try:
+            week = client.schedule.get_schedule_week(date=d)
+        except Exception as exc:
+            raise ScheduleFetchError(
+                f"Failed to fetch schedule week from {d}: {exc}"
+            ) from exc
+        listed = {day.get("date") for day in week.get("gameWeek") or []}
+        for day in sorted(listed & wanted - fetched.keys()):
+            fetched[day] = schedule_day(week, day)
+        start_day = Date.fromisoformat(d)
+        for n in range(7):
+            day = (start_day + timedelta(days=n)).isoformat()
+            if day in wanted and day not in listed and day not in unlisted:
+                unlisted[day] = schedule_day({}, day)
+                _memo_put(
+                    (bucket, day),
+                    unlisted[day],
+                    _expires_at(day, unlisted[day], time.time()),
                 )
 
-    return schedules
+    if fetched:
+        upload = upload_many(
+            bucket,
+            {
+                SCHEDULE_BLOB.format(date=d): _to_doc(bucket, d, sched)
+                for d, sched in fetched.items()
+            },
+        )
+        if not upload.ok:
+            logger.warning("Failed to cache some schedules in %s..%s", start, end)
+        days.update(fetched)
+    days.update(unlisted)
+
+    out = {d: _to_schedules(days[d]) for d in dates}
+    if mark_index and apply_index_updates_bulk is not None:
+        seeds = {d: _seed_updates(out[d]) for d in sorted(fetched) if out[d]}
+        try:
+            apply_index_updates_bulk(bucket, seeds)
+        except Exception:
+            logger.warning(
+                "Failed to seed indexes for %s..%s", start, end, exc_info=True
+            )
+    return out
@@ -1,46 +1,252 @@
-"""Fetch season series data for a game matchup from the NHL API."""
+"""Fetch season series data for a game matchup from the NHL API.
+
+Once a game is final its series context no longer changes, so the reduced
+``right_rail`` response is persisted to ``raw/season_series/{game_id}.json``
+and trusted from then on. Every fetch is also memoized in-process under its
+game and any game between the same teams on the same date, which reuse it
+for a while. Games on other dates have their own context (the series as of
+that game), so they never do.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Set, Tuple, TypeVar
+
+from config import get_settings
+from gcp_ingestion import download_json_or_none, upload_json
 
-from nhlpy import NHLClient
+from .clients import get_async_nhl_client, get_nhl_client
+from .game_state import FINAL_STATES, is_final
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+SERIES_BLOB = "raw/season_series/{game_id}.json"
+
+# Series fetched before a game is final, and copies shared with sibling
+# games, are reused this long in-process
+_UNSETTLED_TTL_SECONDS = 600.0
+_MEMO_MAX_GAMES = 512
+
+# game_id -> (expires_at, game the payload was fetched for, payload)
+_memo: "OrderedDict[int, Tuple[float, int, dict]]" = OrderedDict()
+_memo_lock = threading.Lock()
+
 
 class SeasonSeriesFetchError(Exception):
     """Raised when fetching season series fails."""
 
 
-def get_season_series(game_id: int) -> dict:
-    """Return season series data for the matchup of the given game.
+def _bucket_name() -> str:
+    return get_settings().gcs_bucket_name
 
-    Returns a dict with keys:
-        seasonSeries: list of game dicts for every matchup this season
-        seasonSeriesWins: dict with awayTeamWins and homeTeamWins
+
+def clear_season_series_cache() -> None:
+    """Drop memoized series (persisted copies are kept)."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _find_game(series: dict, game_id: int) -> Optional[dict]:
+    for game in series.get("seasonSeries") or []:
+        if isinstance(game, dict) and game.get("id") == game_id:
+            return game
+    return None
+
+
+def _is_final(series: dict, game_id: int) -> bool:
+    game = _find_game(series, game_id)
+    return game is not None and is_final(game.get("gameState"))
+
+
+def _abbrevs(game: Optional[dict]) -> Tuple[Optional[str], Optional[str]]:
+    game = game or {}
+    return (
+        (game.get("awayTeam") or {}).get("abbrev"),
+        (game.get("homeTeam") or {}).get("abbrev"),
+    )
+
+
+def _reorient(series: dict, source_id: int, game_id: int) -> dict:
+    """Express a series fetched for ``source_id`` from ``game_id``'s side.
+
+    ``seasonSeriesWins`` counts wins for the requested game's away and home
+    teams, so they swap when the sibling game has the teams the other way
+    round.
     """
+    if source_id == game_id:
+        return series
+    src_away, src_home = _abbrevs(_find_game(series, source_id))
+    away, home = _abbrevs(_find_game(series, game_id))
+    if not src_away or (away, home) != (src_home, src_away):
+        return series
+    wins = series.get("seasonSeriesWins") or {}
+    return {
+        **series,
+        "seasonSeriesWins": {
+            **wins,
+            "awayTeamWins": wins.get("homeTeamWins"),
+            "homeTeamWins": wins.get("awayTeamWins"),
+        },
+    }
+
+
+def _memo_get(game_id: int) -> Optional[dict]:
+    with _memo_lock:
+        hit = _memo.get(game_id)
+        if hit is None:
+            return None
+        expires_at, source_id, series = hit
+        if expires_at < time.monotonic():
+            del _memo[game_id]
+            return None
+        _memo.move_to_end(game_id)
+    return _reorient(series, source_id, game_id)
+
+
+def _siblings(series: dict, game_id: int) -> Set[int]:
+    """Games in ``series`` between the same teams on the same date as ``game_id``."""
+    game = _find_game(series, game_id)
+    if game is None or not game.get("gameDate"):
+        return set()
+    teams = set(_abbrevs(game))
+    return {
+        g["id"]
+        for g in series.get("seasonSeries") or []
+        if isinstance(g, dict)
+        and isinstance(g.get("id"), int)
+        and g["id"] != game_id
+        and g.get("gameDate") == game["gameDate"]
+        and set(_abbrevs(g)) == teams
+    }
+
+
+def _remember(game_id: int, series: dict) -> None:
+    """Memoize ``series`` for ``game_id`` and its same-day siblings.
+
+    Only the game the payload was fetched for is kept for good once final;
+    siblings get the short TTL and fetch (and persist) their own copy later.
+    """
+    now = time.monotonic()
+    with _memo_lock:
+        final = _is_final(series, game_id)
+        _memo[game_id] = (
+            float("inf") if final else now + _UNSETTLED_TTL_SECONDS,
+            game_id,
+            series,
+        )
+        _memo.move_to_end(game_id)
+        for gid in _siblings(series, game_id):
+            _memo[gid] = (now + _UNSETTLED_TTL_SECONDS, game_id, series)
+            _memo.move_to_end(gid)
+        while len(_memo) > _MEMO_MAX_GAMES:
+            _memo.popitem(last=False)
+
+
+def _series(data: Optional[dict]) -> dict:
+    if not data:
+        return {"seasonSeries": [], "seasonSeriesWins": {}}
+
+    return {
+        "seasonSeries": data.get("seasonSeries") or [],
+        "seasonSeriesWins": data.get("seasonSeriesWins") or {},
+    }
+
+
+def _cached(game_id: int) -> Optional[dict]:
+    series = _memo_get(game_id)
+    if series is not None:
+        return series
     try:
-        client = NHLClient()
+        cached = download_json_or_none(
+            _bucket_name(), SERIES_BLOB.format(game_id=game_id)
+        )
+    except Exception:
+        return None  # fall back to the API
+    if not isinstance(cached, dict):
+        return None
+    _remember(game_id, cached)
+    return cached
+
+
+def _keep(game_id: int, data: Optional[dict]) -> dict:
+    """Reduce a ``right_rail`` response, persist it once final and memoize it."""
+    series = _series(data)
+    if _is_final(series, game_id):
+        try:
+            upload_json(_bucket_name(), SERIES_BLOB.format(game_id=game_id), series)
+        except Exception:
+            logger.warning(
+                "Failed to upload season series cache for game %s",
+                game_id,
+                exc_info=True,
+            )
+    _remember(game_id, series)
+    return series
+
+
+def _client(factory: Callable[[], T]) -> T:
+    try:
+        return factory()
     except Exception as exc:
         logger.warning("Failed to create NHL client: %s", exc)
         raise SeasonSeriesFetchError(f"Failed to create NHL client: {exc}") from exc
 
+
+@contextmanager
+def _request_errors(game_id: int) -> Iterator[None]:
     try:
-        data = client.game_center.right_rail(game_id=str(game_id))
+        yield
     except Exception as exc:
         logger.warning("right_rail request failed for game %s: %s", game_id, exc)
         raise SeasonSeriesFetchError(
             f"Failed to fetch right_rail for game {game_id}: {exc}"
         ) from exc
 
-    if not data:
-        return {"seasonSeries": [], "seasonSeriesWins": {}}
 
-    return {
-        "seasonSeries": data.get("seasonSeries") or [],
-        "seasonSeriesWins": data.get("seasonSeriesWins") or {},
-    }
+def get_season_series(game_id: int, *, force_refresh: bool = False) -> dict:
+    """Return season series data for the matchup of the given game.
+
+    Returns a dict with keys:
+        seasonSeries: list of game dicts for every matchup this season
+        seasonSeriesWins: dict with awayTeamWins and homeTeamWins
+    """
+    if not force_refresh:
+        series = _cached(game_id)
+        if series is not None:
+            return series
+
+    client = _client(get_nhl_client)
+    with _request_errors(game_id):
+        data = client.game_center.right_rail(game_id=str(game_id))
+    return _keep(game_id, data)
+
+
+async def get_season_series_async(game_id: int, *, force_refresh: bool = False) -> dict:
+    """Async ``get_season_series``; shares the same memo and blobs."""
+    if not force_refresh:
+        series = await asyncio.to_thread(_cached, game_id)
+        if series is not None:
+            return series
+
+    client = _client(get_async_nhl_client)
+    with _request_errors(game_id):
+        data = await client.game_center.right_rail(game_id=str(game_id))
+    return await asyncio.to_thread(_keep, game_id, data)
 
 
-__all__ = ["SeasonSeriesFetchError", "get_season_series"]
+__all__ = [
+    "FINAL_STATES",
+    "SERIES_BLOB",
+    "SeasonSeriesFetchError",
+    "clear_season_series_cache",
+    "get_season_series",
+    "get_season_series_async",
+]
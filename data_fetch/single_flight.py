@@ -0,0 +1,91 @@
+"""Coalesce concurrent identical fetches into one call.
+
+When several callers ask for the same artifact at once (e.g. a burst of API
+requests right after a game ends), only the first runs the fetch; the rest
+wait for it and receive the same result object, or the same exception.
+Nothing is cached once the call finishes: the next caller starts a new one.
+
+Keys are ``(artifact, game_id, ...)`` tuples. Sync calls are shared across
+threads; async calls are shared within an event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_lock = threading.Lock()
+_calls: Dict[Hashable, _Call] = {}
+_async_calls: "weakref.WeakKeyDictionary[Any, Dict[Hashable, asyncio.Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def coalesce(key: Hashable, fn: Callable[[], T]) -> T:
+    """Run ``fn`` unless a call for ``key`` is already in flight; share its outcome."""
+    with _lock:
+        call = _calls.get(key)
+        leader = call is None
+        if call is None:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = fn()
+        return call.result
+    except BaseException as exc:
+        call.error = exc
+        raise
+    finally:
+        with _lock:
+            del _calls[key]
+        call.done.set()
+
+
+async def coalesce_async(key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+    """Async ``coalesce``: callers on the same loop await one shared task.
+
+    A cancelled caller stops waiting without cancelling the shared call.
+    """
+    loop = asyncio.get_running_loop()
+    calls = _async_calls.get(loop)
+    if calls is None:
+        calls = _async_calls[loop] = {}
+    task = calls.get(key)
+    if task is None:
+        task = calls[key] = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda done: _forget(calls, key, done))
+    return await asyncio.shield(task)
+
+
+def _forget(calls: Dict[Hashable, asyncio.Future], key: Hashable, task: Any) -> None:
+    if calls.get(key) is task:
+        del calls[key]
+
+
+def in_flight() -> int:
+    """Return the number of sync calls currently running (for diagnostics)."""
+    with _lock:
+        return len(_calls)
+
+
+__all__ = ["coalesce", "coalesce_async", "in_flight"]
@@ -1,39 +1,231 @@
-"""Fetch current standings for two teams from the NHL API."""
+"""Fetch current standings for two teams from the NHL API.
+
+The full league table for a date is downloaded once and shared by every
+matchup on that date: it is memoized in-process and, once the date's games
+are over, persisted to ``raw/standings/{date}.json``.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
-from typing import List
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from config import get_settings
+from gcp_ingestion import download_json_or_none, upload_json
 
-from nhlpy import NHLClient
+from .clients import get_async_nhl_client, get_nhl_client
+from .single_flight import coalesce_async
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+STANDINGS_BLOB = "raw/standings/{date}.json"
+
+# A date's table stops changing once its last games (late West Coast starts)
+# are final; before that it is only memoized, briefly.
+_SETTLED_AFTER = timedelta(hours=36)
+_UNSETTLED_TTL_SECONDS = 600.0
+_MEMO_MAX_DATES = 64
+
+_memo: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+_memo_lock = threading.Lock()
+# Fetches of one date are serialized by a lock picked from a fixed stripe set,
+# so the lock table does not grow with every date ever requested
+_FETCH_LOCK_STRIPES = 32
+_fetch_locks = tuple(threading.Lock() for _ in range(_FETCH_LOCK_STRIPES))
+
 
 class StandingsFetchError(Exception):
     """Raised when fetching standings fails."""
 
 
-def get_standings(date: str, *, home_abbr: str, away_abbr: str) -> List[dict]:
-    """Return standings entries for the home and away teams.
+def _bucket_name() -> str:
+    return get_settings().gcs_bucket_name
 
-    Filters the full league standings to the two teams. Returns an empty list
-    if the API returns no data for the given date.
-    """
+
+def _is_settled(date: str) -> bool:
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return False
+    return datetime.now(timezone.utc) >= day + _SETTLED_AFTER
+
+
+def _memo_get(date: str) -> Optional[dict]:
+    with _memo_lock:
+        hit = _memo.get(date)
+        if hit is None:
+            return None
+        expires_at, data = hit
+        if expires_at < time.monotonic():
+            del _memo[date]
+            return None
+        _memo.move_to_end(date)
+        return data
+
+
+def _memo_put(date: str, data: dict, *, settled: bool) -> None:
+    expires_at = float("inf") if settled else time.monotonic() + _UNSETTLED_TTL_SECONDS
+    with _memo_lock:
+        _memo[date] = (expires_at, data)
+        _memo.move_to_end(date)
+        while len(_memo) > _MEMO_MAX_DATES:
+            _memo.popitem(last=False)
+
+
+def _fetch_lock(date: str) -> threading.Lock:
+    return _fetch_locks[zlib.crc32(date.encode("utf-8")) % _FETCH_LOCK_STRIPES]
+
+
+def clear_standings_cache() -> None:
+    """Drop memoized league tables (persisted copies are kept)."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def _load_persisted(date: str) -> Optional[dict]:
+    try:
+        cached = download_json_or_none(_bucket_name(), STANDINGS_BLOB.format(date=date))
+    except Exception:
+        logger.warning("Failed to read standings cache for %s", date, exc_info=True)
+        return None
+    return cached if isinstance(cached, dict) else None
+
+
+def _persist(date: str, data: dict) -> None:
     try:
-        client = NHLClient()
+        upload_json(_bucket_name(), STANDINGS_BLOB.format(date=date), data)
+    except Exception:
+        logger.warning("Failed to upload standings cache for %s", date, exc_info=True)
+
+
+def _cached(date: str, force_refresh: bool) -> Tuple[Optional[dict], bool]:
+    """Return the memoized or persisted table, if any, and whether it is settled."""
+    settled = _is_settled(date)
+    if force_refresh:
+        return None, settled
+    # Another caller may have fetched it while this one waited
+    data = _memo_get(date)
+    if data is None and settled:
+        data = _load_persisted(date)
+        if data is not None:
+            _memo_put(date, data, settled=True)
+    return data, settled
+
+
+def _keep(date: str, data: dict, *, settled: bool) -> None:
+    if settled:
+        _persist(date, data)
+    _memo_put(date, data, settled=settled)
+
+
+def _client(factory: Callable[[], T]) -> T:
+    try:
+        return factory()
     except Exception as exc:
         logger.warning("Failed to create NHL client: %s", exc)
         raise StandingsFetchError(f"Failed to create NHL client: {exc}") from exc
 
+
+@contextmanager
+def _request_errors(date: str) -> Iterator[None]:
     try:
-        data = client.standings.get_standings(date=date)
+        yield
     except Exception as exc:
         logger.warning("Standings request failed for %s: %s", date, exc)
         raise StandingsFetchError(
             f"Failed to fetch standings for {date}: {exc}"
         ) from exc
 
+
+def _fetch(date: str) -> dict:
+    client = _client(get_nhl_client)
+    with _request_errors(date):
+        data = client.standings.get_standings(date=date)
+    return data or {}
+
+
+async def _fetch_async(date: str) -> dict:
+    client = _client(get_async_nhl_client)
+    with _request_errors(date):
+        data = await client.standings.get_standings(date=date)
+    return data or {}
+
+
+def get_league_standings(date: str, *, force_refresh: bool = False) -> dict:
+    """Return the full league standings payload for ``date``.
+
+    Lookup order is the in-process memo, then ``raw/standings/{date}.json``
+    (settled dates only), then the NHL API. Concurrent callers for the same
+    date wait for one download instead of issuing their own.
+
+    Raises:
+        StandingsFetchError: If the API has to be called and fails.
+    """
+    if not force_refresh:
+        data = _memo_get(date)
+        if data is not None:
+            return data
+
+    with _fetch_lock(date):
+        data, settled = _cached(date, force_refresh)
+        if data is None:
+            data = _fetch(date)
+            _keep(date, data, settled=settled)
+        return data
+
+
+def get_standings(date: str, *, home_abbr: str, away_abbr: str) -> List[dict]:
+    """Return standings entries for the home and away teams.
+
+    Filters the full league standings to the two teams. Returns an empty list
+    if the API returns no data for the given date.
+    """
+    data = get_league_standings(date)
+    return _filter_teams(data, home_abbr=home_abbr, away_abbr=away_abbr)
+
+
+async def get_league_standings_async(date: str, *, force_refresh: bool = False) -> dict:
+    """Async ``get_league_standings``; shares the same memo and blob.
+
+    Concurrent callers on one event loop share one download per date.
+    """
+    if not force_refresh:
+        data = _memo_get(date)
+        if data is not None:
+            return data
+    return await coalesce_async(
+        ("standings", date, force_refresh),
+        functools.partial(_load_or_fetch_async, date, force_refresh),
+    )
+
+
+async def _load_or_fetch_async(date: str, force_refresh: bool) -> dict:
+    data, settled = await asyncio.to_thread(_cached, date, force_refresh)
+    if data is None:
+        data = await _fetch_async(date)
+        await asyncio.to_thread(_keep, date, data, settled=settled)
+    return data
+
+
+async def get_standings_async(
+    date: str, *, home_abbr: str, away_abbr: str
+) -> List[dict]:
+    """Async ``get_standings``."""
+    data = await get_league_standings_async(date)
+    return _filter_teams(data, home_abbr=home_abbr, away_abbr=away_abbr)
+
+
+def _filter_teams(data: dict, *, home_abbr: str, away_abbr: str) -> List[dict]:
     if not data:
         return []
 
@@ -50,4 +242,12 @@ def _abbrev(entry: dict) -> str:
     return raw
 
 
-__all__ = ["StandingsFetchError", "get_standings"]
+__all__ = [
+    "STANDINGS_BLOB",
+    "StandingsFetchError",
+    "clear_standings_cache",
+    "get_league_standings",
+    "get_league_standings_async",
+    "get_standings",
+    "get_standings_async",
+]
@@ -7,6 +7,7 @@ from . import (
     process_game,
     summarize_game,
     date_index,
+    season_index,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "process_game",
     "summarize_game",
     "date_index",
+    "season_index",
 ]
@@ -0,0 +1,274 @@
+"""Backfill summaries for a range of dates (e.g. a historical season).
+
+Schedules for the whole range are fetched up front (a week per API call, see
+``get_schedule_range``), then every pending game is summarized on a bounded
+worker pool: raw fetches, transforms and the summary itself all run inside
+the worker, so up to ``workers`` games progress at once.
+
+Progress is checkpointed in the artifact index. When a game finishes, its
+index marks (``raw_pbp``, ``events``, the summary artifact, ...) are written
+in one read-modify-write of its date index; a game whose checkpoint cannot
+be written counts as failed. Month shards are refreshed once per batch of
+finished games rather than once per game, so workers do not queue up on
+the shard blob. A rerun reads the month shards for the range, re-checks
+the per-date docs of dates that still look unfinished (a shard sync can
+fail or lag) and skips every game that already has the summary artifact,
+so an interrupted backfill resumes with the first game it had not
+finished. Games that are not final yet are left for a later run.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from config import get_settings
+from data_fetch.game_state import is_final
+from data_fetch.schedule import get_schedule_range
+from gcp_ingestion import download_many
+from models.game_schedule import GameSchedule
+
+from .date_index import (
+    DATE_INDEX_BLOB,
+    DateIndex,
+    IndexUpdate,
+    _apply_to_date,
+    _buffering,
+    _UpdateBuffer,
+    apply_index_updates,
+)
+from .season_index import load_range, sync_dates
+from .summarize_game import summarize_game
+
+logger = logging.getLogger(__name__)
+
+# Finished games between two month-shard syncs
+_SHARD_SYNC_BATCH = 25
+
+
+@dataclass
+class BackfillReport:
+    """Outcome of one ``backfill`` run."""
+
+    start: str
+    end: str
+    games: int = 0
+    # Already checkpointed by an earlier run
+    skipped: int = 0
+    # Scheduled but not final yet
+    not_final: int = 0
+    done: List[int] = field(default_factory=list)
+    failed: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def complete(self) -> bool:
+        return not self.failed and not self.not_final
+
+
+def _checkpoints(
+    bucket: str,
+    schedules: Dict[str, List[GameSchedule]],
+    artifact: str,
+    start: str,
+    end: str,
+) -> Dict[str, DateIndex]:
+    """Per-date indexes for the range, from the month shards where they suffice.
+
+    A shard can lag its per-date docs (its sync after a checkpoint is best
+    effort), but never lead them. Dates whose shard copy still shows games
+    without ``artifact`` are re-read from the per-date docs, and shards found
+    behind are repaired.
+    """
+    indexes = load_range(bucket, start, end)
+    unsure = [
+        date
+        for date, games in schedules.items()
+        if games
+        and (
+            date not in indexes
+            or any(not indexes[date].has(g.game_id, artifact) for g in games)
+        )
+    ]
+    if not unsure:
+        return indexes
+
+    loaded = download_many(bucket, [DATE_INDEX_BLOB.format(date=d) for d in unsure])
+    for blob, exc in loaded.errors.items():
+        logger.warning("Could not read %s; trusting the month shard: %s", blob, exc)
+    behind: List[DateIndex] = []
+    for date in unsure:
+        doc = loaded.results.get(DATE_INDEX_BLOB.format(date=date))
+        if not doc:
+            continue
+        index = DateIndex.from_doc(doc, date)
+        shard_copy = indexes.get(date)
+        if shard_copy is None or shard_copy.revision < index.revision:
+            indexes[date] = index
+            behind.append(index)
+    if behind:
+        try:
+            sync_dates(bucket, behind)
+        except Exception:
+            logger.warning("Could not repair month shards", exc_info=True)
+    return indexes
+
+
+def _pending(
+    bucket: str,
+    schedules: Dict[str, List[GameSchedule]],
+    artifact: str,
+    report: BackfillReport,
+    start: str,
+    end: str,
+) -> List[Tuple[str, GameSchedule]]:
+    indexes = _checkpoints(bucket, schedules, artifact, start, end)
+    todo: List[Tuple[str, GameSchedule]] = []
+    for date, games in schedules.items():
+        index = indexes.get(date)
+        for game in games:
+            report.games += 1
+            if index is not None and index.has(game.game_id, artifact):
+                report.skipped += 1
+            elif game.game_state is not None and not is_final(game.game_state):
+                report.not_final += 1
+            else:
+                todo.append((date, game))
+    return todo
+
+
+def _backfill_game(
+    bucket: str, date: str, game: GameSchedule, *, use_ai: bool, artifact: str
+) -> List[DateIndex]:
+    """Summarize one game and checkpoint it; return the date indexes written.
+
+    Its marks and the checkpoint land in one write of the date index, which
+    raises if it keeps losing races. The month shards are left to the caller.
+    """
+    buffer = _UpdateBuffer()
+    with _buffering(buffer):
+        summarize_game(game.game_id, date=date, use_ai=use_ai)
+    pending = buffer.drain()
+    # A summary served from cache is not re-marked by summarize_game
+    pending.setdefault((bucket, date), []).append(
+        IndexUpdate(
+            game_id=game.game_id,
+            artifact=artifact,
+            away=game.away_team,
+            home=game.home_team,
+        )
+    )
+    written: List[DateIndex] = []
+    for (target, day), updates in pending.items():
+        if target == bucket:
+            written.append(_apply_to_date(bucket, day, updates))
+        else:
+            apply_index_updates(target, day, updates)
+    return written
+
+
+def _sync_shards(bucket: str, unsynced: Dict[str, DateIndex]) -> None:
+    if not unsynced:
+        return
+    try:
+        sync_dates(bucket, list(unsynced.values()))
+    except Exception:
+        # The per-date docs hold the checkpoints; a rerun repairs the shards
+        logger.warning("Could not sync month shards", exc_info=True)
+    unsynced.clear()
+
+
+def backfill(
+    start: str,
+    end: str,
+    *,
+    workers: Optional[int] = None,
+    use_ai: bool = False,
+    bucket_name: Optional[str] = None,
+) -> BackfillReport:
+    """Summarize every final game in [start, end] not summarized yet.
+
+    Args:
+        start: First date (YYYY-MM-DD).
+        end: Last date (YYYY-MM-DD), inclusive.
+        workers: Games processed concurrently (default: ``BACKFILL_WORKERS``).
+        use_ai: Generate AI summaries instead of rule-based ones.
+        bucket_name: Bucket holding the artifacts and indexes.
+
+    Failed games are logged and reported; rerunning retries them.
+
+    Raises:
+        ValueError: If ``end`` is before ``start``.
+        ScheduleFetchError: If the schedules cannot be fetched.
+    """
+    settings = get_settings()
+    bucket = bucket_name or settings.gcs_bucket_name
+    workers = max(1, workers or settings.backfill_workers)
+    artifact = "summary_ai" if use_ai else "summary_stats"
+    report = BackfillReport(start=start, end=end)
+
+    schedules = get_schedule_range(start, end, bucket_name=bucket)
+    todo = _pending(bucket, schedules, artifact, report, start, end)
+    logger.info(
+        "Backfilling %d of %d games from %s to %s (%d already done) on %d workers",
+        len(todo),
+        report.games,
+        start,
+        end,
+        report.skipped,
+        workers,
+    )
+    if not todo:
+        return report
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as ex:
+        futures = {
+            ex.submit(
+                _backfill_game, bucket, date, game, use_ai=use_ai, artifact=artifact
+            ): (date, game.game_id)
+            for date, game in todo
+        }
+        unsynced: Dict[str, DateIndex] = {}
+        finished = 0
+        try:
+            for fut in as_completed(futures):
+                date, game_id = futures[fut]
+                finished += 1
+                try:
+                    written = fut.result()
+                except Exception as exc:
+                    logger.warning(
+                        "Backfill of game %s on %s failed",
+                        game_id,
+                        date,
+                        exc_info=True,
+                    )
+                    report.failed[game_id] = str(exc)
+                else:
+                    report.done.append(game_id)
+                    for index in written:
+                        seen = unsynced.get(index.date)
+                        if seen is None or seen.revision < index.revision:
+                            unsynced[index.date] = index
+                if finished % _SHARD_SYNC_BATCH == 0:
+                    _sync_shards(bucket, unsynced)
+        except BaseException:
+            # Interrupted: let running games finish (and checkpoint), drop the rest
+            ex.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            _sync_shards(bucket, unsynced)
+
+    logger.info(
+        "Backfill %s..%s: %d done, %d failed, %d not final",
+        start,
+        end,
+        len(report.done),
+        len(report.failed),
+        report.not_final,
+    )
+    return report
+
+
+__all__ = ["BackfillReport", "backfill"]
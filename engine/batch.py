@@ -3,10 +3,16 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from datetime import datetime, timezone
+from typing import Dict, List
 
+from config import get_settings
+from data_fetch.editorial import prefetch_editorials
 from data_fetch.schedule import get_schedule
+from models.game_schedule import GameSchedule
 from models.game_summary import GameSummary
+from .date_index import IndexUpdate, deferred_index_updates, queue_index_updates
+from .summaries import load_ai_summaries
 from .summarize_game import summarize_game
 
 logger = logging.getLogger(__name__)
@@ -32,9 +38,64 @@ def summarize_date(
     schedule = get_schedule(date)
     results: List[GameSummary] = []
 
+    # One parallel sweep for cached AI summaries instead of a GET per game.
+    cached: Dict[int, str] = {}
+    if use_ai and schedule:
+        try:
+            cached = load_ai_summaries(g.game_id for g in schedule)
+        except Exception:
+            logger.warning(
+                "Bulk AI summary load failed for %s; falling back per game",
+                date,
+                exc_info=True,
+            )
+
+    # Every index mark made while summarizing this date is written at the end.
+    with deferred_index_updates():
+        if use_ai:
+            _prefetch_editorials(
+                date, [g.game_id for g in schedule if g.game_id not in cached]
+            )
+        _summarize_games(date, schedule, cached, results, use_ai=use_ai)
+        _record_summaries(date, schedule, results, use_ai=use_ai)
+    return results
+
+
+def _prefetch_editorials(date: str, game_ids: List[int]) -> None:
+    """Best-effort: look up the slate's recaps in one Forge query up front."""
+    if not game_ids:
+        return
+    try:
+        prefetch_editorials(game_ids, date=date)
+    except Exception:
+        logger.warning(
+            "Editorial prefetch failed for %s; falling back per game",
+            date,
+            exc_info=True,
+        )
+
+
+def _summarize_games(
+    date: str,
+    schedule: List[GameSchedule],
+    cached: Dict[int, str],
+    results: List[GameSummary],
+    *,
+    use_ai: bool,
+) -> None:
     for game in schedule:
         try:
-            summary = summarize_game(game.game_id, date=date, use_ai=use_ai)
+            if game.game_id in cached:
+                summary = GameSummary(
+                    game_id=game.game_id,
+                    date=date,
+                    summary_markdown=cached[game.game_id],
+                    summary_type="ai",
+                    generated_at=datetime.now(timezone.utc),
+                    cached=True,
+                )
+            else:
+                summary = summarize_game(game.game_id, date=date, use_ai=use_ai)
             enriched = summary.model_copy(
                 update={
                     "home_team": game.home_team,
@@ -52,7 +113,32 @@ def summarize_date(
                 exc_info=True,
             )
 
-    return results
+
+def _record_summaries(
+    date: str,
+    schedule: List[GameSchedule],
+    results: List[GameSummary],
+    *,
+    use_ai: bool,
+) -> None:
+    """Best-effort: flag every summarized game in the date index."""
+    if not results:
+        return
+    artifact = "summary_ai" if use_ai else "summary_stats"
+    games = {g.game_id: g for g in schedule}
+    updates = [
+        IndexUpdate(
+            game_id=r.game_id,
+            artifact=artifact,
+            away=games[r.game_id].away_team,
+            home=games[r.game_id].home_team,
+        )
+        for r in results
+    ]
+    try:
+        queue_index_updates(get_settings().gcs_bucket_name, date, updates)
+    except Exception:
+        logger.warning("Failed to update date index for %s", date, exc_info=True)
 
 
 __all__ = ["summarize_date"]
@@ -1,30 +1,421 @@
 # engine/date_index.py
-from typing import Any, Dict, List, Optional
-from gcp_ingestion import check_file_exists, download_json, upload_json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from gcp_ingestion import (
+    GenerationMismatchError,
+    download_json_with_generation,
+    upload_json,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 DATE_INDEX_BLOB = "indexes/by_date/{date}.json"
 
+# Optimistic-concurrency retry budget for index read-modify-writes
+_MAX_WRITE_ATTEMPTS = 6
+_RETRY_BASE_DELAY = 0.05
+
+
+class IndexConflictError(RuntimeError):
+    """Raised when an index update keeps losing to concurrent writers."""
+
+
+@dataclass(frozen=True)
+class IndexUpdate:
+    """One change to a game's row in the per-date index.
+
+    ``artifact`` is one of "raw_pbp", "raw_story", "raw_editorial", "events",
+    "summary_stats", "summary_ai". With ``overwrite=False`` the update only
+    registers the game and its teams, leaving artifact state alone (used to
+    seed a slate without clobbering what a fetcher already stored).
+    """
+
+    game_id: int
+    artifact: Optional[str] = None
+    exists: bool = True
+    away: Optional[str] = None
+    home: Optional[str] = None
+    overwrite: bool = True
+
+
+INDEX_VERSION = 2
+
+# Row keys in v1 documents that are not artifact flags
+_V1_ROW_FIELDS = frozenset({"game_id", "away", "home"})
+
+
+@dataclass
+class GameEntry:
+    """A game's row in the per-date index: teams plus the artifacts stored."""
+
+    game_id: int
+    away: Optional[str] = None
+    home: Optional[str] = None
+    artifacts: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class DateIndex:
+    """In-memory per-date index keyed by game_id.
+
+    Stored as ``{"version": 2, "date", "revision", "games": {"<game_id>":
+    {"away", "home", "artifacts": [...]}}}``. Version 1 documents (a ``games`` list of
+    rows with one boolean per artifact) are upgraded on read and written
+    back as version 2 on the next update.
+    """
+
+    date: str
+    games: Dict[int, GameEntry] = field(default_factory=dict)
+    # Bumped on every write; lets derived indexes ignore out-of-order copies
+    revision: int = 0
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any], date: str) -> "DateIndex":
+        version = doc.get("version", 1)
+        if version > INDEX_VERSION:
+            raise ValueError(
+                f"Date index {date} has version {version}; "
+                f"this code understands up to {INDEX_VERSION}"
+            )
+        index = cls(date=doc.get("date") or date, revision=doc.get("revision", 0))
+        if version == 1:
+            for row in doc.get("games") or []:
+                gid = row.get("game_id")
+                if gid is None:
+                    continue
+                index.games[int(gid)] = GameEntry(
+                    game_id=int(gid),
+                    away=row.get("away"),
+                    home=row.get("home"),
+                    artifacts={
+                        k for k, v in row.items() if k not in _V1_ROW_FIELDS and v
+                    },
+                )
+            return index
+        for key, row in (doc.get("games") or {}).items():
+            index.games[int(key)] = GameEntry(
+                game_id=int(key),
+                away=row.get("away"),
+                home=row.get("home"),
+                artifacts=set(row.get("artifacts") or ()),
+            )
+        return index
+
+    def to_doc(self) -> Dict[str, Any]:
+        games: Dict[str, Any] = {}
+        for gid, entry in self.games.items():
+            row: Dict[str, Any] = {"artifacts": sorted(entry.artifacts)}
+            if entry.away:
+                row["away"] = entry.away
+            if entry.home:
+                row["home"] = entry.home
+            games[str(gid)] = row
+        return {
+            "version": INDEX_VERSION,
+            "date": self.date,
+            "revision": self.revision,
+            "games": games,
+        }
 
-def _load_date_index(bucket: str, date: str) -> Dict[str, Any]:
+    def apply(self, update: IndexUpdate) -> None:
+        entry = self.games.get(update.game_id)
+        if entry is None:
+            entry = self.games[update.game_id] = GameEntry(game_id=update.game_id)
+
+        if update.away:
+            entry.away = update.away
+        if update.home:
+            entry.home = update.home
+
+        # A seed (overwrite=False) never changes an artifact's state; absence
+        # already means "not stored yet".
+        if update.artifact is None or not update.overwrite:
+            return
+        if update.exists:
+            entry.artifacts.add(update.artifact)
+        else:
+            entry.artifacts.discard(update.artifact)
+
+    def has(self, game_id: int, artifact: str) -> bool:
+        entry = self.games.get(game_id)
+        return entry is not None and artifact in entry.artifacts
+
+    def missing(self, *artifacts: str, all_missing: bool = False) -> List[int]:
+        """Sorted game ids lacking any of ``artifacts`` (or all, with ``all_missing``)."""
+        wanted = set(artifacts)
+        if all_missing:
+            return sorted(g for g, e in self.games.items() if not wanted & e.artifacts)
+        return sorted(g for g, e in self.games.items() if not wanted <= e.artifacts)
+
+    def complete(self, *artifacts: str) -> List[int]:
+        """Sorted game ids that have every one of ``artifacts``."""
+        wanted = set(artifacts)
+        return sorted(g for g, e in self.games.items() if wanted <= e.artifacts)
+
+
+def _load_versioned(bucket: str, date: str) -> Tuple[DateIndex, Optional[int]]:
+    """Return (index, generation); generation 0 means the index does not exist.
+
+    Read and decode errors propagate: treating them as "absent" would let
+    the next write replace the whole document without a precondition.
+    """
+    found = download_json_with_generation(bucket, DATE_INDEX_BLOB.format(date=date))
+    if found is None:
+        return DateIndex(date=date), 0
+    doc, generation = found
+    return DateIndex.from_doc(doc, date), generation
+
+
+def load_date_index(bucket: str, date: str) -> DateIndex:
+    """Read one date's index, upgrading older schema versions in memory."""
+    return _load_versioned(bucket, date)[0]
+
+
+def _save_date_index(
+    bucket: str,
+    date: str,
+    index: DateIndex,
+    *,
+    if_generation_match: Optional[int] = None,
+) -> None:
     blob = DATE_INDEX_BLOB.format(date=date)
-    if check_file_exists(bucket, blob):
+    upload_json(bucket, blob, index.to_doc(), if_generation_match=if_generation_match)
+
+
+def _retry_on_conflict(what: str, attempt: Callable[[], T]) -> T:
+    """Run a read-modify-conditional-write ``attempt`` until it wins the race.
+
+    Each retry waits with jittered exponential backoff.
+
+    Raises:
+        IndexConflictError: If every attempt lost a race.
+    """
+    for n in range(_MAX_WRITE_ATTEMPTS):
+        try:
+            return attempt()
+        except GenerationMismatchError:
+            delay = random.uniform(0, _RETRY_BASE_DELAY * 2**n)
+            logger.debug(
+                "%s changed concurrently; retry %d in %.3fs", what, n + 1, delay
+            )
+            time.sleep(delay)
+    raise IndexConflictError(
+        f"Gave up updating {what} after {_MAX_WRITE_ATTEMPTS} attempts"
+    )
+
+
+def _apply_to_date(bucket: str, date: str, pending: List[IndexUpdate]) -> DateIndex:
+    """Conditionally write ``pending`` into one date's doc; return the result."""
+
+    def attempt() -> DateIndex:
+        index, generation = _load_versioned(bucket, date)
+        for update in pending:
+            index.apply(update)
+        index.revision += 1
+        _save_date_index(bucket, date, index, if_generation_match=generation)
+        return index
+
+    return _retry_on_conflict(f"date index {date}", attempt)
+
+
+def _sync_season_index(bucket: str, indexes: List[DateIndex]) -> None:
+    # Lazy import: season_index builds on this module.
+    from engine.season_index import sync_dates
+
+    try:
+        sync_dates(bucket, indexes)
+    except Exception as e:  # the per-date docs stay the source of truth
+        logger.warning(
+            "Season index sync failed for %s: %s",
+            ", ".join(i.date for i in indexes),
+            e,
+        )
+
+
+def apply_index_updates(bucket: str, date: str, updates: Iterable[IndexUpdate]) -> None:
+    """Apply many updates to one date's index with a single read and write.
+
+    The write is conditional on the generation that was read. If another
+    worker updated the index in between, the updates are re-applied to the
+    fresh copy (with jittered backoff) so neither side's rows are lost. The
+    result is then copied into the month's season index shard.
+
+    Raises:
+        IndexConflictError: If every attempt lost a race.
+    """
+    pending = list(updates)
+    if not pending:
+        return
+    _sync_season_index(bucket, [_apply_to_date(bucket, date, pending)])
+
+
+def apply_index_updates_bulk(
+    bucket: str,
+    updates_by_date: Dict[str, List[IndexUpdate]],
+    *,
+    max_workers: int = 8,
+) -> None:
+    """Apply updates to many dates' indexes at once.
+
+    Per-date writes run in parallel (they touch different docs); each month
+    shard is then synced once for all of its dates rather than once per date.
+
+    Raises:
+        IndexConflictError: If some date kept losing races; the other dates
+            are still written and synced.
+    """
+    pending = {d: list(u) for d, u in updates_by_date.items() if u}
+    if not pending:
+        return
+    written: List[DateIndex] = []
+    failed: Dict[str, Exception] = {}
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(pending))),
+        thread_name_prefix="index-bulk",
+    ) as executor:
+        futures = {
+            executor.submit(_apply_to_date, bucket, d, u): d for d, u in pending.items()
+        }
+    for fut, date in futures.items():
+        try:
+            written.append(fut.result())
+        except Exception as exc:
+            failed[date] = exc
+    if written:
+        _sync_season_index(bucket, sorted(written, key=lambda i: i.date))
+    if failed:
+        first = min(failed)
+        raise IndexConflictError(
+            f"Could not update {len(failed)} date index(es), first {first}"
+        ) from failed[first]
+
+
+class _UpdateBuffer:
+    """Index updates collected by a ``deferred_index_updates`` scope."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._updates: Dict[Tuple[str, str], List[IndexUpdate]] = {}
+
+    def add(self, bucket: str, date: str, updates: Iterable[IndexUpdate]) -> None:
+        with self._lock:
+            self._updates.setdefault((bucket, date), []).extend(updates)
+
+    def drain(self) -> Dict[Tuple[str, str], List[IndexUpdate]]:
+        with self._lock:
+            pending, self._updates = self._updates, {}
+        return pending
+
+
+_active_buffer: ContextVar[Optional[_UpdateBuffer]] = ContextVar(
+    "date_index_buffer", default=None
+)
+_flush_executor: Optional[ThreadPoolExecutor] = None
+_flush_futures: Set[Future] = set()
+_flush_lock = threading.Lock()
+
+
+def _flush(pending: Dict[Tuple[str, str], List[IndexUpdate]]) -> None:
+    for (bucket, date), updates in pending.items():
         try:
-            return download_json(bucket, blob)
+            apply_index_updates(bucket, date, updates)
         except Exception:
-            pass
-    return {"date": date, "games": []}
+            logger.warning(
+                "Deferred index flush failed for %s (%d updates)",
+                date,
+                len(updates),
+                exc_info=True,
+            )
 
 
-def _save_date_index(bucket: str, date: str, doc: Dict[str, Any]) -> None:
-    blob = DATE_INDEX_BLOB.format(date=date)
-    upload_json(bucket, blob, doc)
+def _flush_in_background(pending: Dict[Tuple[str, str], List[IndexUpdate]]) -> None:
+    global _flush_executor
+    with _flush_lock:
+        if _flush_executor is None:
+            _flush_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="index-flush"
+            )
+        fut = _flush_executor.submit(_flush, pending)
+        _flush_futures.add(fut)
+    fut.add_done_callback(_flush_futures.discard)
+
+
+def wait_for_index_flushes(timeout: Optional[float] = None) -> bool:
+    """Block until background flushes finish; return False on timeout."""
+    with _flush_lock:
+        pending = list(_flush_futures)
+    _, not_done = wait(pending, timeout=timeout)
+    return not not_done
+
 
+@contextmanager
+def _buffering(buffer: _UpdateBuffer) -> Iterator[None]:
+    """Route ``queue_index_updates`` in this scope into ``buffer``."""
+    token = _active_buffer.set(buffer)
+    try:
+        yield
+    finally:
+        _active_buffer.reset(token)
 
-def _find_row(doc: Dict[str, Any], game_id: int) -> Optional[Dict[str, Any]]:
-    for row in doc.get("games", []):
-        if row.get("game_id") == game_id:
-            return row
-    return None
+
+@contextmanager
+def deferred_index_updates(*, background: bool = False) -> Iterator[None]:
+    """Buffer index updates made in this scope and write them once at the end.
+
+    Inside the scope ``mark_artifact`` and ``queue_index_updates`` only record
+    their updates; on exit they are grouped per date and applied with one
+    read-modify-write each. With ``background=True`` that flush runs on a
+    worker thread, off the caller's latency path (see
+    ``wait_for_index_flushes``). Nested scopes join the outermost one.
+
+    The buffer lives in a context variable: work handed to other threads must
+    run in a copy of the caller's context (``contextvars.copy_context().run``)
+    to be captured. Flush failures are logged, never raised.
+    """
+    if _active_buffer.get() is not None:
+        yield
+        return
+    buffer = _UpdateBuffer()
+    try:
+        with _buffering(buffer):
+            yield
+    finally:
+        pending = buffer.drain()
+        if pending:
+            if background:
+                _flush_in_background(pending)
+            else:
+                _flush(pending)
+
+
+def queue_index_updates(bucket: str, date: str, updates: Iterable[IndexUpdate]) -> None:
+    """Apply ``updates`` now, or defer them to the enclosing buffered scope."""
+    buffer = _active_buffer.get()
+    if buffer is None:
+        apply_index_updates(bucket, date, updates)
+    else:
+        buffer.add(bucket, date, updates)
 
 
 def mark_artifact(
@@ -37,27 +428,32 @@ def mark_artifact(
     artifact: str,  # one of: "raw_pbp", "raw_story", "events", "summary_stats", "summary_ai"
     exists: bool = True,
 ) -> None:
-    doc = _load_date_index(bucket, date)
-    row = _find_row(doc, game_id)
-    if not row:
-        row = {"game_id": game_id}
-        doc["games"].append(row)
-
-    if away:
-        row["away"] = away
-    if home:
-        row["home"] = home
-
-    row[artifact] = exists
-    _save_date_index(bucket, date, doc)
-
-
-def list_games_missing(bucket: str, date: str, artifact: str) -> List[int]:
-    doc = _load_date_index(bucket, date)
-    out: List[int] = []
-    for r in doc.get("games", []):
-        if not r.get(artifact, False):
-            gid = r.get("game_id")
-            if gid is not None:
-                out.append(gid)
-    return out
+    queue_index_updates(
+        bucket,
+        date,
+        [
+            IndexUpdate(
+                game_id=game_id,
+                artifact=artifact,
+                exists=exists,
+                away=away,
+                home=home,
+            )
+        ],
+    )
+
+
+def list_games_missing(
+    bucket: str, date: str, *artifacts: str, all_missing: bool = False
+) -> List[int]:
+    """Game ids still lacking any of ``artifacts``, sorted by game id.
+
+    With ``all_missing=True`` only games lacking every one of them are
+    returned (e.g. neither raw_pbp nor raw_story fetched yet).
+    """
+    return load_date_index(bucket, date).missing(*artifacts, all_missing=all_missing)
+
+
+def list_games_complete(bucket: str, date: str, *artifacts: str) -> List[int]:
+    """Game ids that already have every one of ``artifacts``."""
+    return load_date_index(bucket, date).complete(*artifacts)
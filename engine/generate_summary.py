@@ -1,6 +1,51 @@
-from typing import List, Dict
+from typing import List, Dict, Any
 from collections import defaultdict
 
+# Per-team counters keyed by event type (goals/SOG get period filters below)
+STAT_KEYS = {
+    "goal": "goals",
+    "shot-on-goal": "shots_on_goal",
+    "penalty": "penalties",
+    "hit": "hits",
+    "faceoff": "faceoffs",
+    "blocked-shot": "blocked_shots",
+    "missed-shot": "missed_shots",
+    "giveaway": "giveaways",
+    "takeaway": "takeaways",
+    "delayed-penalty": "delayed_penalties",
+}
+
+
+def new_team_stats() -> Dict[str, int]:
+    """Return zeroed per-team counters."""
+    return dict.fromkeys(STAT_KEYS.values(), 0)
+
+
+def tally_event(team_stats: Dict[Any, Dict[str, int]], event: Dict[str, Any]) -> None:
+    """Add one transformed event to ``team_stats`` (keyed by team id)."""
+    etype = event.get("event_type")
+    tid = event.get("team_id")
+    per = event.get("period")
+
+    if tid is None:
+        return
+    stats = team_stats.get(tid)
+    if stats is None:
+        stats = team_stats[tid] = new_team_stats()
+
+    # Raw counters (no period filter except where noted)
+    key = STAT_KEYS.get(etype)
+    if key and key not in ("goals", "shots_on_goal"):
+        stats[key] += 1
+
+    # Goals: Reg+OT only (shootout excluded)
+    if etype == "goal" and per in (1, 2, 3, 4):
+        stats["goals"] += 1
+
+    # SOG: Reg+OT only; goals count as SOG
+    if etype in ("goal", "shot-on-goal") and per in (1, 2, 3, 4):
+        stats["shots_on_goal"] += 1
+
 
 def generate_summary(events: List[Dict]) -> str:
     """
@@ -41,55 +86,9 @@ def generate_summary(events: List[Dict]) -> str:
     away_ab = away_team.get("abbrev", "AWY")
 
     # ---------- Team-level aggregation ----------
-    stat_keys = {
-        "goal": "goals",
-        "shot-on-goal": "shots_on_goal",  # recalculated with period filter below
-        "penalty": "penalties",
-        "hit": "hits",
-        "faceoff": "faceoffs",
-        "blocked-shot": "blocked_shots",
-        "missed-shot": "missed_shots",
-        "giveaway": "giveaways",
-        "takeaway": "takeaways",
-        "delayed-penalty": "delayed_penalties",
-    }
-
-    team_stats = defaultdict(
-        lambda: {
-            "goals": 0,  # Reg+OT (we'll enforce by counting only p in 1..4)
-            "shots_on_goal": 0,  # Reg+OT, goals count as SOG
-            "penalties": 0,
-            "hits": 0,
-            "faceoffs": 0,
-            "blocked_shots": 0,
-            "missed_shots": 0,
-            "giveaways": 0,
-            "takeaways": 0,
-            "delayed_penalties": 0,
-        }
-    )
-
-    # Tally per-team with correct period filters
+    team_stats: Dict[int, Dict[str, int]] = {}
     for e in events:
-        etype = e.get("event_type")
-        tid = e.get("team_id")
-        per = e.get("period")
-
-        if tid is None:
-            continue
-
-        # Raw counters (no period filter except where noted)
-        key = stat_keys.get(etype)
-        if key and key not in ("goals", "shots_on_goal"):
-            team_stats[tid][key] += 1
-
-        # Goals: Reg+OT only
-        if etype == "goal" and per in (1, 2, 3, 4):
-            team_stats[tid]["goals"] += 1
-
-        # SOG: Reg+OT only; goals count as SOG
-        if etype in ("goal", "shot-on-goal") and per in (1, 2, 3, 4):
-            team_stats[tid]["shots_on_goal"] += 1
+        tally_event(team_stats, e)
 
     # ---------- Determine (OT)/(SO) for final score ----------
     # Default no suffix
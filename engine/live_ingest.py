@@ -0,0 +1,203 @@
+"""Incremental play-by-play ingestion for games in progress.
+
+Each poll transforms only the plays after the game's cursor (the last
+``sortOrder``/``eventId`` seen), appends them to the game's event log as one
+small chunk blob and folds them into running per-team counters, so the work
+per poll tracks the number of new plays rather than the length of the game.
+
+Blobs live under ``live/``, outside the ``raw/`` cache: polls rewrite them
+with conditional writes, which need the stored generation a cached copy
+lacks.
+
+* ``live/events/{game_id}/state.json`` - cursor, chunk list, team counters
+* ``live/events/{game_id}/{first}-{last}.json`` - transformed plays, keyed by
+  the sortOrder range they cover
+
+A poll writes its chunk first and then claims it with a conditional write of
+the state. A poller that loses the race, or crashes in between, leaves an
+unreferenced chunk behind, which readers never see.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import get_settings
+from data_fetch.game_state import is_final
+from data_fetch.play_by_play import get_play_by_play
+from gcp_ingestion import download_json_with_generation, download_many, upload_json
+
+from .date_index import _retry_on_conflict
+from .generate_summary import tally_event
+from .process_game import enrich_event, roster_maps
+from .transform import transform_event
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATE_BLOB = "live/events/{game_id}/state.json"
+LIVE_CHUNK_BLOB = "live/events/{game_id}/{first:06d}-{last:06d}.json"
+
+
+@dataclass
+class LiveUpdate:
+    """Outcome of one ingestion poll."""
+
+    game_id: int
+    new_events: List[Dict[str, Any]] = field(default_factory=list)
+    event_count: int = 0
+    team_stats: Dict[int, Dict[str, int]] = field(default_factory=dict)
+    game_state: Optional[str] = None
+
+    @property
+    def final(self) -> bool:
+        return is_final(self.game_state)
+
+
+def _play_key(play: Dict[str, Any]) -> Tuple[int, int]:
+    sort_order = play.get("sortOrder")
+    event_id = play.get("eventId")
+    return (
+        sort_order if isinstance(sort_order, int) else -1,
+        event_id if isinstance(event_id, int) else -1,
+    )
+
+
+def new_plays(
+    plays: Iterable[Dict[str, Any]], cursor: Optional[Dict[str, int]]
+) -> List[Dict[str, Any]]:
+    """Return the plays after ``cursor``, in ``sortOrder`` then ``eventId`` order."""
+    last = (
+        (cursor.get("sort_order", -1), cursor.get("event_id", -1))
+        if cursor
+        else (-1, -1)
+    )
+    fresh = [p for p in plays if isinstance(p, dict) and _play_key(p) > last]
+    return sorted(fresh, key=_play_key)
+
+
+def _empty_state(game_id: int) -> Dict[str, Any]:
+    return {
+        "game_id": game_id,
+        "cursor": None,
+        "chunks": [],
+        "event_count": 0,
+        "team_stats": {},
+        "game_state": None,
+    }
+
+
+def _team_stats(doc: Optional[Dict[str, Any]]) -> Dict[int, Dict[str, int]]:
+    # JSON object keys are strings; team ids are ints everywhere else
+    return {int(tid): dict(stats) for tid, stats in (doc or {}).items()}
+
+
+def ingest_live_plays(game_id: int, *, bucket_name: Optional[str] = None) -> LiveUpdate:
+    """Fold the plays added since the last poll into the game's event log.
+
+    The play-by-play comes from ``get_play_by_play``, whose cache expires
+    quickly for live games, so polling more often than ``LIVE_CACHE_TTL``
+    finds nothing new.
+
+    Raises:
+        PlayByPlayFetchError: If the play-by-play cannot be fetched.
+        IndexConflictError: If concurrent pollers keep winning the state write.
+    """
+    bucket = bucket_name or get_settings().gcs_bucket_name
+    raw = get_play_by_play(game_id, mark_index=False)
+    plays = raw.get("plays") or []
+    game_state = raw.get("gameState")
+    player_map, _, team_name_map, _ = roster_maps(raw)
+    state_blob = LIVE_STATE_BLOB.format(game_id=game_id)
+    update = LiveUpdate(game_id=game_id, game_state=game_state)
+
+    def attempt() -> None:
+        loaded = download_json_with_generation(bucket, state_blob)
+        state, generation = loaded if loaded else (_empty_state(game_id), 0)
+        stats = _team_stats(state.get("team_stats"))
+        fresh = new_plays(plays, state.get("cursor"))
+
+        update.new_events = []
+        update.event_count = state.get("event_count", 0)
+        update.team_stats = stats
+        if not fresh and state.get("game_state") == game_state:
+            return  # nothing to record
+
+        events = [
+            enrich_event(transform_event(p), team_name_map, player_map) for p in fresh
+        ]
+        for event in events:
+            tally_event(stats, event)
+
+        chunks = list(state.get("chunks") or [])
+        cursor = state.get("cursor")
+        if fresh:
+            first, last = _play_key(fresh[0]), _play_key(fresh[-1])
+            chunk = LIVE_CHUNK_BLOB.format(
+                game_id=game_id, first=first[0], last=last[0]
+            )
+            upload_json(bucket, chunk, {"game_id": game_id, "events": events})
+            chunks.append(chunk)
+            cursor = {"sort_order": last[0], "event_id": last[1]}
+
+        count = state.get("event_count", 0) + len(events)
+        upload_json(
+            bucket,
+            state_blob,
+            {
+                "game_id": game_id,
+                "cursor": cursor,
+                "chunks": chunks,
+                "event_count": count,
+                "team_stats": {str(tid): s for tid, s in stats.items()},
+                "game_state": game_state,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            },
+            if_generation_match=generation,
+        )
+        update.new_events = events
+        update.event_count = count
+
+    _retry_on_conflict(f"live event log for game {game_id}", attempt)
+    if update.new_events:
+        logger.info(
+            "Ingested %d new plays for game %s (%d total)",
+            len(update.new_events),
+            game_id,
+            update.event_count,
+        )
+    return update
+
+
+def load_live_events(
+    game_id: int, *, bucket_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Return every event logged so far for ``game_id``, in play order."""
+    bucket = bucket_name or get_settings().gcs_bucket_name
+    loaded = download_json_with_generation(
+        bucket, LIVE_STATE_BLOB.format(game_id=game_id)
+    )
+    if loaded is None:
+        return []
+    chunks = loaded[0].get("chunks") or []
+    docs = download_many(bucket, chunks).results
+    events: List[Dict[str, Any]] = []
+    for chunk in chunks:
+        doc = docs.get(chunk)
+        if doc is None:
+            logger.warning("Live event chunk %s is missing", chunk)
+            continue
+        events.extend(doc.get("events") or [])
+    return events
+
+
+__all__ = [
+    "LIVE_CHUNK_BLOB",
+    "LIVE_STATE_BLOB",
+    "LiveUpdate",
+    "ingest_live_plays",
+    "load_live_events",
+    "new_plays",
+]
@@ -1,13 +1,13 @@
 from data_fetch.play_by_play import get_play_by_play
 from data_fetch.game_story import get_game_story
 from engine.transform import transform_event
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 
-def process_game_events(game_id: int) -> List[Dict[str, Any]]:
-    raw_data = get_play_by_play(game_id)
-    events = raw_data.get("plays", [])
-
+def roster_maps(
+    raw_data: Dict[str, Any],
+) -> Tuple[Dict[int, str], Dict[int, int], Dict[int, str], Dict[str, int]]:
+    """Return (player names, player teams, team names, team ids by abbrev) from PBP."""
     roster_spots = raw_data.get("rosterSpots", [])
     player_map: Dict[int, str] = {}
     player_team_map: Dict[int, int] = {}
@@ -36,20 +36,36 @@ def process_game_events(game_id: int) -> List[Dict[str, Any]]:
         if abbrev:
             abbrev_to_id[abbrev] = tid
 
-    transformed_events = [transform_event(e) for e in events]
+    return player_map, player_team_map, team_name_map, abbrev_to_id
+
+
+def enrich_event(
+    event: Dict[str, Any], team_name_map: Dict[int, str], player_map: Dict[int, str]
+) -> Dict[str, Any]:
+    """Add team and goal scorer/assist names to a transformed event in place."""
+    team_id = event.get("team_id")
+    if team_id in team_name_map:
+        event["team_name"] = team_name_map[team_id]
+
+    if event.get("event_type") == "goal":
+        players = event.get("players", {})
+        scorer_id = players.get("scorer_id")
+        if scorer_id is not None:
+            players["scorer_name"] = player_map.get(scorer_id)
+        assist_ids = players.get("assist_ids", [])
+        players["assist_names"] = [player_map.get(aid) for aid in assist_ids]
+    return event
+
+
+def process_game_events(game_id: int) -> List[Dict[str, Any]]:
+    raw_data = get_play_by_play(game_id)
+    events = raw_data.get("plays", [])
 
-    for event in transformed_events:
-        team_id = event.get("team_id")
-        if team_id in team_name_map:
-            event["team_name"] = team_name_map[team_id]
+    player_map, player_team_map, team_name_map, abbrev_to_id = roster_maps(raw_data)
 
-        if event.get("event_type") == "goal":
-            players = event.get("players", {})
-            scorer_id = players.get("scorer_id")
-            if scorer_id is not None:
-                players["scorer_name"] = player_map.get(scorer_id)
-            assist_ids = players.get("assist_ids", [])
-            players["assist_names"] = [player_map.get(aid) for aid in assist_ids]
+    transformed_events = [
+        enrich_event(transform_event(e), team_name_map, player_map) for e in events
+    ]
 
     story = get_game_story(game_id)
     for side in ["homeTeam", "awayTeam"]:
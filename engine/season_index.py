@@ -0,0 +1,204 @@
+# engine/season_index.py
+"""Consolidated artifact index across many dates, sharded by month.
+
+Each shard ``indexes/by_month/{yyyy-mm}.json`` holds a copy of every
+per-date index in that month::
+
+    {"version": 1, "month": "2025-04",
+     "dates": {"2025-04-25": {"revision": 3, "games": {...}}}}
+
+Shards are refreshed after every per-date write (see
+``date_index.apply_index_updates``), so a week or a whole season can be
+planned from one or a handful of reads instead of one GET per day. The
+per-date docs remain the source of truth; ``rebuild_month`` regenerates a
+shard from them.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date as date_cls
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from gcp_ingestion import (
+    download_json_with_generation,
+    download_many,
+    list_blobs,
+    upload_json,
+)
+
+from .date_index import DATE_INDEX_BLOB, DateIndex, _retry_on_conflict
+
+logger = logging.getLogger(__name__)
+
+MONTH_INDEX_BLOB = "indexes/by_month/{month}.json"
+MONTH_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Coverage:
+    """How many games in a date range have each artifact."""
+
+    games: int
+    present: Dict[str, int] = field(default_factory=dict)
+
+    def missing(self, artifact: str) -> int:
+        return self.games - self.present.get(artifact, 0)
+
+
+def _month_of(date: str) -> str:
+    return date[:7]
+
+
+def _months_between(start: str, end: str) -> List[str]:
+    first = date_cls.fromisoformat(start)
+    last = date_cls.fromisoformat(end)
+    year, month = first.year, first.month
+    out: List[str] = []
+    while (year, month) <= (last.year, last.month):
+        out.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return out
+
+
+def _empty_shard(month: str) -> Dict[str, Any]:
+    return {"version": MONTH_INDEX_VERSION, "month": month, "dates": {}}
+
+
+def _load_shard(bucket: str, month: str) -> Tuple[Dict[str, Any], Optional[int]]:
+    # Errors propagate rather than letting an unconditional write clobber it
+    found = download_json_with_generation(bucket, MONTH_INDEX_BLOB.format(month=month))
+    if found is None:
+        return _empty_shard(month), 0
+    return found
+
+
+def sync_date(bucket: str, index: DateIndex) -> None:
+    """Copy one date's index into its month shard.
+
+    Copies older than the one already in the shard (by ``revision``) are
+    dropped, so out-of-order syncs from concurrent workers never regress it.
+    """
+    sync_dates(bucket, [index])
+
+
+def _merge_into(
+    shard: Dict[str, Any], entries: Iterable[Tuple[str, int, Dict[str, Any]]]
+) -> bool:
+    """Copy ``(date, revision, games)`` entries into ``shard``; newer revisions win.
+
+    Return True if the shard changed.
+    """
+    changed = False
+    for date, revision, games in entries:
+        current = shard["dates"].get(date)
+        if current is not None and current.get("revision", 0) >= revision:
+            continue
+        shard["dates"][date] = {"revision": revision, "games": games}
+        changed = True
+    return changed
+
+
+def _write_month(
+    bucket: str, month: str, entries: List[Tuple[str, int, Dict[str, Any]]]
+) -> None:
+    def attempt() -> None:
+        shard, generation = _load_shard(bucket, month)
+        if not _merge_into(shard, entries):
+            return
+        upload_json(
+            bucket,
+            MONTH_INDEX_BLOB.format(month=month),
+            shard,
+            if_generation_match=generation,
+        )
+
+    _retry_on_conflict(f"month index {month}", attempt)
+
+
+def sync_dates(bucket: str, indexes: Iterable[DateIndex]) -> None:
+    """Like ``sync_date`` for many dates, with one write per month shard."""
+    by_month: Dict[str, List[DateIndex]] = {}
+    for index in indexes:
+        by_month.setdefault(_month_of(index.date), []).append(index)
+
+    for month, month_indexes in sorted(by_month.items()):
+        entries = [(i.date, i.revision, i.to_doc()["games"]) for i in month_indexes]
+        _write_month(bucket, month, entries)
+
+
+def rebuild_month(bucket: str, month: str) -> int:
+    """Regenerate a month shard from the per-date indexes; return dates found.
+
+    The per-date copies are merged into the shard like ``sync_dates`` does,
+    so a sync racing the rebuild never loses its newer revision.
+    """
+    prefix = DATE_INDEX_BLOB.split("{date}")[0] + f"{month}-"
+    blobs = [b for b in list_blobs(bucket, prefix=prefix) if b.endswith(".json")]
+    loaded = download_many(bucket, blobs)
+    entries: List[Tuple[str, int, Dict[str, Any]]] = []
+    for blob, doc in loaded.results.items():
+        if not doc:
+            continue
+        date = blob.rsplit("/", 1)[-1][: -len(".json")]
+        entry = DateIndex.from_doc(doc, date).to_doc()
+        entries.append((date, entry["revision"], entry["games"]))
+    if loaded.errors or loaded.timed_out:
+        raise RuntimeError(f"Could not read every date index for {month}")
+    _write_month(bucket, month, entries)
+    return len(entries)
+
+
+def load_range(bucket: str, start: str, end: str) -> Dict[str, DateIndex]:
+    """Return the indexed dates in [start, end] (ISO dates), oldest first.
+
+    Reads one shard per month in the range, in parallel.
+    """
+    months = _months_between(start, end)
+    loaded = download_many(bucket, [MONTH_INDEX_BLOB.format(month=m) for m in months])
+    for blob, exc in loaded.errors.items():
+        logger.warning("Could not read %s: %s", blob, exc)
+
+    out: Dict[str, DateIndex] = {}
+    for month in months:
+        shard = loaded.results.get(MONTH_INDEX_BLOB.format(month=month))
+        if not shard:
+            continue
+        for date, entry in sorted(shard.get("dates", {}).items()):
+            if start <= date <= end:
+                out[date] = DateIndex.from_doc(
+                    {"version": 2, "date": date, **entry}, date
+                )
+    return out
+
+
+def list_games_missing(
+    bucket: str,
+    start: str,
+    end: str,
+    *artifacts: str,
+    all_missing: bool = False,
+) -> Dict[str, List[int]]:
+    """Game ids lacking any of ``artifacts`` per date in [start, end].
+
+    Dates with nothing missing are left out. ``all_missing`` behaves as in
+    ``date_index.list_games_missing``.
+    """
+    out: Dict[str, List[int]] = {}
+    for date, index in load_range(bucket, start, end).items():
+        missing = index.missing(*artifacts, all_missing=all_missing)
+        if missing:
+            out[date] = missing
+    return out
+
+
+def coverage(bucket: str, start: str, end: str, *artifacts: str) -> Coverage:
+    """Count games in [start, end] and how many have each of ``artifacts``."""
+    games = 0
+    present = {a: 0 for a in artifacts}
+    for index in load_range(bucket, start, end).values():
+        for entry in index.games.values():
+            games += 1
+            for artifact in artifacts:
+                if artifact in entry.artifacts:
+                    present[artifact] += 1
+    return Coverage(games=games, present=present)
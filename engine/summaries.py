@@ -1,9 +1,9 @@
 # engine/summaries.py
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from config import get_settings
-from gcp_ingestion import check_file_exists, download_text, upload_text
+from gcp_ingestion import download_many, download_text_or_none, upload_text
 
 
 # Lazy import inside functions to avoid any possible import loops:
@@ -51,8 +51,10 @@ def get_or_build_stats_summary(
     bucket = _bucket()
     blob = _STATS_BLOB.format(game_id=game_id)
 
-    if not force_refresh and check_file_exists(bucket, blob):
-        return download_text(bucket, blob)
+    if not force_refresh:
+        cached = download_text_or_none(bucket, blob)
+        if cached is not None:
+            return cached
 
     # Build, upload, mark index
     summary = generator_fn(events)
@@ -78,6 +80,21 @@ def load_ai_summary(*, game_id: int) -> Optional[str]:
     """
     bucket = _bucket()
     blob = _AI_BLOB.format(game_id=game_id)
-    if not check_file_exists(bucket, blob):
-        return None
-    return download_text(bucket, blob)
+    return download_text_or_none(bucket, blob)
+
+
+def load_ai_summaries(
+    game_ids: Iterable[int], *, timeout: Optional[float] = None
+) -> Dict[int, str]:
+    """
+    Load cached AI summaries for many games in parallel.
+
+    Returns only the games that have a summary; read failures are logged and
+    treated as misses so callers can regenerate those games.
+    """
+    bucket = _bucket()
+    blobs = {_AI_BLOB.format(game_id=gid): gid for gid in game_ids}
+    result = download_many(bucket, blobs, as_text=True, timeout=timeout)
+    return {
+        blobs[name]: text for name, text in result.results.items() if text is not None
+    }
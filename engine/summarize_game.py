@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import contextvars
 import logging
 from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime, timezone
@@ -15,6 +16,8 @@ from data_fetch.game_story import get_game_story
 from data_fetch.editorial import get_editorial, EditorialFetchError
 from data_fetch.standings import get_standings, StandingsFetchError
 from data_fetch.season_series import get_season_series, SeasonSeriesFetchError
+from data_fetch.single_flight import coalesce
+from .date_index import deferred_index_updates
 from .summaries import (
     get_or_build_stats_summary,
     save_ai_summary,
@@ -56,6 +59,27 @@ def summarize_game(
     Returns:
         GameSummary with summary_markdown and metadata.
     """
+    # Index marks from the fetchers and summary caches are written once, at
+    # the end, instead of one read-modify-write per artifact.
+    with deferred_index_updates():
+        if use_ai:
+            # Concurrent requests for a game share one fetch-and-generate run,
+            # so a burst right after the final horn costs one OpenAI call.
+            # The date is part of the key: it selects the standings and
+            # editorial context and the index rows the run marks.
+            return coalesce(
+                ("ai_summary", game_id, date),
+                lambda: _summarize_game(game_id, date=date, use_ai=True),
+            )
+        return _summarize_game(game_id, date=date, use_ai=use_ai)
+
+
+def _submit(executor: ThreadPoolExecutor, fn, *args, **kwargs) -> Future:
+    # Run in a copy of our context so workers see the index buffer.
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def _summarize_game(game_id: int, *, date: Optional[str], use_ai: bool) -> GameSummary:
     now = datetime.now(timezone.utc)
 
     if use_ai:
@@ -73,10 +97,10 @@ def summarize_game(
 
         # 2) Fetch all data in parallel, generate, cache
         with ThreadPoolExecutor(max_workers=5) as executor:
-            pbp_fut = executor.submit(get_play_by_play, game_id)
-            story_fut = executor.submit(get_game_story, game_id)
-            editorial_fut = executor.submit(get_editorial, game_id, date=date)
-            series_fut = executor.submit(get_season_series, game_id)
+            pbp_fut = _submit(executor, get_play_by_play, game_id)
+            story_fut = _submit(executor, get_game_story, game_id)
+            editorial_fut = _submit(executor, get_editorial, game_id, date=date)
+            series_fut = _submit(executor, get_season_series, game_id)
 
             pbp = pbp_fut.result()  # required — propagates on failure
             away_abbr = (pbp.get("awayTeam") or {}).get("abbrev")
@@ -84,8 +108,12 @@ def summarize_game(
 
             standings_fut: Optional[Future] = None
             if date and away_abbr and home_abbr:
-                standings_fut = executor.submit(
-                    get_standings, date, home_abbr=home_abbr, away_abbr=away_abbr
+                standings_fut = _submit(
+                    executor,
+                    get_standings,
+                    date,
+                    home_abbr=home_abbr,
+                    away_abbr=away_abbr,
                 )
 
             story = story_fut.result()  # required — propagates on failure
@@ -1,21 +1,75 @@
+from .aio import (
+    download_json_or_none_async,
+    download_json_with_metadata_async,
+    download_text_or_none_async,
+    upload_json_async,
+    upload_text_async,
+)
+from .backends import (
+    GCSBackend,
+    GenerationMismatchError,
+    LocalBackend,
+    MemoryBackend,
+    StorageBackend,
+    StoredBlob,
+)
+from .bulk import BulkResult, download_many, exists_many, upload_many
+from .cache import CacheStats, TieredCacheBackend
 from .storage import (
     check_file_exists,
+    delete_blob,
     download_json,
+    download_json_or_none,
+    download_json_with_generation,
+    download_json_with_metadata,
     download_text,
+    download_text_or_none,
+    get_cache_stats,
+    get_storage_backend,
     get_storage_client,
+    list_blobs,
+    override_storage_backend,
     override_storage_client,
+    reset_storage_backend,
     reset_storage_client,
     upload_json,
     upload_text,
 )
 
 __all__ = [
+    "BulkResult",
+    "CacheStats",
+    "GCSBackend",
+    "GenerationMismatchError",
+    "LocalBackend",
+    "MemoryBackend",
+    "StorageBackend",
+    "StoredBlob",
+    "TieredCacheBackend",
     "check_file_exists",
+    "delete_blob",
     "download_json",
+    "download_json_or_none",
+    "download_json_or_none_async",
+    "download_many",
+    "download_json_with_generation",
+    "download_json_with_metadata",
+    "download_json_with_metadata_async",
     "download_text",
+    "download_text_or_none",
+    "download_text_or_none_async",
+    "exists_many",
+    "get_cache_stats",
+    "get_storage_backend",
     "get_storage_client",
+    "list_blobs",
+    "override_storage_backend",
     "override_storage_client",
+    "reset_storage_backend",
     "reset_storage_client",
     "upload_json",
+    "upload_json_async",
+    "upload_many",
     "upload_text",
+    "upload_text_async",
 ]
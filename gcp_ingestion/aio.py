@@ -0,0 +1,81 @@
+"""Asyncio variants of the blob helpers.
+
+Storage client libraries block, so each call runs on the default executor
+via ``asyncio.to_thread``: the event loop keeps serving other requests while
+the read or write is in flight, and the caller's context (e.g. a deferred
+index buffer) carries over to the worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+from .storage import (
+    download_json_or_none,
+    download_json_with_metadata,
+    download_text_or_none,
+    upload_json,
+    upload_text,
+)
+
+
+async def download_json_or_none_async(
+    bucket_name: str, blob_name: str
+) -> Optional[Any]:
+    """Async ``download_json_or_none``."""
+    return await asyncio.to_thread(download_json_or_none, bucket_name, blob_name)
+
+
+async def download_json_with_metadata_async(
+    bucket_name: str, blob_name: str
+) -> Optional[Tuple[Any, Dict[str, str]]]:
+    """Async ``download_json_with_metadata``."""
+    return await asyncio.to_thread(download_json_with_metadata, bucket_name, blob_name)
+
+
+async def download_text_or_none_async(
+    bucket_name: str, blob_name: str
+) -> Optional[str]:
+    """Async ``download_text_or_none``."""
+    return await asyncio.to_thread(download_text_or_none, bucket_name, blob_name)
+
+
+async def upload_json_async(
+    bucket_name: str,
+    blob_name: str,
+    payload: Any,
+    *,
+    codec: Optional[str] = None,
+    if_generation_match: Optional[int] = None,
+    metadata: Optional[Dict[str, str]] = None,
+) -> None:
+    """Async ``upload_json``."""
+    await asyncio.to_thread(
+        upload_json,
+        bucket_name,
+        blob_name,
+        payload,
+        codec=codec,
+        if_generation_match=if_generation_match,
+        metadata=metadata,
+    )
+
+
+async def upload_text_async(
+    bucket_name: str,
+    blob_name: str,
+    text: str,
+    content_type: str = "text/plain",
+) -> None:
+    """Async ``upload_text``."""
+    await asyncio.to_thread(upload_text, bucket_name, blob_name, text, content_type)
+
+
+__all__ = [
+    "download_json_or_none_async",
+    "download_json_with_metadata_async",
+    "download_text_or_none_async",
+    "upload_json_async",
+    "upload_text_async",
+]
@@ -0,0 +1,398 @@
+"""Blob storage backends used by the gcp_ingestion helpers.
+
+``GCSBackend`` talks to Google Cloud Storage; ``LocalBackend`` and
+``MemoryBackend`` let dev boxes, CI and on-prem batch nodes run the full
+pipeline against a directory or process memory with no network.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from google.api_core import exceptions as google_exceptions
+from google.api_core.exceptions import NotFound
+from google.cloud import storage
+
+DEFAULT_CONTENT_TYPE = "application/octet-stream"
+# Metadata reads of a blob replaced between its resource and media requests
+_GET_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Raw bytes of a stored object plus the attributes we care about."""
+
+    data: bytes
+    content_type: str = DEFAULT_CONTENT_TYPE
+    content_encoding: Optional[str] = None
+    metadata: Dict[str, str] = field(default_factory=dict)
+    # Monotonic object version (GCS generation); None if the backend has none
+    generation: Optional[int] = None
+
+
+class GenerationMismatchError(Exception):
+    """Raised when a conditional write loses to a concurrent writer."""
+
+
+class StorageBackend(ABC):
+    """Minimal object-store interface shared by all backends."""
+
+    name: str = "abstract"
+
+    @abstractmethod
+    def get(
+        self, bucket: str, blob: str, *, with_metadata: bool = False
+    ) -> Optional[StoredBlob]:
+        """Return the stored object, or None when it does not exist.
+
+        Custom ``metadata`` is only guaranteed with ``with_metadata``: GCS
+        returns it on the object resource, not the media download, so
+        reading it costs a second request there.
+        """
+
+    @abstractmethod
+    def put(
+        self,
+        bucket: str,
+        blob: str,
+        data: bytes,
+        *,
+        content_type: str = DEFAULT_CONTENT_TYPE,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        if_generation_match: Optional[int] = None,
+    ) -> None:
+        """Create or overwrite an object.
+
+        ``content_encoding`` and ``metadata`` are stored verbatim; decoding is
+        the caller's job (see ``gcp_ingestion.codec``). When
+        ``if_generation_match`` is given the write only succeeds if the object
+        is still at that generation (0 means "must not exist"); otherwise
+        ``GenerationMismatchError`` is raised.
+        """
+
+    @abstractmethod
+    def exists(self, bucket: str, blob: str) -> bool:
+        """Return True if the object exists."""
+
+    @abstractmethod
+    def list(self, bucket: str, prefix: str = "") -> List[str]:
+        """Return sorted object names under ``prefix``."""
+
+    @abstractmethod
+    def delete(self, bucket: str, blob: str) -> bool:
+        """Delete an object; return False if it did not exist."""
+
+
+class GCSBackend(StorageBackend):
+    """Backend for Google Cloud Storage.
+
+    The client is resolved on every call so ``override_storage_client`` keeps
+    working for code that still swaps clients directly.
+    """
+
+    name = "gcs"
+
+    def __init__(self, client: Optional[storage.Client] = None) -> None:
+        self._client = client
+
+    def _resolve_client(self) -> storage.Client:
+        if self._client is not None:
+            return self._client
+        from .storage import get_storage_client
+
+        return get_storage_client()
+
+    def _blob(self, bucket: str, blob: str):
+        return self._resolve_client().bucket(bucket).blob(blob)
+
+    def get(
+        self, bucket: str, blob: str, *, with_metadata: bool = False
+    ) -> Optional[StoredBlob]:
+        if not with_metadata:
+            obj = self._blob(bucket, blob)
+            try:
+                # raw_download keeps gzip-encoded blobs compressed end to end;
+                # the codec layer decompresses them, and cached copies stay small.
+                # Generation, encoding and content type come back as headers.
+                data = obj.download_as_bytes(raw_download=True)
+            except NotFound:
+                return None
+            return self._stored(obj, data)
+
+        # Custom metadata is only on the object resource: read that first and
+        # pin the download to the generation it describes.
+        for _ in range(_GET_ATTEMPTS):
+            obj = self._resolve_client().bucket(bucket).get_blob(blob)
+            if obj is None:
+                return None
+            try:
+                data = obj.download_as_bytes(
+                    raw_download=True, if_generation_match=obj.generation
+                )
+            except NotFound:
+                return None
+            except google_exceptions.PreconditionFailed:
+                continue  # replaced between the two requests; read it again
+            return self._stored(obj, data)
+        raise GenerationMismatchError(f"gs://{bucket}/{blob} kept changing while read")
+
+    @staticmethod
+    def _stored(obj, data: bytes) -> StoredBlob:
+        return StoredBlob(
+            data=data,
+            content_type=getattr(obj, "content_type", None) or DEFAULT_CONTENT_TYPE,
+            content_encoding=getattr(obj, "content_encoding", None),
+            metadata=dict(getattr(obj, "metadata", None) or {}),
+            generation=getattr(obj, "generation", None),
+        )
+
+    def put(
+        self,
+        bucket: str,
+        blob: str,
+        data: bytes,
+        *,
+        content_type: str = DEFAULT_CONTENT_TYPE,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        if_generation_match: Optional[int] = None,
+    ) -> None:
+        # Best practice: don't auto-create buckets here. Assume infra created outside.
+        obj = self._blob(bucket, blob)
+        if content_encoding:
+            obj.content_encoding = content_encoding
+        if metadata:
+            obj.metadata = dict(metadata)
+        if if_generation_match is None:
+            obj.upload_from_string(data=data, content_type=content_type)
+            return
+        try:
+            obj.upload_from_string(
+                data=data,
+                content_type=content_type,
+                if_generation_match=if_generation_match,
+            )
+        except google_exceptions.PreconditionFailed as exc:
+            raise GenerationMismatchError(f"gs://{bucket}/{blob}") from exc
+
+    def exists(self, bucket: str, blob: str) -> bool:
+        try:
+            return bool(self._blob(bucket, blob).exists())
+        except NotFound:
+            return False
+
+    def list(self, bucket: str, prefix: str = "") -> List[str]:
+        client = self._resolve_client()
+        return sorted(b.name for b in client.list_blobs(bucket, prefix=prefix))
+
+    def delete(self, bucket: str, blob: str) -> bool:
+        try:
+            self._blob(bucket, blob).delete()
+        except NotFound:
+            return False
+        return True
+
+
+class LocalBackend(StorageBackend):
+    """Backend storing objects as files under ``root/<bucket>/<blob>``.
+
+    Object attributes live in a parallel ``root/.meta/<bucket>/<blob>.json`` tree
+    so listings only ever see real objects.
+    """
+
+    name = "local"
+    _META_DIR = ".meta"
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root).resolve()
+        # Conditional writes (and data/meta pairs on read) are atomic within
+        # this process only.
+        self._write_lock = threading.Lock()
+
+    def _path(self, bucket: str, blob: str) -> Path:
+        path = (self.root / bucket / blob).resolve()
+        if self.root / bucket not in path.parents:
+            raise ValueError(f"Blob name escapes storage root: {bucket}/{blob}")
+        return path
+
+    def _meta_path(self, bucket: str, blob: str) -> Path:
+        return self.root / self._META_DIR / bucket / f"{blob}.json"
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _read_meta(self, bucket: str, blob: str) -> Dict:
+        try:
+            return json.loads(self._meta_path(bucket, blob).read_text("utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def get(
+        self, bucket: str, blob: str, *, with_metadata: bool = False
+    ) -> Optional[StoredBlob]:
+        path = self._path(bucket, blob)
+        # Data and meta are two files: read them as one version, or a put in
+        # between pairs old data with the new generation.
+        with self._write_lock:
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                return None
+            meta = self._read_meta(bucket, blob)
+        return StoredBlob(
+            data=data,
+            content_type=meta.get("content_type") or DEFAULT_CONTENT_TYPE,
+            content_encoding=meta.get("content_encoding"),
+            metadata=meta.get("metadata") or {},
+            generation=meta.get("generation", 1),
+        )
+
+    def put(
+        self,
+        bucket: str,
+        blob: str,
+        data: bytes,
+        *,
+        content_type: str = DEFAULT_CONTENT_TYPE,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        if_generation_match: Optional[int] = None,
+    ) -> None:
+        path = self._path(bucket, blob)
+        with self._write_lock:
+            current = 0
+            if path.is_file():
+                current = self._read_meta(bucket, blob).get("generation", 1)
+            if if_generation_match is not None and if_generation_match != current:
+                raise GenerationMismatchError(f"{bucket}/{blob}")
+            self._atomic_write(path, data)
+            meta = json.dumps(
+                {
+                    "content_type": content_type,
+                    "content_encoding": content_encoding,
+                    "metadata": metadata or {},
+                    "generation": current + 1,
+                }
+            ).encode("utf-8")
+            self._atomic_write(self._meta_path(bucket, blob), meta)
+
+    def exists(self, bucket: str, blob: str) -> bool:
+        return self._path(bucket, blob).is_file()
+
+    def list(self, bucket: str, prefix: str = "") -> List[str]:
+        base = self.root / bucket
+        if not base.is_dir():
+            return []
+        names = (
+            p.relative_to(base).as_posix()
+            for p in base.rglob("*")
+            if p.is_file() and not p.name.startswith(".")
+        )
+        return sorted(n for n in names if n.startswith(prefix))
+
+    def delete(self, bucket: str, blob: str) -> bool:
+        try:
+            self._path(bucket, blob).unlink()
+        except FileNotFoundError:
+            return False
+        self._meta_path(bucket, blob).unlink(missing_ok=True)
+        return True
+
+
+class MemoryBackend(StorageBackend):
+    """Thread-safe in-process backend (lost when the process exits)."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._objects: Dict[Tuple[str, str], StoredBlob] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, bucket: str, blob: str, *, with_metadata: bool = False
+    ) -> Optional[StoredBlob]:
+        with self._lock:
+            return self._objects.get((bucket, blob))
+
+    def put(
+        self,
+        bucket: str,
+        blob: str,
+        data: bytes,
+        *,
+        content_type: str = DEFAULT_CONTENT_TYPE,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        if_generation_match: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            current = self._objects.get((bucket, blob))
+            current_generation = (current.generation or 0) if current else 0
+            if (
+                if_generation_match is not None
+                and if_generation_match != current_generation
+            ):
+                raise GenerationMismatchError(f"{bucket}/{blob}")
+            self._objects[(bucket, blob)] = StoredBlob(
+                data=bytes(data),
+                content_type=content_type,
+                content_encoding=content_encoding,
+                metadata=dict(metadata or {}),
+                generation=current_generation + 1,
+            )
+
+    def exists(self, bucket: str, blob: str) -> bool:
+        with self._lock:
+            return (bucket, blob) in self._objects
+
+    def list(self, bucket: str, prefix: str = "") -> List[str]:
+        with self._lock:
+            return sorted(
+                name
+                for b, name in self._objects
+                if b == bucket and name.startswith(prefix)
+            )
+
+    def delete(self, bucket: str, blob: str) -> bool:
+        with self._lock:
+            return self._objects.pop((bucket, blob), None) is not None
+
+
+def make_backend(name: str, *, local_root: str = ".storage") -> StorageBackend:
+    """Build a backend from its configured name."""
+    if name == "gcs":
+        return GCSBackend()
+    if name == "local":
+        return LocalBackend(local_root)
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown storage backend {name!r}; expected gcs, local or memory")
+
+
+__all__ = [
+    "DEFAULT_CONTENT_TYPE",
+    "GCSBackend",
+    "GenerationMismatchError",
+    "LocalBackend",
+    "MemoryBackend",
+    "StorageBackend",
+    "StoredBlob",
+    "make_backend",
+]
@@ -0,0 +1,158 @@
+"""Parallel bulk blob operations.
+
+Each helper fans a list of blobs out over a bounded thread pool, collects
+per-item errors instead of failing the whole batch, and honours an overall
+deadline: items still pending when it expires are reported in ``timed_out``.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generic, Iterable, List, Mapping, TypeVar
+
+from .storage import (
+    check_file_exists,
+    download_json_or_none,
+    download_text_or_none,
+    upload_json,
+    upload_text,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 16
+
+
+@dataclass
+class BulkResult(Generic[T]):
+    """Outcome of a bulk operation, keyed by blob name."""
+
+    results: Dict[str, T] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and not self.timed_out
+
+
+def _run_many(
+    names: Iterable[str],
+    fn: Callable[[str], T],
+    *,
+    max_workers: int,
+    timeout: float | None,
+    label: str,
+) -> BulkResult[T]:
+    unique = list(dict.fromkeys(names))
+    result: BulkResult[T] = BulkResult()
+    if not unique:
+        return result
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(unique))),
+        thread_name_prefix=f"gcs-{label}",
+    )
+    futures: Dict[Future, str] = {executor.submit(fn, n): n for n in unique}
+    try:
+        done, pending = wait(futures, timeout=timeout)
+    finally:
+        # Don't block past the deadline on stragglers; queued work is dropped.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for fut in done:
+        name = futures[fut]
+        try:
+            result.results[name] = fut.result()
+        except Exception as exc:
+            result.errors[name] = exc
+    result.timed_out = sorted(futures[f] for f in pending)
+
+    if result.errors or result.timed_out:
+        logger.warning(
+            "Bulk %s: %d ok, %d failed, %d timed out",
+            label,
+            len(result.results),
+            len(result.errors),
+            len(result.timed_out),
+        )
+    return result
+
+
+def download_many(
+    bucket_name: str,
+    blob_names: Iterable[str],
+    *,
+    as_text: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float | None = None,
+) -> BulkResult[Any]:
+    """Download many blobs in parallel.
+
+    Missing blobs are successful results with value None. JSON is parsed
+    unless ``as_text`` is True.
+    """
+    read = download_text_or_none if as_text else download_json_or_none
+    return _run_many(
+        blob_names,
+        lambda name: read(bucket_name, name),
+        max_workers=max_workers,
+        timeout=timeout,
+        label="download",
+    )
+
+
+def upload_many(
+    bucket_name: str,
+    payloads: Mapping[str, Any],
+    *,
+    as_text: bool = False,
+    content_type: str = "text/plain",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float | None = None,
+) -> BulkResult[None]:
+    """Upload many blobs in parallel (JSON payloads unless ``as_text``)."""
+
+    def _write(name: str) -> None:
+        if as_text:
+            upload_text(bucket_name, name, payloads[name], content_type=content_type)
+        else:
+            upload_json(bucket_name, name, payloads[name])
+
+    return _run_many(
+        payloads,
+        _write,
+        max_workers=max_workers,
+        timeout=timeout,
+        label="upload",
+    )
+
+
+def exists_many(
+    bucket_name: str,
+    blob_names: Iterable[str],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    timeout: float | None = None,
+) -> BulkResult[bool]:
+    """Check existence of many blobs in parallel."""
+    return _run_many(
+        blob_names,
+        lambda name: check_file_exists(bucket_name, name),
+        max_workers=max_workers,
+        timeout=timeout,
+        label="exists",
+    )
+
+
+__all__ = [
+    "BulkResult",
+    "DEFAULT_MAX_WORKERS",
+    "download_many",
+    "exists_many",
+    "upload_many",
+]
@@ -0,0 +1,233 @@
+"""Tiered read-through cache for ``raw/`` blobs.
+
+Reads go process LRU -> optional local disk -> wrapped backend (normally
+GCS), promoting hits into the faster tiers on the way back; writes go
+through to every tier. Only blobs under the configured prefixes (``raw/`` by
+default) are cached; everything else is passed straight through because
+index and summary blobs are rewritten in place with nothing to tell a stale
+copy by.
+
+Most ``raw/`` blobs never change once written. Play-by-play and game stories
+of unfinished games do: they are rewritten whenever their freshness TTL
+lapses (see ``data_fetch.game_state``). Cached copies are not expired here.
+Readers check the ``gameState``/``fetchedAt`` metadata of what they get and
+refetch a stale payload, whose write then refreshes the tiers. A copy can
+lag a blob another process rewrote, which costs an early refetch but never
+serves a payload past its TTL.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .backends import (
+    DEFAULT_CONTENT_TYPE,
+    LocalBackend,
+    StorageBackend,
+    StoredBlob,
+)
+
+DEFAULT_CACHED_PREFIXES: Tuple[str, ...] = ("raw/",)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Point-in-time counters for a ``TieredCacheBackend``."""
+
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    memory_entries: int
+    memory_bytes: int
+    memory_max_bytes: int
+
+
+class ByteLRU:
+    """Thread-safe LRU bounded by the total size of the cached payloads."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Tuple[str, str], StoredBlob] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[StoredBlob]:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+            return blob
+
+    def put(self, key: Tuple[str, str], blob: StoredBlob) -> None:
+        size = len(blob.data)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return  # would evict everything else; not worth it
+            self._entries[key] = blob
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.data)
+                self.evictions += 1
+
+    def discard(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def _discard(self, key: Tuple[str, str]) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._bytes
+
+
+class TieredCacheBackend(StorageBackend):
+    """Read-through, write-through cache layered in front of another backend."""
+
+    def __init__(
+        self,
+        inner: StorageBackend,
+        *,
+        max_memory_bytes: int,
+        disk_dir: Optional[str] = None,
+        prefixes: Sequence[str] = DEFAULT_CACHED_PREFIXES,
+    ) -> None:
+        self.inner = inner
+        self.name = f"cached-{inner.name}"
+        self.memory = ByteLRU(max_memory_bytes)
+        self.disk: Optional[LocalBackend] = LocalBackend(disk_dir) if disk_dir else None
+        self.prefixes = tuple(prefixes)
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def _cacheable(self, blob: str) -> bool:
+        return blob.startswith(self.prefixes)
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def get(
+        self, bucket: str, blob: str, *, with_metadata: bool = False
+    ) -> Optional[StoredBlob]:
+        if not self._cacheable(blob):
+            return self.inner.get(bucket, blob, with_metadata=with_metadata)
+
+        key = (bucket, blob)
+        hit = self.memory.get(key)
+        # A copy filled by a plain GCS read has no custom metadata to offer
+        if hit is not None and (hit.metadata or not with_metadata):
+            self._count("_memory_hits")
+            return hit
+
+        if self.disk is not None:
+            hit = self.disk.get(bucket, blob)
+            if hit is not None and (hit.metadata or not with_metadata):
+                self._count("_disk_hits")
+                self.memory.put(key, hit)
+                return hit
+
+        self._count("_misses")
+        stored = self.inner.get(bucket, blob, with_metadata=with_metadata)
+        if stored is not None:
+            self._fill(bucket, blob, stored)
+        return stored
+
+    def _fill(self, bucket: str, blob: str, stored: StoredBlob) -> None:
+        self.memory.put((bucket, blob), stored)
+        if self.disk is not None:
+            self.disk.put(
+                bucket,
+                blob,
+                stored.data,
+                content_type=stored.content_type,
+                content_encoding=stored.content_encoding,
+                metadata=stored.metadata,
+            )
+
+    def put(
+        self,
+        bucket: str,
+        blob: str,
+        data: bytes,
+        *,
+        content_type: str = DEFAULT_CONTENT_TYPE,
+        content_encoding: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        if_generation_match: Optional[int] = None,
+    ) -> None:
+        self.inner.put(
+            bucket,
+            blob,
+            data,
+            content_type=content_type,
+            content_encoding=content_encoding,
+            metadata=metadata,
+            if_generation_match=if_generation_match,
+        )
+        if self._cacheable(blob):
+            stored = StoredBlob(
+                data=bytes(data),
+                content_type=content_type,
+                content_encoding=content_encoding,
+                metadata=dict(metadata or {}),
+            )
+            self._fill(bucket, blob, stored)
+
+    def exists(self, bucket: str, blob: str) -> bool:
+        if self._cacheable(blob):
+            if self.memory.get((bucket, blob)) is not None:
+                return True
+            if self.disk is not None and self.disk.exists(bucket, blob):
+                return True
+        return self.inner.exists(bucket, blob)
+
+    def list(self, bucket: str, prefix: str = "") -> List[str]:
+        return self.inner.list(bucket, prefix)
+
+    def delete(self, bucket: str, blob: str) -> bool:
+        self.memory.discard((bucket, blob))
+        if self.disk is not None:
+            self.disk.delete(bucket, blob)
+        return self.inner.delete(bucket, blob)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                evictions=self.memory.evictions,
+                memory_entries=len(self.memory),
+                memory_bytes=self.memory.size_bytes,
+                memory_max_bytes=self.memory.max_bytes,
+            )
+
+
+__all__ = [
+    "ByteLRU",
+    "CacheStats",
+    "DEFAULT_CACHED_PREFIXES",
+    "TieredCacheBackend",
+]
@@ -0,0 +1,83 @@
+"""Compact JSON encoding for stored blobs.
+
+JSON is written minified and, by default, gzip-compressed. The codec is
+recorded in blob metadata under ``codec`` and gzip blobs also carry
+``Content-Encoding: gzip``. Reads sniff the payload's magic bytes, so blobs
+written before this layer existed (pretty-printed, uncompressed) and blobs
+written with any codec decode transparently.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore[assignment]
+
+CODECS = ("identity", "gzip", "zstd")
+CODEC_METADATA_KEY = "codec"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 10
+
+
+@dataclass(frozen=True)
+class EncodedBlob:
+    """Bytes ready for upload plus the attributes describing their encoding."""
+
+    data: bytes
+    content_encoding: Optional[str] = None
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+def _require_zstd():
+    if zstandard is None:
+        raise RuntimeError(
+            "zstandard is required for the zstd storage codec. "
+            "Run: pip install zstandard"
+        )
+    return zstandard
+
+
+def encode_json(payload: Any, codec: str = "gzip") -> EncodedBlob:
+    """Serialize ``payload`` as minified JSON and compress it with ``codec``."""
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if codec == "identity":
+        return EncodedBlob(data=raw, metadata={CODEC_METADATA_KEY: codec})
+    if codec == "gzip":
+        return EncodedBlob(
+            data=gzip.compress(raw, compresslevel=_GZIP_LEVEL, mtime=0),
+            content_encoding="gzip",
+            metadata={CODEC_METADATA_KEY: codec},
+        )
+    if codec == "zstd":
+        compressor = _require_zstd().ZstdCompressor(level=_ZSTD_LEVEL)
+        return EncodedBlob(
+            data=compressor.compress(raw), metadata={CODEC_METADATA_KEY: codec}
+        )
+    raise ValueError(f"Unknown storage codec {codec!r}; expected one of {CODECS}")
+
+
+def decode_bytes(data: bytes) -> bytes:
+    """Return the uncompressed payload of a stored blob in any supported codec."""
+    if data.startswith(_GZIP_MAGIC):
+        return gzip.decompress(data)
+    if data.startswith(_ZSTD_MAGIC):
+        return _require_zstd().ZstdDecompressor().decompress(data)
+    return data
+
+
+__all__ = [
+    "CODECS",
+    "CODEC_METADATA_KEY",
+    "EncodedBlob",
+    "decode_bytes",
+    "encode_json",
+]
@@ -1,13 +1,19 @@
 import json
 import logging
 import os
+import threading
 from contextlib import contextmanager
 from functools import lru_cache
-from typing import Any, Dict, Iterator, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from google.api_core.exceptions import NotFound
 from google.cloud import storage
 
+from config import get_settings
+
+from .backends import GCSBackend, StorageBackend, make_backend
+from .cache import CacheStats, TieredCacheBackend
+from .codec import decode_bytes, encode_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,55 +58,183 @@ def override_storage_client(client: storage.Client) -> Iterator[storage.Client]:
             _override_stack.pop()
 
 
-def _get_bucket(
-    bucket_name: str, *, client: Optional[storage.Client] = None
-) -> storage.Bucket:
-    return (client or get_storage_client()).bucket(bucket_name)
+_backend_override_stack: list[StorageBackend] = []
+_backend_cache: Dict[tuple[Any, ...], StorageBackend] = {}
+_backend_lock = threading.Lock()
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the active backend.
+
+    Resolution order: ``override_storage_backend``, then
+    ``override_storage_client`` (wrapped in a GCS backend), then the backend
+    named by ``Settings.storage_backend``.
+    """
+    if _backend_override_stack:
+        return _backend_override_stack[-1]
+    if _override_stack:
+        return GCSBackend(_override_stack[-1])
+
+    settings = get_settings()
+    key = (
+        settings.storage_backend,
+        settings.storage_local_root,
+        settings.raw_cache_max_bytes,
+        settings.raw_cache_dir,
+    )
+    with _backend_lock:
+        backend = _backend_cache.get(key)
+        if backend is None:
+            backend = make_backend(
+                settings.storage_backend, local_root=settings.storage_local_root
+            )
+            if settings.raw_cache_max_bytes > 0 or settings.raw_cache_dir:
+                backend = TieredCacheBackend(
+                    backend,
+                    max_memory_bytes=max(settings.raw_cache_max_bytes, 0),
+                    disk_dir=settings.raw_cache_dir or None,
+                )
+            _backend_cache[key] = backend
+    return backend
+
+
+def get_cache_stats() -> Optional[CacheStats]:
+    """Return tiered cache counters for the active backend, if it is cached."""
+    backend = get_storage_backend()
+    if isinstance(backend, TieredCacheBackend):
+        return backend.stats()
+    return None
+
+
+def reset_storage_backend() -> None:
+    """Drop cached backends (in-memory contents are discarded)."""
+    with _backend_lock:
+        _backend_cache.clear()
+
+
+@contextmanager
+def override_storage_backend(backend: StorageBackend) -> Iterator[StorageBackend]:
+    _backend_override_stack.append(backend)
+    try:
+        yield backend
+    finally:
+        if _backend_override_stack:
+            _backend_override_stack.pop()
+
+
+def _backend(client: Optional[storage.Client]) -> StorageBackend:
+    if client is not None:
+        return GCSBackend(client)
+    return get_storage_backend()
 
 
 def check_file_exists(
     bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
 ) -> bool:
-    bucket = _get_bucket(bucket_name, client=client)
-    blob = bucket.blob(blob_name)
-    try:
-        return blob.exists()
-    except NotFound:
-        return False
+    return _backend(client).exists(bucket_name, blob_name)
 
 
 def download_json(
     bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
 ) -> Dict[str, Any]:
-    bucket = _get_bucket(bucket_name, client=client)
-    blob = bucket.blob(blob_name)
-    text = blob.download_as_text()  # raises if missing; let caller handle
+    return json.loads(download_text(bucket_name, blob_name, client=client))
+
+
+def download_json_or_none(
+    bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
+) -> Optional[Any]:
+    """Download and parse a JSON blob in a single request; None if it is missing."""
+    text = download_text_or_none(bucket_name, blob_name, client=client)
+    if text is None:
+        return None
     return json.loads(text)
 
 
+def download_json_with_generation(
+    bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
+) -> Optional[Tuple[Any, Optional[int]]]:
+    """Like ``download_json_or_none`` but also return the blob's generation.
+
+    Pass the generation to ``upload_json(if_generation_match=...)`` for an
+    optimistic read-modify-write.
+    """
+    stored = _backend(client).get(bucket_name, blob_name)
+    if stored is None:
+        return None
+    return json.loads(decode_bytes(stored.data).decode("utf-8")), stored.generation
+
+
+def download_json_with_metadata(
+    bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
+) -> Optional[Tuple[Any, Dict[str, str]]]:
+    """Like ``download_json_or_none`` but also return the blob's metadata.
+
+    On GCS this costs a second request: custom metadata is not returned with
+    the object's content.
+    """
+    stored = _backend(client).get(bucket_name, blob_name, with_metadata=True)
+    if stored is None:
+        return None
+    payload = json.loads(decode_bytes(stored.data).decode("utf-8"))
+    return payload, dict(stored.metadata)
+
+
 def upload_json(
     bucket_name: str,
     blob_name: str,
     payload: Any,
     *,
+    codec: Optional[str] = None,
+    if_generation_match: Optional[int] = None,
+    metadata: Optional[Dict[str, str]] = None,
     client: Optional[storage.Client] = None,
 ) -> None:
-    bucket = _get_bucket(bucket_name, client=client)
-    # Best practice: don't auto-create buckets here. Assume infra created outside.
-    blob = bucket.blob(blob_name)
-    blob.upload_from_string(
-        data=json.dumps(payload, ensure_ascii=False, indent=2),
+    """Upload ``payload`` as minified JSON encoded with ``codec``.
+
+    ``codec`` defaults to ``Settings.storage_codec``. With
+    ``if_generation_match`` the write raises ``GenerationMismatchError`` if
+    the blob changed since that generation was read (0: must not exist).
+    ``metadata`` is stored alongside the codec's own keys.
+    """
+    encoded = encode_json(payload, codec or get_settings().storage_codec)
+    _backend(client).put(
+        bucket_name,
+        blob_name,
+        encoded.data,
         content_type="application/json",
+        content_encoding=encoded.content_encoding,
+        metadata={**(metadata or {}), **encoded.metadata},
+        if_generation_match=if_generation_match,
+    )
+    logger.info(
+        "Uploaded JSON to gs://%s/%s (%d bytes)",
+        bucket_name,
+        blob_name,
+        len(encoded.data),
     )
-    logger.info("Uploaded JSON to gs://%s/%s", bucket_name, blob_name)
 
 
 def download_text(
     bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
 ) -> str:
-    bucket = _get_bucket(bucket_name, client=client)
-    blob = bucket.blob(blob_name)
-    return blob.download_as_text()
+    text = download_text_or_none(bucket_name, blob_name, client=client)
+    if text is None:  # let caller handle
+        raise FileNotFoundError(f"gs://{bucket_name}/{blob_name}")
+    return text
+
+
+def download_text_or_none(
+    bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
+) -> Optional[str]:
+    """Download a text blob in a single request; None if it is missing.
+
+    Unlike ``check_file_exists`` followed by ``download_text`` this costs one
+    round trip on a cache hit instead of two.
+    """
+    stored = _backend(client).get(bucket_name, blob_name)
+    if stored is None:
+        return None
+    return decode_bytes(stored.data).decode("utf-8")
 
 
 def upload_text(
@@ -111,7 +245,19 @@ def upload_text(
     *,
     client: Optional[storage.Client] = None,
 ) -> None:
-    bucket = _get_bucket(bucket_name, client=client)
-    blob = bucket.blob(blob_name)
-    blob.upload_from_string(data=text, content_type=content_type)
+    _backend(client).put(
+        bucket_name, blob_name, text.encode("utf-8"), content_type=content_type
+    )
     logger.info("Uploaded text to gs://%s/%s", bucket_name, blob_name)
+
+
+def list_blobs(
+    bucket_name: str, prefix: str = "", *, client: Optional[storage.Client] = None
+) -> List[str]:
+    return _backend(client).list(bucket_name, prefix)
+
+
+def delete_blob(
+    bucket_name: str, blob_name: str, *, client: Optional[storage.Client] = None
+) -> bool:
+    return _backend(client).delete(bucket_name, blob_name)
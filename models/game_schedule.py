@@ -16,3 +16,5 @@ class GameSchedule:
     away_team: str
     away_team_score: Optional[int]
     winning_goal_scorer_id: Optional[int]
+    # NHL gameState (FUT, PRE, LIVE, CRIT, FINAL, OFF); see data_fetch.game_state
+    game_state: Optional[str] = None
@@ -16,6 +16,11 @@ try:  # pragma: no cover - optional dependency during testing
     from engine.summarize_game import summarize_game as _summarize_game
 except Exception:  # pragma: no cover - fallback when optional deps missing
     _summarize_game = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - optional dependency during testing
+    from engine.backfill import backfill as _backfill
+except Exception:  # pragma: no cover - fallback when optional deps missing
+    _backfill = None  # type: ignore[assignment]
 from models.game_schedule import GameSchedule
 from models.game_summary import GameSummary
 
@@ -56,6 +61,17 @@ def summarize_game(*args, **kwargs):
     return _summarize_game(*args, **kwargs)
 
 
+def backfill(*args, **kwargs):
+    """Lazily resolve the season backfill to keep optional deps optional."""
+
+    if _backfill is None:  # pragma: no cover - exercised when deps missing
+        raise ImportError(
+            "engine.backfill.backfill is unavailable; ensure optional dependencies "
+            "are installed or monkeypatch `backfill` before use."
+        )
+    return _backfill(*args, **kwargs)
+
+
 def _select_game(
     schedule: Iterable[GameSchedule], *, game_id: Optional[int]
 ) -> GameSchedule:
@@ -192,6 +208,39 @@ def main(argv: Optional[list[str]] = None) -> None:
     _interactive_flow(args)
 
 
+def backfill_main(argv: Optional[list[str]] = None) -> None:
+    """Summarize every final game in a date range, resuming earlier runs."""
+    parser = argparse.ArgumentParser(
+        description="Backfill game summaries for a date range"
+    )
+    parser.add_argument("start", help="First date (YYYY-MM-DD)")
+    parser.add_argument("end", help="Last date (YYYY-MM-DD), inclusive")
+    parser.add_argument(
+        "--workers", type=int, help="Games processed concurrently (BACKFILL_WORKERS)"
+    )
+    parser.add_argument(
+        "--ai", dest="use_ai", action="store_true", help="Generate AI summaries"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        report = backfill(
+            args.start, args.end, workers=args.workers, use_ai=args.use_ai
+        )
+    except Exception as exc:
+        logger.exception("Backfill failed")
+        raise SystemExit(str(exc)) from exc
+
+    print(
+        f"{report.games} games: {len(report.done)} summarized, "
+        f"{report.skipped} already done, {report.not_final} not final, "
+        f"{len(report.failed)} failed"
+    )
+    if report.failed:
+        ids = ", ".join(str(gid) for gid in sorted(report.failed))
+        raise SystemExit(f"Failed games (rerun to retry): {ids}")
+
+
 __all__ = [
     "DEFAULT_DATE",
     "GameSelectionError",
@@ -199,5 +248,7 @@ __all__ = [
     "get_schedule",
     "generate_summary_for_date",
     "summarize_game",
+    "backfill",
+    "backfill_main",
     "main",
 ]
@@ -0,0 +1,197 @@
+"""Tests for engine.backfill."""
+
+import threading
+import time
+
+import pytest
+
+import config
+from engine import backfill as backfill_mod
+from engine import date_index, season_index
+from engine.date_index import IndexUpdate
+from gcp_ingestion import MemoryBackend, override_storage_backend
+from models.game_schedule import GameSchedule
+from nhl_commentary_core import cli
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket",
+    openai_api_key="k",
+    openai_model="gpt-4o-mini",
+    backfill_workers=3,
+)
+
+
+def _game(game_id, state="OFF"):
+    return GameSchedule(
+        game_id=game_id,
+        season_id=20242025,
+        game_type=2,
+        home_team="MTL",
+        home_team_score=3,
+        away_team="TOR",
+        away_team_score=2,
+        winning_goal_scorer_id=None,
+        game_state=state,
+    )
+
+
+SCHEDULES = {
+    "2025-03-31": [_game(1), _game(2)],
+    "2025-04-01": [_game(3), _game(4)],
+    "2025-04-02": [_game(5, state="FUT")],
+}
+
+
+@pytest.fixture
+def harness(monkeypatch):
+    calls = []
+    failing = set()
+    lock = threading.Lock()
+    active = [0, 0]  # current, peak
+
+    def fake_summarize(game_id, date=None, use_ai=True):
+        with lock:
+            calls.append(game_id)
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        try:
+            time.sleep(0.01)
+            if game_id in failing:
+                raise RuntimeError(f"boom {game_id}")
+            date_index.mark_artifact(
+                "bucket", date=date, game_id=game_id, artifact="raw_pbp"
+            )
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(
+        backfill_mod, "get_schedule_range", lambda start, end, **kw: SCHEDULES
+    )
+    monkeypatch.setattr(backfill_mod, "summarize_game", fake_summarize)
+    with (
+        config.override_settings(TEST_SETTINGS),
+        override_storage_backend(MemoryBackend()),
+    ):
+        yield calls, failing, active
+
+
+def test_backfill_checkpoints_games_in_the_artifact_index(harness):
+    calls, failing, active = harness
+    failing.add(3)
+
+    report = backfill_mod.backfill("2025-03-31", "2025-04-02")
+
+    assert sorted(calls) == [1, 2, 3, 4]
+    assert sorted(report.done) == [1, 2, 4] and list(report.failed) == [3]
+    assert report.games == 5 and report.not_final == 1 and not report.complete
+    assert 1 < active[1] <= 3
+    indexes = season_index.load_range("bucket", "2025-03-31", "2025-04-02")
+    assert indexes["2025-03-31"].complete("summary_stats", "raw_pbp") == [1, 2]
+    assert indexes["2025-04-01"].complete("summary_stats") == [4]
+
+
+def test_rerun_resumes_with_unfinished_games_only(harness):
+    calls, failing, _ = harness
+    date_index.apply_index_updates(
+        "bucket",
+        "2025-03-31",
+        [IndexUpdate(game_id=1, artifact="summary_stats")],
+    )
+
+    first = backfill_mod.backfill("2025-03-31", "2025-04-02", workers=1)
+    calls.clear()
+    second = backfill_mod.backfill("2025-03-31", "2025-04-02")
+
+    assert first.skipped == 1 and sorted(first.done) == [2, 3, 4]
+    assert calls == [] and second.skipped == 4 and second.done == []
+
+
+def test_month_shards_are_synced_once_per_batch(harness, monkeypatch):
+    synced = []
+    real_sync = backfill_mod.sync_dates
+
+    def counting_sync(bucket, indexes):
+        synced.append(sorted(i.date for i in indexes))
+        real_sync(bucket, indexes)
+
+    monkeypatch.setattr(backfill_mod, "sync_dates", counting_sync)
+    backfill_mod.backfill("2025-03-31", "2025-04-02")
+
+    assert synced == [["2025-03-31", "2025-04-01"]]
+    indexes = season_index.load_range("bucket", "2025-03-31", "2025-04-02")
+    assert indexes["2025-04-01"].complete("summary_stats", "raw_pbp") == [3, 4]
+
+
+def test_game_whose_checkpoint_cannot_be_written_fails(harness, monkeypatch):
+    calls, _, _ = harness
+    real_apply = backfill_mod._apply_to_date
+
+    def busy_apply(bucket, date, updates):
+        if date == "2025-04-01":
+            raise date_index.IndexConflictError("date index is busy")
+        return real_apply(bucket, date, updates)
+
+    monkeypatch.setattr(backfill_mod, "_apply_to_date", busy_apply)
+    first = backfill_mod.backfill("2025-03-31", "2025-04-02")
+    monkeypatch.setattr(backfill_mod, "_apply_to_date", real_apply)
+    calls.clear()
+
+    second = backfill_mod.backfill("2025-03-31", "2025-04-02")
+
+    assert sorted(first.done) == [1, 2] and sorted(first.failed) == [3, 4]
+    assert sorted(calls) == [3, 4] and sorted(second.done) == [3, 4]
+
+
+def test_rerun_trusts_per_date_checkpoints_when_shard_sync_failed(harness, monkeypatch):
+    calls, _, _ = harness
+    real_sync = backfill_mod.sync_dates
+
+    def failing_sync(bucket, indexes):
+        raise date_index.IndexConflictError("month shard is busy")
+
+    monkeypatch.setattr(backfill_mod, "sync_dates", failing_sync)
+    backfill_mod.backfill("2025-03-31", "2025-04-02")
+    monkeypatch.setattr(backfill_mod, "sync_dates", real_sync)
+    calls.clear()
+
+    report = backfill_mod.backfill("2025-03-31", "2025-04-02")
+
+    assert calls == [] and report.skipped == 4
+    # The lagging shards were repaired on the way
+    indexes = season_index.load_range("bucket", "2025-03-31", "2025-04-02")
+    assert indexes["2025-04-01"].complete("summary_stats") == [3, 4]
+
+
+def test_ai_backfill_checkpoints_its_own_artifact(harness):
+    calls, _, _ = harness
+    backfill_mod.backfill("2025-03-31", "2025-04-02")
+    calls.clear()
+
+    report = backfill_mod.backfill("2025-03-31", "2025-04-02", use_ai=True)
+
+    assert sorted(calls) == [1, 2, 3, 4] and report.skipped == 0
+
+
+def test_cli_reports_failures(monkeypatch, capsys):
+    report = backfill_mod.BackfillReport(
+        start="2025-03-31", end="2025-04-02", games=3, done=[1], failed={7: "x"}
+    )
+    seen = {}
+
+    def fake_backfill(start, end, **kw):
+        seen.update(kw, start=start, end=end)
+        return report
+
+    monkeypatch.setattr(cli, "_backfill", fake_backfill)
+
+    with pytest.raises(SystemExit, match="7"):
+        cli.backfill_main(["2025-03-31", "2025-04-02", "--workers", "4"])
+
+    assert seen == {
+        "start": "2025-03-31",
+        "end": "2025-04-02",
+        "workers": 4,
+        "use_ai": False,
+    }
+    assert "1 summarized" in capsys.readouterr().out
@@ -4,6 +4,8 @@ import sys
 from datetime import datetime, timezone
 from types import SimpleNamespace
 
+import pytest
+
 import config
 
 # Stub heavy deps before any project imports
@@ -35,6 +37,7 @@ sys.modules.setdefault("google.api_core", fake_google_api_core)
 sys.modules.setdefault("google.api_core.exceptions", fake_exceptions)
 
 import engine.batch as batch_mod  # noqa: E402
+from engine import date_index  # noqa: E402
 from models.game_schedule import GameSchedule
 from models.game_summary import GameSummary
 
@@ -70,6 +73,19 @@ def _make_summary(game_id: int) -> GameSummary:
     )
 
 
+@pytest.fixture(autouse=True)
+def index_updates(monkeypatch):
+    monkeypatch.setattr(batch_mod, "load_ai_summaries", lambda game_ids: {})
+    monkeypatch.setattr(batch_mod, "prefetch_editorials", lambda *a, **kw: {})
+    calls = []
+    monkeypatch.setattr(
+        date_index,
+        "apply_index_updates",
+        lambda bucket, date, updates: calls.append((bucket, date, list(updates))),
+    )
+    return calls
+
+
 def test_single_game_success(monkeypatch):
     game = _make_game(100)
     monkeypatch.setattr(batch_mod, "get_schedule", lambda date: [game])
@@ -133,3 +149,97 @@ def test_empty_schedule(monkeypatch):
         results = batch_mod.summarize_date("2025-04-25")
 
     assert results == []
+
+
+def test_bulk_cached_ai_summaries_skip_summarize_game(monkeypatch):
+    games = [_make_game(20), _make_game(21)]
+    summarized = []
+
+    def fake_summarize(game_id, date, use_ai):
+        summarized.append(game_id)
+        return _make_summary(game_id)
+
+    monkeypatch.setattr(batch_mod, "get_schedule", lambda date: games)
+    monkeypatch.setattr(
+        batch_mod, "load_ai_summaries", lambda game_ids: {20: "cached recap"}
+    )
+    monkeypatch.setattr(batch_mod, "summarize_game", fake_summarize)
+
+    with config.override_settings(TEST_SETTINGS):
+        results = batch_mod.summarize_date("2025-04-25")
+
+    assert summarized == [21]
+    by_id = {r.game_id: r for r in results}
+    assert by_id[20].cached is True
+    assert by_id[20].summary_markdown == "cached recap"
+    assert by_id[20].home_team == "MTL"
+
+
+def test_summaries_recorded_in_one_index_write(monkeypatch, index_updates):
+    games = [_make_game(30), _make_game(31, home="TOR", away="BOS")]
+    monkeypatch.setattr(batch_mod, "get_schedule", lambda date: games)
+    monkeypatch.setattr(
+        batch_mod,
+        "summarize_game",
+        lambda game_id, date, use_ai: _make_summary(game_id),
+    )
+
+    with config.override_settings(TEST_SETTINGS):
+        batch_mod.summarize_date("2025-04-25", use_ai=False)
+
+    assert len(index_updates) == 1
+    bucket, date, updates = index_updates[0]
+    assert (bucket, date) == ("test-bucket", "2025-04-25")
+    assert {(u.game_id, u.artifact, u.home) for u in updates} == {
+        (30, "summary_stats", "MTL"),
+        (31, "summary_stats", "TOR"),
+    }
+
+
+def test_marks_made_while_summarizing_join_the_date_flush(monkeypatch, index_updates):
+    games = [_make_game(40), _make_game(41)]
+    monkeypatch.setattr(batch_mod, "get_schedule", lambda date: games)
+
+    def fake_summarize(game_id, date, use_ai):
+        date_index.mark_artifact(
+            "test-bucket", date=date, game_id=game_id, artifact="raw_pbp"
+        )
+        return _make_summary(game_id)
+
+    monkeypatch.setattr(batch_mod, "summarize_game", fake_summarize)
+
+    with config.override_settings(TEST_SETTINGS):
+        batch_mod.summarize_date("2025-04-25", use_ai=False)
+
+    assert len(index_updates) == 1
+    _, _, updates = index_updates[0]
+    assert {(u.game_id, u.artifact) for u in updates} == {
+        (40, "raw_pbp"),
+        (41, "raw_pbp"),
+        (40, "summary_stats"),
+        (41, "summary_stats"),
+    }
+
+
+def test_editorials_prefetched_for_uncached_games(monkeypatch):
+    games = [_make_game(30), _make_game(31)]
+    prefetched = []
+    monkeypatch.setattr(batch_mod, "get_schedule", lambda date: games)
+    monkeypatch.setattr(
+        batch_mod, "load_ai_summaries", lambda game_ids: {30: "cached recap"}
+    )
+    monkeypatch.setattr(
+        batch_mod,
+        "prefetch_editorials",
+        lambda game_ids, date: prefetched.append((list(game_ids), date)),
+    )
+    monkeypatch.setattr(
+        batch_mod,
+        "summarize_game",
+        lambda game_id, date, use_ai: _make_summary(game_id),
+    )
+
+    with config.override_settings(TEST_SETTINGS):
+        batch_mod.summarize_date("2025-04-25")
+
+    assert prefetched == [([31], "2025-04-25")]
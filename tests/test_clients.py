@@ -0,0 +1,168 @@
+"""Tests for data_fetch.clients."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+import config
+from data_fetch import clients
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket",
+    openai_api_key="k",
+    openai_model="gpt-4o-mini",
+    http_max_connections=4,
+    http_max_keepalive_connections=2,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    clients.close_http_clients()
+    with config.override_settings(TEST_SETTINGS):
+        yield
+    clients.close_http_clients()
+
+
+def _api(handler) -> clients.NHLApiClient:
+    return clients.NHLApiClient(httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def test_shared_http_client_is_reused_across_threads():
+    seen = []
+
+    def grab():
+        seen.append(clients.get_http_client())
+
+    threads = [threading.Thread(target=grab) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(c) for c in seen}) == 1
+    assert clients.get_nhl_client() is clients.get_nhl_client()
+
+
+def test_close_reopens_a_fresh_pool():
+    first = clients.get_http_client()
+    clients.close_http_clients()
+
+    assert first.is_closed
+    assert clients.get_http_client() is not first
+
+
+def test_endpoints_and_schedule_shape():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path.startswith("/v1/schedule/"):
+            return httpx.Response(
+                200,
+                json={
+                    "gameWeek": [
+                        {"date": "2025-04-24", "games": [{"id": 1}]},
+                        {"date": "2025-04-25", "games": [{"id": 2}, {"id": 3}]},
+                    ]
+                },
+            )
+        return httpx.Response(200, json={"ok": True})
+
+    api = _api(handler)
+    sched = api.schedule.get_schedule(date="2025-04-25")
+    api.game_center.play_by_play(game_id=2025020001)
+    api.game_center.game_story(game_id=2025020001)
+    api.game_center.right_rail(game_id="2025020001")
+    api.standings.get_standings(date="2025-04-25")
+
+    assert [g["id"] for g in sched["games"]] == [2, 3]
+    assert paths == [
+        "/v1/schedule/2025-04-25",
+        "/v1/gamecenter/2025020001/play-by-play",
+        "/v1/wsc/game-story/2025020001",
+        "/v1/gamecenter/2025020001/right-rail",
+        "/v1/standings/2025-04-25",
+    ]
+
+
+def test_http_errors_raise():
+    api = _api(lambda request: httpx.Response(404, json={}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        api.game_center.play_by_play(game_id=1)
+
+
+def test_async_client_matches_sync_endpoints():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path.startswith("/v1/schedule/"):
+            return httpx.Response(
+                200, json={"gameWeek": [{"date": "2025-04-25", "games": [{"id": 2}]}]}
+            )
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        api = clients.AsyncNHLApiClient(http)
+        sched = await api.schedule.get_schedule(date="2025-04-25")
+        pbp = await api.game_center.play_by_play(game_id=2025020001)
+        await http.aclose()
+        return sched, pbp
+
+    sched, pbp = asyncio.run(run())
+
+    assert sched["numberOfGames"] == 1
+    assert pbp == {"ok": True}
+    assert paths == [
+        "/v1/schedule/2025-04-25",
+        "/v1/gamecenter/2025020001/play-by-play",
+    ]
+
+
+def test_async_http_client_is_per_loop():
+    async def grab():
+        first = clients.get_async_http_client()
+        same = clients.get_async_http_client()
+        await clients.aclose_http_clients()
+        return first, same
+
+    first, same = asyncio.run(grab())
+    other, _ = asyncio.run(grab())
+
+    assert first is same
+    assert first.is_closed
+    assert other is not first
+
+
+def test_conditional_requests_send_validators_and_handle_304():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            json={"plays": []},
+            headers={"ETag": '"v1"', "Last-Modified": "Sat, 26 Apr 2025 03:00:00 GMT"},
+        )
+
+    api = _api(handler)
+    first = api.game_center.play_by_play_if_modified(game_id=1)
+    again = api.game_center.play_by_play_if_modified(
+        game_id=1, validators=first.validators
+    )
+
+    assert first.data == {"plays": []} and not first.not_modified
+    assert first.validators == {
+        "etag": '"v1"',
+        "lastModified": "Sat, 26 Apr 2025 03:00:00 GMT",
+    }
+    assert again.not_modified and again.validators == first.validators
+    assert seen == [None, '"v1"']
+    assert clients.validators_from({"etag": "x", "codec": "gzip"}) == {"etag": "x"}
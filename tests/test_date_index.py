@@ -0,0 +1,291 @@
+"""Tests for engine.date_index."""
+
+import pytest
+
+import config
+from engine import date_index
+from engine.date_index import IndexUpdate
+from gcp_ingestion import MemoryBackend, override_storage_backend
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+DATE = "2025-04-25"
+
+
+class CountingBackend(MemoryBackend):
+    """Counts reads and writes of per-date index blobs."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gets = 0
+        self.puts = 0
+
+    def get(self, bucket, blob, **kwargs):
+        if blob.startswith("indexes/by_date/"):
+            self.gets += 1
+        return super().get(bucket, blob, **kwargs)
+
+    def put(self, bucket, blob, data, **kwargs):
+        if blob.startswith("indexes/by_date/"):
+            self.puts += 1
+        return super().put(bucket, blob, data, **kwargs)
+
+
+@pytest.fixture
+def backend():
+    backend = CountingBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        yield backend
+
+
+def test_apply_index_updates_single_read_and_write(backend):
+    updates = [
+        IndexUpdate(game_id=gid, artifact="raw_pbp", away="COL", home="MTL")
+        for gid in range(1, 16)
+    ]
+
+    date_index.apply_index_updates("bucket", DATE, updates)
+
+    assert (backend.gets, backend.puts) == (1, 1)
+    assert date_index.list_games_missing("bucket", DATE, "raw_pbp") == []
+    assert len(date_index.list_games_missing("bucket", DATE, "raw_story")) == 15
+
+
+def test_seed_updates_do_not_clobber_existing_flags(backend):
+    date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+
+    date_index.apply_index_updates(
+        "bucket",
+        DATE,
+        [
+            IndexUpdate(game_id=1, artifact="raw_pbp", exists=False, overwrite=False),
+            IndexUpdate(game_id=2, artifact="raw_pbp", exists=False, overwrite=False),
+        ],
+    )
+
+    assert date_index.list_games_missing("bucket", DATE, "raw_pbp") == [2]
+
+
+def test_empty_update_list_is_a_no_op(backend):
+    date_index.apply_index_updates("bucket", DATE, [])
+
+    assert (backend.gets, backend.puts) == (0, 0)
+
+
+class RacingBackend(MemoryBackend):
+    """Lets another writer sneak in between the first read and write."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.raced = False
+
+    def put(self, bucket, blob, data, **kwargs):
+        if not self.raced and kwargs.get("if_generation_match") is not None:
+            self.raced = True
+            with override_storage_backend(self):
+                date_index.mark_artifact(
+                    bucket, date=DATE, game_id=99, artifact="raw_story"
+                )
+        return super().put(bucket, blob, data, **kwargs)
+
+
+def test_concurrent_update_is_merged_not_lost():
+    backend = RacingBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+        index = date_index.load_date_index("bucket", DATE)
+
+    assert index.has(1, "raw_pbp")
+    assert index.has(99, "raw_story")
+
+
+def test_parallel_workers_do_not_lose_updates(backend):
+    import threading
+
+    def worker(gid):
+        date_index.mark_artifact("bucket", date=DATE, game_id=gid, artifact="raw_pbp")
+
+    threads = [threading.Thread(target=worker, args=(gid,)) for gid in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    index = date_index.load_date_index("bucket", DATE)
+    assert sorted(index.games) == list(range(12))
+
+
+def test_gives_up_after_repeated_conflicts(backend, monkeypatch):
+    from gcp_ingestion import GenerationMismatchError
+
+    def always_conflict(*args, **kwargs):
+        raise GenerationMismatchError("busy")
+
+    monkeypatch.setattr(date_index, "upload_json", always_conflict)
+    monkeypatch.setattr(date_index.time, "sleep", lambda s: None)
+
+    with pytest.raises(date_index.IndexConflictError):
+        date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+
+
+def test_unreadable_index_fails_instead_of_being_overwritten(backend, monkeypatch):
+    date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+    puts = backend.puts
+
+    def flaky(bucket, blob):
+        raise ConnectionError("transient")
+
+    monkeypatch.setattr(date_index, "download_json_with_generation", flaky)
+    with pytest.raises(ConnectionError):
+        date_index.mark_artifact("bucket", date=DATE, game_id=2, artifact="raw_pbp")
+    monkeypatch.undo()
+
+    assert backend.puts == puts
+    assert date_index.load_date_index("bucket", DATE).has(1, "raw_pbp")
+
+
+def test_v1_index_is_upgraded_on_read_and_rewritten_as_v2(backend):
+    from gcp_ingestion import download_json, upload_json
+
+    blob = date_index.DATE_INDEX_BLOB.format(date=DATE)
+    upload_json(
+        "bucket",
+        blob,
+        {
+            "date": DATE,
+            "games": [
+                {"game_id": 1, "away": "COL", "home": "MTL", "raw_pbp": True},
+                {"game_id": 2, "raw_pbp": False, "raw_story": True},
+            ],
+        },
+    )
+
+    index = date_index.load_date_index("bucket", DATE)
+    assert index.games[1].away == "COL"
+    assert index.has(1, "raw_pbp") and not index.has(2, "raw_pbp")
+    assert index.has(2, "raw_story")
+
+    date_index.mark_artifact("bucket", date=DATE, game_id=2, artifact="raw_pbp")
+
+    doc = download_json("bucket", blob)
+    assert doc["version"] == date_index.INDEX_VERSION
+    assert doc["games"]["1"] == {"artifacts": ["raw_pbp"], "away": "COL", "home": "MTL"}
+    assert doc["games"]["2"] == {"artifacts": ["raw_pbp", "raw_story"]}
+
+
+def test_multi_artifact_queries(backend):
+    date_index.apply_index_updates(
+        "bucket",
+        DATE,
+        [
+            IndexUpdate(game_id=1, artifact="raw_pbp"),
+            IndexUpdate(game_id=1, artifact="raw_story"),
+            IndexUpdate(game_id=2, artifact="raw_pbp"),
+            IndexUpdate(game_id=3),
+        ],
+    )
+
+    missing = date_index.list_games_missing("bucket", DATE, "raw_pbp", "raw_story")
+    assert missing == [2, 3]
+    assert date_index.list_games_missing(
+        "bucket", DATE, "raw_pbp", "raw_story", all_missing=True
+    ) == [3]
+    assert date_index.list_games_complete("bucket", DATE, "raw_pbp", "raw_story") == [1]
+
+
+def test_clearing_an_artifact(backend):
+    date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="summary_ai")
+    date_index.mark_artifact(
+        "bucket", date=DATE, game_id=1, artifact="summary_ai", exists=False
+    )
+
+    assert date_index.list_games_missing("bucket", DATE, "summary_ai") == [1]
+
+
+def test_newer_index_version_is_not_overwritten(backend):
+    from gcp_ingestion import upload_json
+
+    blob = date_index.DATE_INDEX_BLOB.format(date=DATE)
+    upload_json("bucket", blob, {"version": 99, "date": DATE, "games": {}})
+
+    with pytest.raises(ValueError):
+        date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+
+
+def test_deferred_scope_flushes_marks_once_per_date(backend):
+    with date_index.deferred_index_updates():
+        for artifact in ("raw_pbp", "raw_story", "summary_ai"):
+            date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact=artifact)
+        date_index.mark_artifact(
+            "bucket", date="2025-04-26", game_id=2, artifact="raw_pbp"
+        )
+        with date_index.deferred_index_updates():  # joins the outer scope
+            date_index.mark_artifact("bucket", date=DATE, game_id=3, artifact="raw_pbp")
+        assert backend.puts == 0
+
+    assert backend.puts == 2  # one write per date
+    assert date_index.list_games_complete(
+        "bucket", DATE, "raw_pbp", "raw_story", "summary_ai"
+    ) == [1]
+    assert date_index.list_games_missing("bucket", DATE, "raw_story") == [3]
+
+
+def test_deferred_scope_captures_marks_from_copied_contexts(backend):
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+
+    def worker(gid):
+        date_index.mark_artifact("bucket", date=DATE, game_id=gid, artifact="raw_pbp")
+
+    with date_index.deferred_index_updates():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for gid in range(8):
+                pool.submit(contextvars.copy_context().run, worker, gid)
+        assert backend.puts == 0
+
+    assert backend.puts == 1
+    assert sorted(date_index.load_date_index("bucket", DATE).games) == list(range(8))
+
+
+def test_background_flush(backend):
+    with date_index.deferred_index_updates(background=True):
+        date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+
+    assert date_index.wait_for_index_flushes(timeout=5)
+    assert date_index.list_games_missing("bucket", DATE, "raw_pbp") == []
+
+
+def test_deferred_flush_failure_is_logged_not_raised(backend, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("storage down")
+
+    monkeypatch.setattr(date_index, "apply_index_updates", boom)
+
+    with date_index.deferred_index_updates():
+        date_index.mark_artifact("bucket", date=DATE, game_id=1, artifact="raw_pbp")
+
+
+def test_bulk_updates_write_each_month_shard_once(backend):
+    shard_puts = []
+    put = backend.put
+
+    def counting_put(bucket, blob, data, **kwargs):
+        if blob.startswith("indexes/by_month/"):
+            shard_puts.append(blob)
+        return put(bucket, blob, data, **kwargs)
+
+    backend.put = counting_put
+    dates = ["2025-03-30", "2025-03-31", "2025-04-01", "2025-04-02"]
+
+    date_index.apply_index_updates_bulk(
+        "bucket",
+        {d: [IndexUpdate(game_id=n, artifact="raw_pbp")] for n, d in enumerate(dates)},
+    )
+
+    assert backend.puts == len(dates)
+    assert sorted(shard_puts) == [
+        "indexes/by_month/2025-03.json",
+        "indexes/by_month/2025-04.json",
+    ]
+    assert date_index.list_games_complete("bucket", "2025-04-02", "raw_pbp") == [3]
@@ -38,6 +38,9 @@ sys.modules.setdefault("google.cloud.storage", fake_storage)
 sys.modules.setdefault("google.api_core", fake_google_api_core)
 sys.modules.setdefault("google.api_core.exceptions", fake_exceptions)
 
+# engine first: importing data_fetch.editorial on its own hits the
+# engine -> summarize_game -> editorial import cycle and disables index marks
+import engine  # noqa: E402,F401
 import data_fetch.editorial as editorial_mod  # noqa: E402
 
 TEST_SETTINGS = config.Settings(
@@ -82,10 +85,9 @@ FORGE_STORY_RESPONSE = {
 def _make_fake_gcs(*, exists: bool, cached_value=None):
     """Build a fake gcp_ingestion module."""
 
-    def check_file_exists(bucket, path):
-        return exists
-
-    def download_json(bucket, path):
+    def download_json_or_none(bucket, path):
+        if not exists:
+            return None
         if cached_value is not None:
             return cached_value
         raise RuntimeError("No cached value")
@@ -96,8 +98,7 @@ def _make_fake_gcs(*, exists: bool, cached_value=None):
         upload_calls.append((bucket, path, data))
 
     fake = SimpleNamespace(
-        check_file_exists=check_file_exists,
-        download_json=download_json,
+        download_json_or_none=download_json_or_none,
         upload_json=upload_json,
         upload_calls=upload_calls,
     )
@@ -149,11 +150,19 @@ def _make_httpx_mock(
 # ---------------------------------------------------------------------------
 
 
+@pytest.fixture(autouse=True)
+def fresh_misses():
+    editorial_mod.clear_editorial_misses()
+    yield
+    editorial_mod.clear_editorial_misses()
+
+
 def test_cache_hit_returns_cached_value(monkeypatch):
     """When GCS has a cached editorial, return it without hitting Forge DAPI."""
     fake_gcs = _make_fake_gcs(exists=True, cached_value=FAKE_EDITORIAL)
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
 
@@ -168,11 +177,13 @@ def test_cache_miss_fetches_and_caches(monkeypatch):
     fake_gcs = _make_fake_gcs(exists=False)
     fake_httpx = _make_httpx_mock(FORGE_INDEX_RESPONSE, FORGE_STORY_RESPONSE)
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         result = editorial_mod.get_editorial(12345)
@@ -191,18 +202,22 @@ def test_no_editorial_returns_none(monkeypatch):
     empty_index = {"items": []}
     fake_httpx = _make_httpx_mock(empty_index)
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         result = editorial_mod.get_editorial(99999)
 
     assert result is None
-    # Should NOT have uploaded anything (no data to cache)
-    assert len(fake_gcs.upload_calls) == 0
+    # Only the "no recap yet" marker is written, never a recap blob
+    assert [path for _, path, _ in fake_gcs.upload_calls] == [
+        "misses/editorial/99999.json"
+    ]
 
 
 def test_gcs_upload_failure_logs_warning_and_returns_data(monkeypatch):
@@ -214,11 +229,13 @@ def test_gcs_upload_failure_logs_warning_and_returns_data(monkeypatch):
 
     fake_httpx = _make_httpx_mock(FORGE_INDEX_RESPONSE, FORGE_STORY_RESPONSE)
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", failing_upload)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         result = editorial_mod.get_editorial(12345)
@@ -237,11 +254,13 @@ def test_mark_artifact_called_with_raw_editorial(monkeypatch):
     def fake_mark(bucket, *, date, game_id, away, home, artifact, exists):
         mark_calls.append({"artifact": artifact, "game_id": game_id, "date": date})
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", fake_mark)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         editorial_mod.get_editorial(12345, date="2025-04-25")
@@ -255,11 +274,13 @@ def test_force_refresh_bypasses_cache(monkeypatch):
     fake_gcs = _make_fake_gcs(exists=True, cached_value=FAKE_EDITORIAL)
     fake_httpx = _make_httpx_mock(FORGE_INDEX_RESPONSE, FORGE_STORY_RESPONSE)
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         result = editorial_mod.get_editorial(12345, force_refresh=True)
@@ -308,11 +329,13 @@ def test_http_error_on_index_raises_editorial_fetch_error(monkeypatch):
         TimeoutException=FakeTimeoutException,
     )
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", fake_gcs.check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", fake_gcs.download_json)
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
     monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         with pytest.raises(editorial_mod.EditorialFetchError, match="404"):
@@ -324,20 +347,17 @@ def test_cache_read_error_falls_through_to_live_fetch(monkeypatch):
     fake_httpx = _make_httpx_mock(FORGE_INDEX_RESPONSE, FORGE_STORY_RESPONSE)
     upload_calls = []
 
-    def check_file_exists(bucket, path):
-        return True  # Cache appears to exist
-
-    def download_json(bucket, path):
+    def download_json_or_none(bucket, path):
         raise RuntimeError("corrupt blob")  # Cache read fails
 
     def upload_json(bucket, path, data):
         upload_calls.append(data)
 
-    monkeypatch.setattr(editorial_mod, "check_file_exists", check_file_exists)
-    monkeypatch.setattr(editorial_mod, "download_json", download_json)
+    monkeypatch.setattr(editorial_mod, "download_json_or_none", download_json_or_none)
     monkeypatch.setattr(editorial_mod, "upload_json", upload_json)
     monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
     monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
 
     with config.override_settings(TEST_SETTINGS):
         result = editorial_mod.get_editorial(12345)
@@ -347,3 +367,179 @@ def test_cache_read_error_falls_through_to_live_fetch(monkeypatch):
     assert result["headline"] == "Great game headline"
     # And re-cached it
     assert len(upload_calls) == 1
+
+
+def test_get_editorial_async_fetches_and_caches(monkeypatch):
+    """The async path issues the same two Forge requests and caches the result."""
+    import asyncio
+
+    import httpx
+
+    fake_gcs = _make_fake_gcs(exists=False)
+
+    def handler(request):
+        if "tags.slug" in str(request.url):
+            return httpx.Response(200, json=FORGE_INDEX_RESPONSE)
+        return httpx.Response(200, json=FORGE_STORY_RESPONSE)
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    # Cache I/O goes through the sync helpers, off the event loop
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", fake_gcs.download_json_or_none
+    )
+    monkeypatch.setattr(editorial_mod, "upload_json", fake_gcs.upload_json)
+    monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
+    monkeypatch.setattr(editorial_mod, "get_async_http_client", lambda: http)
+
+    with config.override_settings(TEST_SETTINGS):
+        result = asyncio.run(editorial_mod.get_editorial_async(12345))
+
+    assert result == FAKE_EDITORIAL
+    assert len(fake_gcs.upload_calls) == 1
+
+
+def test_known_miss_skips_forge_until_ttl_expires(monkeypatch):
+    """A miss is trusted for its TTL; after that Forge is asked again."""
+    import gcp_ingestion
+
+    backend = gcp_ingestion.MemoryBackend()
+    index = {"items": []}
+    fake_httpx = _make_httpx_mock(index, FORGE_STORY_RESPONSE)
+    clock = [1_000_000.0]
+    monkeypatch.setattr(editorial_mod.time, "time", lambda: clock[0])
+    monkeypatch.setattr(
+        editorial_mod, "download_json_or_none", gcp_ingestion.download_json_or_none
+    )
+    monkeypatch.setattr(editorial_mod, "upload_json", gcp_ingestion.upload_json)
+    monkeypatch.setattr(editorial_mod, "mark_artifact", lambda *a, **kw: None)
+    monkeypatch.setitem(sys.modules, "httpx", fake_httpx)
+    monkeypatch.setattr(editorial_mod, "get_http_client", lambda: fake_httpx)
+
+    with (
+        config.override_settings(TEST_SETTINGS),
+        gcp_ingestion.override_storage_backend(backend),
+    ):
+        assert editorial_mod.get_editorial(12345) is None
+        assert editorial_mod.get_editorial(12345) is None
+        assert len(fake_httpx.call_log) == 1
+
+        # Another process sees the marker without calling Forge
+        editorial_mod.clear_editorial_misses()
+        assert editorial_mod.get_editorial(12345) is None
+        assert len(fake_httpx.call_log) == 1
+
+        # Once it expires the recap is fetched and the marker removed
+        clock[0] += TEST_SETTINGS.editorial_miss_ttl_recent + 1
+        index["items"] = FORGE_INDEX_RESPONSE["items"]
+        assert editorial_mod.get_editorial(12345) == FAKE_EDITORIAL
+        assert not backend.exists("test-bucket", "misses/editorial/12345.json")
+
+
+def test_miss_ttl_depends_on_game_age():
+    with config.override_settings(TEST_SETTINGS):
+        assert editorial_mod._miss_ttl(None) == TEST_SETTINGS.editorial_miss_ttl_recent
+        assert (
+            editorial_mod._miss_ttl("2020-01-01")
+            == TEST_SETTINGS.editorial_miss_ttl_old
+        )
+
+
+def test_prefetch_editorials_covers_slate_in_one_index_query(monkeypatch):
+    """One batched index query, concurrent story fetches, one bulk upload."""
+    import httpx
+
+    import gcp_ingestion
+
+    requests = []
+    index = {
+        "items": [
+            {
+                "selfUrl": "/v2/content/en-us/stories/recap-1",
+                "headline": {"default": "Recap one"},
+                "tags": [{"slug": "gameid-1"}, {"slug": "team-mtl"}],
+            },
+            {
+                "selfUrl": "/v2/content/en-us/stories/recap-2",
+                "headline": "Recap two",
+                "tags": [{"slug": "gameid-2"}],
+            },
+        ]
+    }
+
+    def handler(request):
+        requests.append(request.url)
+        if "tags.slug" in str(request.url):
+            return httpx.Response(200, json=index)
+        return httpx.Response(200, json=FORGE_STORY_RESPONSE)
+
+    backend = gcp_ingestion.MemoryBackend()
+    # Game 4 is already cached and must not be looked up again
+    backend.put("test-bucket", "raw/editorial/4.json", b"{}")
+    monkeypatch.setattr(
+        editorial_mod,
+        "get_http_client",
+        lambda: httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    marks = []
+    monkeypatch.setattr(
+        editorial_mod,
+        "queue_index_updates",
+        lambda bucket, date, updates: marks.extend(u.game_id for u in updates),
+    )
+
+    with (
+        config.override_settings(TEST_SETTINGS),
+        gcp_ingestion.override_storage_backend(backend),
+    ):
+        results = editorial_mod.prefetch_editorials([1, 2, 3, 4], date="2025-04-25")
+
+    index_queries = [u for u in requests if "tags.slug" in str(u)]
+    assert len(index_queries) == 1
+    assert "gameid-1,gameid-2,gameid-3" in str(index_queries[0])
+    assert results[1]["headline"] == "Recap one"
+    assert results[2]["headline"] == "Recap two"
+    assert results[3] is None
+    assert 4 not in results
+    assert backend.exists("test-bucket", "raw/editorial/1.json")
+    assert backend.exists("test-bucket", "misses/editorial/3.json")
+    assert sorted(marks) == [1, 2]
+
+
+def test_prefetch_does_not_negative_cache_games_cut_off_by_the_page_cap(
+    monkeypatch,
+):
+    import httpx
+
+    import gcp_ingestion
+
+    index = {
+        "items": [
+            {"selfUrl": "/stories/other-a", "tags": [{"slug": "gameid-1"}]},
+            {"selfUrl": "/stories/other-b", "tags": [{"slug": "gameid-1"}]},
+        ]
+    }
+
+    def handler(request):
+        if "tags.slug" in str(request.url):
+            return httpx.Response(200, json=index)
+        return httpx.Response(200, json=FORGE_STORY_RESPONSE)
+
+    monkeypatch.setattr(editorial_mod, "_BATCH_PAGE_SIZE", 2)
+    monkeypatch.setattr(editorial_mod, "_BATCH_MAX_PAGES", 1)
+    monkeypatch.setattr(
+        editorial_mod,
+        "get_http_client",
+        lambda: httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(editorial_mod, "queue_index_updates", lambda *a: None)
+    backend = gcp_ingestion.MemoryBackend()
+
+    with (
+        config.override_settings(TEST_SETTINGS),
+        gcp_ingestion.override_storage_backend(backend),
+    ):
+        results = editorial_mod.prefetch_editorials([1, 2], date="2025-04-25")
+
+    # Paging stopped on a full page: game 2 may still have a recap
+    assert results[1] is not None and 2 not in results
+    assert not backend.exists("test-bucket", "misses/editorial/2.json")
@@ -0,0 +1,116 @@
+"""Tests for engine.live_ingest."""
+
+import pytest
+
+import config
+import engine.live_ingest as live
+from gcp_ingestion import MemoryBackend, override_storage_backend
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+HOME, AWAY = 10, 20
+
+
+@pytest.fixture(autouse=True)
+def backend():
+    backend = MemoryBackend()
+    with override_storage_backend(backend), config.override_settings(TEST_SETTINGS):
+        yield backend
+
+
+def _play(sort_order, kind, team, period=1):
+    return {
+        "eventId": 100 + sort_order,
+        "sortOrder": sort_order,
+        "typeDescKey": kind,
+        "periodDescriptor": {"number": period},
+        "details": {"eventOwnerTeamId": team, "scoringPlayerId": 7},
+    }
+
+
+def _serve(monkeypatch, snapshots):
+    """Serve successive play-by-play snapshots, one per poll."""
+    transformed = []
+    real_transform = live.transform_event
+
+    def fake_pbp(game_id, **kwargs):
+        plays, state = snapshots.pop(0)
+        return {
+            "gameState": state,
+            "plays": plays,
+            "homeTeam": {"id": HOME, "abbrev": "EDM"},
+            "awayTeam": {"id": AWAY, "abbrev": "DAL"},
+            "rosterSpots": [
+                {
+                    "playerId": 7,
+                    "firstName": {"default": "Connor"},
+                    "lastName": {"default": "McDavid"},
+                    "teamId": HOME,
+                }
+            ],
+        }
+
+    def counting_transform(event):
+        transformed.append(event["sortOrder"])
+        return real_transform(event)
+
+    monkeypatch.setattr(live, "get_play_by_play", fake_pbp)
+    monkeypatch.setattr(live, "transform_event", counting_transform)
+    return transformed
+
+
+def test_polls_transform_only_new_plays_and_keep_running_totals(monkeypatch):
+    first = [_play(1, "faceoff", HOME), _play(2, "shot-on-goal", AWAY)]
+    second = first + [_play(3, "goal", HOME), _play(4, "hit", AWAY)]
+    transformed = _serve(
+        monkeypatch, [(first, "LIVE"), (second, "LIVE"), (second, "OFF")]
+    )
+
+    one = live.ingest_live_plays(1)
+    two = live.ingest_live_plays(1)
+    three = live.ingest_live_plays(1)
+
+    assert transformed == [1, 2, 3, 4]
+    assert len(one.new_events) == 2 and len(two.new_events) == 2
+    assert three.new_events == [] and three.final
+    assert three.event_count == 4
+    assert three.team_stats[HOME]["goals"] == 1
+    assert three.team_stats[HOME]["shots_on_goal"] == 1
+    assert three.team_stats[AWAY]["shots_on_goal"] == 1
+    assert three.team_stats[AWAY]["hits"] == 1
+
+    events = live.load_live_events(1)
+    assert [e["event_type"] for e in events] == [
+        "faceoff",
+        "shot-on-goal",
+        "goal",
+        "hit",
+    ]
+    assert events[2]["players"]["scorer_name"] == "Connor McDavid"
+
+
+def test_unchanged_poll_writes_nothing(monkeypatch, backend):
+    plays = [_play(1, "hit", HOME)]
+    _serve(monkeypatch, [(plays, "LIVE"), (plays, "LIVE")])
+    live.ingest_live_plays(2)
+    writes = []
+    put = backend.put
+    backend.put = lambda *a, **kw: writes.append(a[1]) or put(*a, **kw)
+
+    update = live.ingest_live_plays(2)
+
+    assert update.new_events == [] and update.event_count == 1
+    assert writes == []
+
+
+def test_new_plays_orders_by_sort_order_then_event_id():
+    plays = [
+        {"sortOrder": 5, "eventId": 2},
+        {"sortOrder": 3, "eventId": 9},
+        {"sortOrder": 5, "eventId": 1},
+    ]
+
+    assert live.new_plays(plays, None) == [plays[1], plays[2], plays[0]]
+    assert live.new_plays(plays, {"sort_order": 5, "event_id": 1}) == [plays[0]]
@@ -1,5 +1,21 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from test_storage import FakeClient
+
 import config
-from data_fetch import play_by_play
+from data_fetch import game_state, play_by_play
+from data_fetch.clients import Conditional
+from data_fetch.game_state import cache_metadata, is_fresh
+from gcp_ingestion import (
+    GCSBackend,
+    MemoryBackend,
+    download_json_or_none,
+    override_storage_backend,
+    upload_json,
+)
 
 
 def test_get_play_by_play_uses_cache(monkeypatch):
@@ -9,10 +25,11 @@ def test_get_play_by_play_uses_cache(monkeypatch):
         called["client"] = True
         raise AssertionError("Client should not be instantiated when cache is hit")
 
-    monkeypatch.setattr(play_by_play, "NHLClient", fake_client)
-    monkeypatch.setattr(play_by_play, "check_file_exists", lambda *args, **kwargs: True)
+    monkeypatch.setattr(play_by_play, "get_nhl_client", fake_client)
     monkeypatch.setattr(
-        play_by_play, "download_json", lambda *args, **kwargs: {"plays": []}
+        play_by_play,
+        "download_json_with_metadata",
+        lambda *args, **kwargs: ({"plays": []}, {}),
     )
     monkeypatch.setattr(
         play_by_play,
@@ -42,22 +59,25 @@ def test_get_play_by_play_marks_index(monkeypatch):
         calls.append((bucket, date, game_id, away, home, artifact, exists))
 
     class DummyGameCenter:
-        def play_by_play(self, game_id):
-            return {
-                "plays": [],
-                "gameDate": "2025-04-25T23:00:00Z",
-                "awayTeam": {"abbrev": "COL"},
-                "homeTeam": {"abbrev": "MTL"},
-            }
+        def play_by_play_if_modified(self, game_id, validators=None):
+            return Conditional(
+                {
+                    "plays": [],
+                    "gameDate": "2025-04-25T23:00:00Z",
+                    "awayTeam": {"abbrev": "COL"},
+                    "homeTeam": {"abbrev": "MTL"},
+                },
+                {},
+            )
 
     class DummyClient:
         def __init__(self):
             self.game_center = DummyGameCenter()
 
     monkeypatch.setattr(play_by_play, "mark_artifact", fake_mark)
-    monkeypatch.setattr(play_by_play, "NHLClient", DummyClient)
+    monkeypatch.setattr(play_by_play, "get_nhl_client", DummyClient)
     monkeypatch.setattr(
-        play_by_play, "check_file_exists", lambda *args, **kwargs: False
+        play_by_play, "download_json_with_metadata", lambda *args, **kwargs: None
     )
     monkeypatch.setattr(play_by_play, "upload_json", lambda *args, **kwargs: None)
 
@@ -77,3 +97,195 @@ def test_get_play_by_play_marks_index(monkeypatch):
     assert home == "MTL"
     assert artifact == "raw_pbp"
     assert exists is True
+
+
+def test_callers_joining_a_shared_fetch_apply_their_own_index_marks(monkeypatch):
+    import threading
+    import time
+
+    release = threading.Event()
+    fetches = []
+    marks = []
+
+    class DummyGameCenter:
+        def play_by_play_if_modified(self, game_id, validators=None):
+            fetches.append(game_id)
+            release.wait(1)
+            return Conditional({"plays": [], "gameState": "OFF"}, {})
+
+    monkeypatch.setattr(
+        play_by_play,
+        "get_nhl_client",
+        lambda: SimpleNamespace(game_center=DummyGameCenter()),
+    )
+    monkeypatch.setattr(
+        play_by_play, "download_json_with_metadata", lambda *args, **kwargs: None
+    )
+    monkeypatch.setattr(play_by_play, "upload_json", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        play_by_play,
+        "mark_artifact",
+        lambda bucket, *, date, game_id, **kw: marks.append((date, game_id)),
+    )
+
+    with config.override_settings(
+        config.Settings(
+            gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+        )
+    ):
+        leader = threading.Thread(
+            target=play_by_play.get_play_by_play,
+            args=(7,),
+            kwargs={"mark_index": False},
+        )
+        leader.start()
+        while not fetches:
+            time.sleep(0.001)
+        joiner = threading.Thread(
+            target=play_by_play.get_play_by_play,
+            args=(7,),
+            kwargs={"date": "2025-04-25"},
+        )
+        joiner.start()
+        time.sleep(0.05)  # let the joiner join the in-flight fetch
+        release.set()
+        leader.join()
+        joiner.join()
+
+    assert fetches == [7]
+    assert marks == [("2025-04-25", 7)]
+
+
+def test_get_play_by_play_async_fetches_and_caches(monkeypatch):
+    class DummyGameCenter:
+        async def play_by_play_if_modified(self, game_id, validators=None):
+            return Conditional({"plays": [{"eventId": 1}]}, {})
+
+    monkeypatch.setattr(
+        play_by_play,
+        "get_async_nhl_client",
+        lambda: SimpleNamespace(game_center=DummyGameCenter()),
+    )
+    backend = MemoryBackend()
+
+    with (
+        override_storage_backend(backend),
+        config.override_settings(
+            config.Settings(
+                gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+            )
+        ),
+    ):
+        payload = asyncio.run(
+            play_by_play.get_play_by_play_async(789, mark_index=False)
+        )
+        cached = download_json_or_none("bucket", "raw/play_by_play/789.json")
+
+    assert payload == {"plays": [{"eventId": 1}]}
+    assert cached == payload
+
+
+def test_live_snapshot_is_refreshed_and_final_one_kept(monkeypatch):
+    states = ["OFF"]
+    fetched = []
+
+    class DummyGameCenter:
+        def play_by_play_if_modified(self, game_id, validators=None):
+            fetched.append(game_id)
+            return Conditional({"plays": [1, 2, 3], "gameState": states[-1]}, {})
+
+    monkeypatch.setattr(
+        play_by_play,
+        "get_nhl_client",
+        lambda: SimpleNamespace(game_center=DummyGameCenter()),
+    )
+    blob = "raw/play_by_play/42.json"
+    live = {"plays": [1], "gameState": "LIVE"}
+    an_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    with (
+        override_storage_backend(MemoryBackend()),
+        config.override_settings(
+            config.Settings(
+                gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+            )
+        ),
+    ):
+        upload_json(
+            "bucket", blob, live, metadata=cache_metadata(live, now=an_hour_ago)
+        )
+
+        first = play_by_play.get_play_by_play(42, mark_index=False)
+        second = play_by_play.get_play_by_play(42, mark_index=False)
+
+    assert first["gameState"] == "OFF" and second == first
+    assert fetched == [42]
+
+
+@pytest.mark.parametrize(
+    "make_backend",
+    [MemoryBackend, lambda: GCSBackend(FakeClient())],
+    ids=["memory", "gcs"],
+)
+def test_stale_snapshot_is_revalidated_without_rewrite(monkeypatch, make_backend):
+    sent = []
+
+    class DummyGameCenter:
+        def play_by_play_if_modified(self, game_id, validators=None):
+            sent.append(dict(validators or {}))
+            return Conditional(None, dict(validators))
+
+    monkeypatch.setattr(
+        play_by_play,
+        "get_nhl_client",
+        lambda: SimpleNamespace(game_center=DummyGameCenter()),
+    )
+    game_state.clear_revalidations()
+    backend = make_backend()
+    blob = "raw/play_by_play/43.json"
+    live = {"plays": [1], "gameState": "LIVE"}
+    an_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    with (
+        override_storage_backend(backend),
+        config.override_settings(
+            config.Settings(
+                gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+            )
+        ),
+    ):
+        upload_json(
+            "bucket",
+            blob,
+            live,
+            metadata={**cache_metadata(live, now=an_hour_ago), "etag": '"v1"'},
+        )
+        generation = backend.get("bucket", blob).generation
+
+        first = play_by_play.get_play_by_play(43, mark_index=False)
+        second = play_by_play.get_play_by_play(43, mark_index=False)
+
+    assert first == live and second == live
+    # One conditional request; the 304 keeps the copy fresh in-process
+    assert sent == [{"etag": '"v1"'}]
+    assert backend.get("bucket", blob).generation == generation
+    game_state.clear_revalidations()
+
+
+def test_freshness_policy():
+    now = datetime(2025, 4, 26, tzinfo=timezone.utc)
+    live = {"gameState": "LIVE"}
+    settings = config.Settings(
+        gcs_bucket_name="b", openai_api_key="k", openai_model="m", live_cache_ttl=30
+    )
+
+    with config.override_settings(settings):
+        recent = cache_metadata(live, now=now - timedelta(seconds=10))
+        old = cache_metadata(live, now=now - timedelta(seconds=60))
+        assert recent["gameState"] == "LIVE"
+        assert is_fresh(live, recent, now=now)
+        assert not is_fresh(live, old, now=now)
+        # Final games never expire; pre-metadata blobs are judged by payload
+        assert is_fresh({"gameState": "FINAL"}, {}, now=now)
+        assert is_fresh({"plays": []}, {}, now=now)
+        assert not is_fresh(live, {}, now=now)
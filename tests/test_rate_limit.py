@@ -0,0 +1,144 @@
+"""Tests for data_fetch.rate_limit and the governed HTTP transports."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import config
+from data_fetch import clients, rate_limit
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket",
+    openai_api_key="k",
+    openai_model="gpt-4o-mini",
+    http_rate_limit=0,
+    http_max_in_flight=2,
+    http_max_retries=2,
+    http_backoff_base=1.0,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_governors(monkeypatch):
+    slept = []
+
+    async def fake_async_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(rate_limit, "_sleep", slept.append)
+    monkeypatch.setattr(rate_limit, "_async_sleep", fake_async_sleep)
+    rate_limit.reset_http_governors()
+    with config.override_settings(TEST_SETTINGS):
+        yield slept
+    rate_limit.reset_http_governors()
+
+
+def _client(handler) -> httpx.Client:
+    return httpx.Client(
+        transport=clients._GovernedTransport(httpx.MockTransport(handler))
+    )
+
+
+def _responder(*statuses, headers=None):
+    calls = []
+
+    def handler(request):
+        calls.append(request.method)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        return httpx.Response(status, json={"n": len(calls)}, headers=headers)
+
+    return handler, calls
+
+
+def test_server_errors_are_retried_with_backoff(fresh_governors):
+    handler, calls = _responder(503, 502, 200)
+
+    resp = _client(handler).get("https://api.test/x")
+
+    assert resp.status_code == 200 and len(calls) == 3
+    assert len(fresh_governors) == 2
+    assert 0 <= fresh_governors[0] <= 1.0 and 0 <= fresh_governors[1] <= 2.0
+    stats = rate_limit.get_http_stats()["api.test"]
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2 and stats["server_errors"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_gives_up_after_max_retries_and_honors_retry_after(fresh_governors):
+    handler, calls = _responder(429, headers={"Retry-After": "7"})
+
+    resp = _client(handler).get("https://api.test/x")
+
+    assert resp.status_code == 429 and len(calls) == 3
+    assert fresh_governors == [7.0, 7.0]
+    stats = rate_limit.get_http_stats()["api.test"]
+    assert stats["rate_limited"] == 3 and stats["gave_up"] == 1
+
+
+def test_non_idempotent_requests_are_not_retried():
+    handler, calls = _responder(503, 200)
+
+    resp = _client(handler).post("https://api.test/x")
+
+    assert resp.status_code == 503 and calls == ["POST"]
+
+
+def test_token_bucket_queues_requests_beyond_the_burst():
+    bucket = rate_limit.TokenBucket(rate=10, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.01)
+    assert waits[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_in_flight_requests_are_capped_per_host():
+    def handler(request):
+        time.sleep(0.02)
+        return httpx.Response(200, json={})
+
+    client = _client(handler)
+    threads = [
+        threading.Thread(target=client.get, args=("https://api.test/x",))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = rate_limit.get_http_stats()["api.test"]
+    assert stats["requests"] == 8
+    assert stats["peak_in_flight"] <= 2
+
+
+def test_async_transport_retries(fresh_governors):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.host)
+        return httpx.Response(500 if len(calls) == 1 else 200, json={})
+
+    async def run():
+        transport = clients._AsyncGovernedTransport(httpx.MockTransport(handler))
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get("https://forge.test/x")
+
+    resp = asyncio.run(run())
+
+    assert resp.status_code == 200 and len(calls) == 2
+    assert len(fresh_governors) == 1
+    assert rate_limit.get_http_stats()["forge.test"]["retries"] == 1
+
+
+def test_shared_pools_use_governed_transports():
+    clients.close_http_clients()
+    try:
+        client = clients.get_http_client()
+        assert isinstance(client._transport, clients._GovernedTransport)
+    finally:
+        clients.close_http_clients()
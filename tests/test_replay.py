@@ -0,0 +1,124 @@
+"""Tests for data_fetch.replay (record/replay HTTP stand-in)."""
+
+import asyncio
+import dataclasses
+
+import httpx
+import pytest
+
+import config
+from data_fetch import clients, rate_limit, replay
+
+BASE_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket",
+    openai_api_key="k",
+    openai_model="gpt-4o-mini",
+    http_rate_limit=0,
+    http_max_retries=2,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_sleep", lambda delay: None)
+    rate_limit.reset_http_governors()
+    yield
+    rate_limit.reset_http_governors()
+    clients.close_http_clients()
+
+
+def _settings(tmp_path, **overrides):
+    return dataclasses.replace(
+        BASE_SETTINGS, http_replay_dir=str(tmp_path), **overrides
+    )
+
+
+def _upstream():
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        if request.url.path == "/boom":
+            return httpx.Response(503)
+        return httpx.Response(
+            200,
+            json={"path": request.url.path},
+            headers={"ETag": '"v1"', "X-Internal": "dropped"},
+        )
+
+    return handler, calls
+
+
+def test_record_then_replay_offline(tmp_path):
+    handler, calls = _upstream()
+    with config.override_settings(_settings(tmp_path, http_replay_mode="record")):
+        recorder = httpx.Client(
+            transport=replay.wrap_transport(httpx.MockTransport(handler))
+        )
+        assert recorder.get("https://api.test/a?x=1").json() == {"path": "/a"}
+        assert recorder.get("https://api.test/boom").status_code == 503
+    assert len(calls) == 2
+
+    with config.override_settings(_settings(tmp_path, http_replay_mode="replay")):
+        player = httpx.Client(transport=replay.wrap_transport(None))
+        resp = player.get("https://api.test/a?x=1")
+        assert resp.json() == {"path": "/a"}
+        assert resp.headers["etag"] == '"v1"' and "x-internal" not in resp.headers
+        # transient errors are never recorded
+        with pytest.raises(replay.ReplayMissError):
+            player.get("https://api.test/boom")
+        with pytest.raises(replay.ReplayMissError):
+            player.get("https://api.test/a?x=2")
+    assert len(calls) == 2
+
+
+def test_off_mode_leaves_transport_alone(tmp_path):
+    inner = httpx.MockTransport(lambda request: httpx.Response(200))
+    with config.override_settings(_settings(tmp_path)):
+        assert replay.wrap_transport(inner) is inner
+
+
+def test_injected_errors_are_seeded_and_retried_by_the_governor(tmp_path):
+    store = replay.FixtureStore(str(tmp_path))
+    store.save("GET", "https://api.test/a", 200, {}, b'{"ok": true}')
+
+    def outcomes(seed):
+        faults = replay._Faults(latency=0, error_rate=0.5, seed=seed)
+        transport = replay.ReplayTransport(store, faults)
+        request = httpx.Request("GET", "https://api.test/a")
+        return [transport.handle_request(request).status_code for _ in range(20)]
+
+    assert outcomes(7) == outcomes(7)
+    assert {200, 503} == set(outcomes(7))
+
+    settings = _settings(
+        tmp_path, http_replay_mode="replay", http_replay_error_rate=0.5
+    )
+    with config.override_settings(settings):
+        clients.close_http_clients()
+        client = clients.get_http_client()
+        statuses = [client.get("https://api.test/a").status_code for _ in range(10)]
+    assert statuses.count(200) >= 8
+    assert rate_limit.get_http_stats()["api.test"]["retries"] > 0
+
+
+def test_async_record_and_replay_with_latency(tmp_path, monkeypatch):
+    handler, calls = _upstream()
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    async def run(mode, inner=None):
+        settings = _settings(tmp_path, http_replay_mode=mode, http_replay_latency=0.25)
+        with config.override_settings(settings):
+            transport = replay.wrap_async_transport(inner)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return (await client.get("https://forge.test/story")).json()
+
+    assert asyncio.run(run("record", httpx.MockTransport(handler))) == {
+        "path": "/story"
+    }
+    monkeypatch.setattr(replay, "_async_sleep", fake_sleep)
+    assert asyncio.run(run("replay")) == {"path": "/story"}
+    assert len(calls) == 1 and slept == [0.25]
@@ -1,12 +1,30 @@
+import pytest
+
 import config
 from data_fetch import schedule
+from gcp_ingestion import MemoryBackend, override_storage_backend
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_storage():
+    schedule.clear_schedule_cache()
+    backend = MemoryBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        yield backend
+    schedule.clear_schedule_cache()
 
 
 class DummyScheduleService:
     def __init__(self, payload):
         self._payload = payload
+        self.calls = 0
 
     def get_schedule(self, *, date):
+        self.calls += 1
         return self._payload
 
 
@@ -31,21 +49,135 @@ def test_get_schedule_seeds_index(monkeypatch):
 
     calls = []
 
-    def fake_mark(bucket, *, date, game_id, away=None, home=None, artifact, exists):
-        calls.append((bucket, date, game_id, away, home, artifact, exists))
+    def fake_apply(bucket, date, updates):
+        calls.append((bucket, date, list(updates)))
 
-    monkeypatch.setattr(schedule, "mark_artifact", fake_mark)
-    monkeypatch.setattr(schedule, "NHLClient", lambda: DummyClient(payload))
+    monkeypatch.setattr(schedule, "apply_index_updates", fake_apply)
+    monkeypatch.setattr(schedule, "get_nhl_client", lambda: DummyClient(payload))
 
-    with config.override_settings(
-        config.Settings(
-            gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
-        )
-    ):
-        games = schedule.get_schedule("2025-04-25", mark_index=True)
+    games = schedule.get_schedule("2025-04-25", mark_index=True)
 
     assert len(games) == 1
-    assert calls  # raw_pbp and raw_story entries
-    artifacts = {(artifact, exists) for _, _, _, _, _, artifact, exists in calls}
-    assert ("raw_pbp", False) in artifacts
-    assert ("raw_story", False) in artifacts
+    assert len(calls) == 1  # one read-modify-write for the whole slate
+    bucket, date, updates = calls[0]
+    assert (bucket, date) == ("bucket", "2025-04-25")
+    # One seed per game: the entry it creates already lacks every artifact
+    assert [(u.game_id, u.artifact, u.exists) for u in updates] == [
+        (1, "raw_pbp", False)
+    ]
+    assert not updates[0].overwrite
+    assert (updates[0].away, updates[0].home) == ("COL", "MTL")
+
+
+def _game(game_id, state):
+    return {
+        "id": game_id,
+        "gameState": state,
+        "homeTeam": {"abbrev": "MTL"},
+        "awayTeam": {"abbrev": "COL"},
+    }
+
+
+def test_final_past_schedule_is_cached_for_good(monkeypatch, memory_storage):
+    client = DummyClient({"games": [_game(1, "OFF"), _game(2, "FINAL")]})
+    monkeypatch.setattr(schedule, "get_nhl_client", lambda: client)
+    monkeypatch.setattr(schedule, "apply_index_updates", lambda *a: None)
+
+    games = schedule.get_schedule("2025-04-25")
+    schedule.clear_schedule_cache()  # a fresh process still reads the blob
+    monkeypatch.setattr(schedule.time, "time", lambda: 4_000_000_000.0)
+    again = schedule.get_schedule("2025-04-25")
+
+    assert [g.game_state for g in games] == ["OFF", "FINAL"]
+    assert again == games
+    assert client.schedule.calls == 1
+    assert memory_storage.exists("bucket", "schedules/2025-04-25.json")
+
+
+def test_schedule_in_play_expires_after_ttl(monkeypatch):
+    client = DummyClient({"games": [_game(1, "OFF"), _game(2, "LIVE")]})
+    clock = [1_000_000.0]
+    monkeypatch.setattr(schedule, "get_nhl_client", lambda: client)
+    monkeypatch.setattr(schedule, "apply_index_updates", lambda *a: None)
+    monkeypatch.setattr(schedule.time, "time", lambda: clock[0])
+
+    schedule.get_schedule("2025-04-25")
+    schedule.get_schedule("2025-04-25")
+    assert client.schedule.calls == 1
+
+    clock[0] += TEST_SETTINGS.schedule_cache_ttl + 1
+    schedule.get_schedule("2025-04-25")
+    assert client.schedule.calls == 2
+
+
+def test_schedule_range_fetches_week_blocks(monkeypatch, memory_storage):
+    from datetime import date as Date, timedelta
+
+    weeks = []
+
+    class WeekService:
+        def get_schedule_week(self, *, date):
+            weeks.append(date)
+            start = Date.fromisoformat(date)
+            days = [(start + timedelta(days=n)).isoformat() for n in range(7)]
+            return {
+                "gameWeek": [
+                    {"date": d, "games": [_game(int(d.replace("-", "")), "OFF")]}
+                    for d in days
+                ]
+            }
+
+    seeded = []
+    monkeypatch.setattr(
+        schedule, "get_nhl_client", lambda: type("C", (), {"schedule": WeekService()})
+    )
+    monkeypatch.setattr(
+        schedule,
+        "apply_index_updates_bulk",
+        lambda bucket, updates: seeded.append(sorted(updates)),
+    )
+
+    out = schedule.get_schedule_range("2025-03-01", "2025-03-10")
+
+    assert weeks == ["2025-03-01", "2025-03-08"]
+    assert list(out) == [f"2025-03-{d:02d}" for d in range(1, 11)]
+    assert out["2025-03-10"][0].game_id == 20250310
+    assert len(seeded) == 1 and len(seeded[0]) == 10
+    assert memory_storage.exists("bucket", "schedules/2025-03-10.json")
+
+    # Cached dates are not fetched again, individually or as a range
+    schedule.clear_schedule_cache()
+    assert schedule.get_schedule("2025-03-04")[0].game_id == 20250304
+    schedule.get_schedule_range("2025-03-02", "2025-03-09")
+    assert weeks == ["2025-03-01", "2025-03-08"]
+
+
+def test_schedule_range_does_not_pin_days_missing_from_the_week(
+    monkeypatch, memory_storage
+):
+    weeks = []
+
+    class WeekService:
+        def get_schedule_week(self, *, date):
+            weeks.append(date)
+            # 2025-03-02 is absent from the payload altogether
+            return {
+                "gameWeek": [
+                    {"date": "2025-03-01", "games": [_game(1, "OFF")]},
+                    {"date": "2025-03-03", "games": [_game(3, "OFF")]},
+                ]
+            }
+
+    monkeypatch.setattr(
+        schedule, "get_nhl_client", lambda: type("C", (), {"schedule": WeekService()})
+    )
+    monkeypatch.setattr(schedule, "apply_index_updates_bulk", lambda *a: None)
+
+    out = schedule.get_schedule_range("2025-03-01", "2025-03-03")
+
+    assert out["2025-03-02"] == [] and weeks == ["2025-03-01"]
+    assert not memory_storage.exists("bucket", "schedules/2025-03-02.json")
+    assert memory_storage.exists("bucket", "schedules/2025-03-03.json")
+    expires_at, _ = schedule._memo[("bucket", "2025-03-02")]
+    assert expires_at != float("inf")
+    assert schedule._memo[("bucket", "2025-03-01")][0] == float("inf")
@@ -0,0 +1,129 @@
+"""Tests for engine.season_index."""
+
+import pytest
+
+import config
+from engine import date_index, season_index
+from engine.date_index import IndexUpdate
+from gcp_ingestion import MemoryBackend, override_storage_backend
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self) -> None:
+        super().__init__()
+        self.gets = 0
+
+    def get(self, bucket, blob, **kwargs):
+        self.gets += 1
+        return super().get(bucket, blob, **kwargs)
+
+
+@pytest.fixture
+def backend():
+    backend = CountingBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        yield backend
+
+
+def _seed(date, *game_ids, artifact=None):
+    date_index.apply_index_updates(
+        "bucket",
+        date,
+        [IndexUpdate(game_id=gid, artifact=artifact) for gid in game_ids],
+    )
+
+
+def test_range_queries_read_one_shard_per_month(backend):
+    _seed("2025-03-30", 1, 2, artifact="raw_pbp")
+    _seed("2025-04-01", 3, 4)
+    _seed("2025-04-02", 5, artifact="raw_pbp")
+    date_index.mark_artifact("bucket", date="2025-04-01", game_id=3, artifact="raw_pbp")
+    backend.gets = 0
+
+    missing = season_index.list_games_missing(
+        "bucket", "2025-03-01", "2025-04-30", "raw_pbp"
+    )
+
+    assert missing == {"2025-04-01": [4]}
+    assert backend.gets == 2  # March and April shards, no per-date reads
+
+
+def test_range_is_inclusive_and_trims_to_dates(backend):
+    _seed("2025-04-01", 1)
+    _seed("2025-04-02", 2)
+    _seed("2025-04-03", 3)
+
+    index = season_index.load_range("bucket", "2025-04-02", "2025-04-02")
+
+    assert list(index) == ["2025-04-02"]
+    assert list(index["2025-04-02"].games) == [2]
+
+
+def test_coverage_counts(backend):
+    _seed("2025-04-01", 1, 2, artifact="raw_pbp")
+    date_index.mark_artifact(
+        "bucket", date="2025-04-01", game_id=1, artifact="summary_ai"
+    )
+    _seed("2025-04-02", 3)
+
+    cov = season_index.coverage(
+        "bucket", "2025-04-01", "2025-04-02", "raw_pbp", "summary_ai"
+    )
+
+    assert cov.games == 3
+    assert cov.present == {"raw_pbp": 2, "summary_ai": 1}
+    assert cov.missing("summary_ai") == 2
+
+
+def test_stale_sync_does_not_regress_shard(backend):
+    _seed("2025-04-01", 1, artifact="raw_pbp")
+    stale = date_index.load_date_index("bucket", "2025-04-01")
+    _seed("2025-04-01", 1, artifact="raw_story")
+
+    season_index.sync_date("bucket", stale)
+
+    index = season_index.load_range("bucket", "2025-04-01", "2025-04-01")
+    assert index["2025-04-01"].has(1, "raw_story")
+
+
+def test_rebuild_month_from_date_indexes(backend):
+    _seed("2025-04-01", 1, artifact="raw_pbp")
+    _seed("2025-04-02", 2)
+    backend.delete("bucket", season_index.MONTH_INDEX_BLOB.format(month="2025-04"))
+
+    assert season_index.rebuild_month("bucket", "2025-04") == 2
+    assert season_index.list_games_missing(
+        "bucket", "2025-04-01", "2025-04-30", "raw_pbp"
+    ) == {"2025-04-02": [2]}
+
+
+def test_rebuild_keeps_newer_revision_synced_meanwhile(backend, monkeypatch):
+    _seed("2025-04-01", 1, artifact="raw_pbp")
+    real_download_many = season_index.download_many
+
+    def racing_download_many(bucket, blobs):
+        loaded = real_download_many(bucket, blobs)
+        # A worker updates the date (and its shard) after the rebuild read it
+        date_index.mark_artifact(
+            "bucket", date="2025-04-01", game_id=1, artifact="raw_story"
+        )
+        return loaded
+
+    monkeypatch.setattr(season_index, "download_many", racing_download_many)
+
+    assert season_index.rebuild_month("bucket", "2025-04") == 1
+    index = season_index.load_range("bucket", "2025-04-01", "2025-04-01")
+    assert index["2025-04-01"].has(1, "raw_story")
+
+
+def test_months_between_crosses_year_end():
+    assert season_index._months_between("2024-11-15", "2025-02-01") == [
+        "2024-11",
+        "2024-12",
+        "2025-01",
+        "2025-02",
+    ]
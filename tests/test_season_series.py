@@ -19,8 +19,25 @@ sys.modules.setdefault("google.cloud.storage", fake_storage)
 sys.modules.setdefault("google.api_core", fake_google_api_core)
 sys.modules.setdefault("google.api_core.exceptions", fake_exceptions)
 
+import pytest  # noqa: E402
+
+import config  # noqa: E402
 import data_fetch.season_series as series_mod  # noqa: E402
 from data_fetch.season_series import SeasonSeriesFetchError, get_season_series  # noqa: E402
+from gcp_ingestion import MemoryBackend, override_storage_backend  # noqa: E402
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_storage():
+    series_mod.clear_season_series_cache()
+    backend = MemoryBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        yield backend
+    series_mod.clear_season_series_cache()
 
 
 def _fake_right_rail(response: dict):
@@ -35,7 +52,9 @@ def test_get_season_series_extracts_series_and_wins(monkeypatch):
         "seasonSeriesWins": {"awayTeamWins": 1, "homeTeamWins": 1},
         "gameInfo": {},
     }
-    monkeypatch.setattr(series_mod, "NHLClient", lambda: _fake_right_rail(response))
+    monkeypatch.setattr(
+        series_mod, "get_nhl_client", lambda: _fake_right_rail(response)
+    )
 
     result = get_season_series(2024020001)
 
@@ -45,7 +64,7 @@ def test_get_season_series_extracts_series_and_wins(monkeypatch):
 
 
 def test_get_season_series_handles_missing_keys(monkeypatch):
-    monkeypatch.setattr(series_mod, "NHLClient", lambda: _fake_right_rail({}))
+    monkeypatch.setattr(series_mod, "get_nhl_client", lambda: _fake_right_rail({}))
 
     result = get_season_series(2024020001)
 
@@ -54,7 +73,7 @@ def test_get_season_series_handles_missing_keys(monkeypatch):
 
 
 def test_get_season_series_handles_none_response(monkeypatch):
-    monkeypatch.setattr(series_mod, "NHLClient", lambda: _fake_right_rail(None))
+    monkeypatch.setattr(series_mod, "get_nhl_client", lambda: _fake_right_rail(None))
 
     result = get_season_series(2024020001)
 
@@ -64,7 +83,9 @@ def test_get_season_series_handles_none_response(monkeypatch):
 
 def test_get_season_series_raises_on_client_error(monkeypatch):
     monkeypatch.setattr(
-        series_mod, "NHLClient", lambda: (_ for _ in ()).throw(RuntimeError("fail"))
+        series_mod,
+        "get_nhl_client",
+        lambda: (_ for _ in ()).throw(RuntimeError("fail")),
     )
 
     import pytest
@@ -79,7 +100,7 @@ def test_get_season_series_raises_on_api_error(monkeypatch):
 
     monkeypatch.setattr(
         series_mod,
-        "NHLClient",
+        "get_nhl_client",
         lambda: SimpleNamespace(game_center=SimpleNamespace(right_rail=bad_right_rail)),
     )
 
@@ -87,3 +108,88 @@ def test_get_season_series_raises_on_api_error(monkeypatch):
 
     with pytest.raises(SeasonSeriesFetchError, match="Failed to fetch right_rail"):
         get_season_series(2024020001)
+
+
+def _series_game(game_id, away, home, state, date="2024-10-12"):
+    return {
+        "id": game_id,
+        "gameDate": date,
+        "gameState": state,
+        "awayTeam": {"abbrev": away},
+        "homeTeam": {"abbrev": home},
+    }
+
+
+def test_final_game_series_is_persisted_and_shared(monkeypatch, memory_storage):
+    calls = []
+    response = {
+        "seasonSeries": [
+            _series_game(2024020001, "MTL", "COL", "OFF"),
+            _series_game(2024020002, "COL", "MTL", "OFF"),
+        ],
+        "seasonSeriesWins": {"awayTeamWins": 2, "homeTeamWins": 0},
+    }
+
+    def right_rail(game_id):
+        calls.append(game_id)
+        return response
+
+    monkeypatch.setattr(
+        series_mod,
+        "get_nhl_client",
+        lambda: SimpleNamespace(game_center=SimpleNamespace(right_rail=right_rail)),
+    )
+
+    first = get_season_series(2024020001)
+    sibling = get_season_series(2024020002)
+
+    assert calls == ["2024020001"]
+    assert first["seasonSeriesWins"] == {"awayTeamWins": 2, "homeTeamWins": 0}
+    # Teams are swapped in the sibling game, so are the win counts
+    assert sibling["seasonSeriesWins"] == {"awayTeamWins": 0, "homeTeamWins": 2}
+    assert memory_storage.exists("bucket", "raw/season_series/2024020001.json")
+    # The sibling's copy is borrowed, so it expires instead of being pinned
+    assert series_mod._memo[2024020002][0] != float("inf")
+    assert series_mod._memo[2024020001][0] == float("inf")
+
+    series_mod.clear_season_series_cache()
+    assert get_season_series(2024020001) == first
+    assert calls == ["2024020001"]
+
+
+def test_unfinished_game_series_is_not_persisted(monkeypatch, memory_storage):
+    response = {"seasonSeries": [_series_game(2024020001, "MTL", "COL", "LIVE")]}
+    monkeypatch.setattr(
+        series_mod, "get_nhl_client", lambda: _fake_right_rail(response)
+    )
+
+    get_season_series(2024020001)
+
+    assert not memory_storage.exists("bucket", "raw/season_series/2024020001.json")
+
+
+def test_series_is_not_shared_with_games_on_other_dates(monkeypatch, memory_storage):
+    calls = []
+    response = {
+        "seasonSeries": [
+            _series_game(2024020001, "MTL", "COL", "OFF", date="2024-10-12"),
+            _series_game(2024020500, "COL", "MTL", "OFF", date="2025-01-20"),
+        ],
+        "seasonSeriesWins": {"awayTeamWins": 1, "homeTeamWins": 1},
+    }
+
+    def right_rail(game_id):
+        calls.append(game_id)
+        return response
+
+    monkeypatch.setattr(
+        series_mod,
+        "get_nhl_client",
+        lambda: SimpleNamespace(game_center=SimpleNamespace(right_rail=right_rail)),
+    )
+
+    get_season_series(2024020500)
+    get_season_series(2024020001)
+
+    assert calls == ["2024020500", "2024020001"]
+    assert memory_storage.exists("bucket", "raw/season_series/2024020001.json")
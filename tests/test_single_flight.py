@@ -0,0 +1,95 @@
+"""Tests for data_fetch.single_flight."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from data_fetch import single_flight
+
+
+def _run_concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_callers_share_one_call():
+    release = threading.Event()
+    calls, results = [], []
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"plays": []}
+
+    def caller():
+        results.append(single_flight.coalesce(("raw_pbp", 1), fetch))
+
+    waiter = threading.Thread(target=_run_concurrently, args=(6, caller))
+    waiter.start()
+    while single_flight.in_flight() == 0:
+        pass
+    time.sleep(0.05)  # let the other callers join the in-flight call
+    release.set()
+    waiter.join()
+
+    assert len(calls) == 1
+    assert len(results) == 6 and all(r is results[0] for r in results)
+    assert single_flight.in_flight() == 0
+
+    # Finished calls are not cached
+    single_flight.coalesce(("raw_pbp", 1), fetch)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter():
+    release = threading.Event()
+    errors = []
+
+    def fetch():
+        release.wait(1)
+        raise RuntimeError("boom")
+
+    def caller():
+        try:
+            single_flight.coalesce(("raw_story", 2), fetch)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    waiter = threading.Thread(target=_run_concurrently, args=(3, caller))
+    waiter.start()
+    while single_flight.in_flight() == 0:
+        pass
+    time.sleep(0.05)  # let the other callers join the in-flight call
+    release.set()
+    waiter.join()
+
+    assert len(errors) == 3
+    with pytest.raises(ValueError):
+        single_flight.coalesce(
+            ("raw_story", 2), lambda: (_ for _ in ()).throw(ValueError())
+        )
+
+
+def test_async_callers_share_one_task():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"summary": {}}
+
+    async def run():
+        return await asyncio.gather(
+            *(single_flight.coalesce_async(("raw_story", 3), fetch) for _ in range(5)),
+            single_flight.coalesce_async(("raw_story", 4), fetch),
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 2
+    assert all(r is results[0] for r in results[:5])
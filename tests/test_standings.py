@@ -19,8 +19,25 @@ sys.modules.setdefault("google.cloud.storage", fake_storage)
 sys.modules.setdefault("google.api_core", fake_google_api_core)
 sys.modules.setdefault("google.api_core.exceptions", fake_exceptions)
 
+import pytest  # noqa: E402
+
+import config  # noqa: E402
 import data_fetch.standings as standings_mod  # noqa: E402
 from data_fetch.standings import StandingsFetchError, get_standings  # noqa: E402
+from gcp_ingestion import MemoryBackend, override_storage_backend  # noqa: E402
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_storage():
+    standings_mod.clear_standings_cache()
+    backend = MemoryBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        yield backend
+    standings_mod.clear_standings_cache()
 
 
 def _make_entry(abbrev: str, div_rank: int = 1, div: str = "Atlantic") -> dict:
@@ -38,7 +55,7 @@ def _make_entry(abbrev: str, div_rank: int = 1, div: str = "Atlantic") -> dict:
 
 
 def _fake_client(entries: list):
-    """Return a fake NHLClient whose standings.get_standings returns the given entries."""
+    """Return a fake NHL client whose standings.get_standings returns the given entries."""
     return SimpleNamespace(
         standings=SimpleNamespace(
             get_standings=lambda date=None, **kw: {"standings": entries}
@@ -48,7 +65,9 @@ def _fake_client(entries: list):
 
 def test_get_standings_filters_to_two_teams(monkeypatch):
     all_entries = [_make_entry("MTL"), _make_entry("COL"), _make_entry("TOR")]
-    monkeypatch.setattr(standings_mod, "NHLClient", lambda: _fake_client(all_entries))
+    monkeypatch.setattr(
+        standings_mod, "get_nhl_client", lambda: _fake_client(all_entries)
+    )
 
     result = get_standings("2025-04-25", home_abbr="MTL", away_abbr="COL")
 
@@ -60,7 +79,7 @@ def test_get_standings_filters_to_two_teams(monkeypatch):
 def test_get_standings_handles_dict_abbrev(monkeypatch):
     entry = _make_entry("MTL")
     entry["teamAbbrev"] = {"default": "MTL"}
-    monkeypatch.setattr(standings_mod, "NHLClient", lambda: _fake_client([entry]))
+    monkeypatch.setattr(standings_mod, "get_nhl_client", lambda: _fake_client([entry]))
 
     result = get_standings("2025-04-25", home_abbr="MTL", away_abbr="COL")
 
@@ -70,7 +89,7 @@ def test_get_standings_handles_dict_abbrev(monkeypatch):
 
 def test_get_standings_returns_empty_when_no_match(monkeypatch):
     entries = [_make_entry("TOR"), _make_entry("BOS")]
-    monkeypatch.setattr(standings_mod, "NHLClient", lambda: _fake_client(entries))
+    monkeypatch.setattr(standings_mod, "get_nhl_client", lambda: _fake_client(entries))
 
     result = get_standings("2025-04-25", home_abbr="MTL", away_abbr="COL")
 
@@ -80,7 +99,7 @@ def test_get_standings_returns_empty_when_no_match(monkeypatch):
 def test_get_standings_returns_empty_when_api_returns_none(monkeypatch):
     monkeypatch.setattr(
         standings_mod,
-        "NHLClient",
+        "get_nhl_client",
         lambda: SimpleNamespace(
             standings=SimpleNamespace(get_standings=lambda **kw: {"standings": None})
         ),
@@ -94,7 +113,7 @@ def test_get_standings_returns_empty_when_api_returns_none(monkeypatch):
 def test_get_standings_returns_empty_when_response_is_none(monkeypatch):
     monkeypatch.setattr(
         standings_mod,
-        "NHLClient",
+        "get_nhl_client",
         lambda: SimpleNamespace(
             standings=SimpleNamespace(get_standings=lambda **kw: None)
         ),
@@ -109,7 +128,7 @@ def test_get_standings_raises_on_api_error(monkeypatch):
     def bad_client():
         raise RuntimeError("network error")
 
-    monkeypatch.setattr(standings_mod, "NHLClient", bad_client)
+    monkeypatch.setattr(standings_mod, "get_nhl_client", bad_client)
 
     import pytest
 
@@ -123,7 +142,7 @@ def test_get_standings_raises_on_fetch_error(monkeypatch):
 
     monkeypatch.setattr(
         standings_mod,
-        "NHLClient",
+        "get_nhl_client",
         lambda: SimpleNamespace(
             standings=SimpleNamespace(get_standings=bad_get_standings)
         ),
@@ -133,3 +152,95 @@ def test_get_standings_raises_on_fetch_error(monkeypatch):
 
     with pytest.raises(StandingsFetchError, match="Failed to fetch standings"):
         get_standings("2025-04-25", home_abbr="MTL", away_abbr="COL")
+
+
+def test_league_table_is_fetched_once_per_date(monkeypatch, memory_storage):
+    calls = []
+
+    def fake_get_standings(date=None, **kw):
+        calls.append(date)
+        return {
+            "standings": [_make_entry("MTL"), _make_entry("COL"), _make_entry("TOR")]
+        }
+
+    monkeypatch.setattr(
+        standings_mod,
+        "get_nhl_client",
+        lambda: SimpleNamespace(
+            standings=SimpleNamespace(get_standings=fake_get_standings)
+        ),
+    )
+
+    first = get_standings("2025-04-25", home_abbr="MTL", away_abbr="COL")
+    second = get_standings("2025-04-25", home_abbr="TOR", away_abbr="COL")
+
+    assert calls == ["2025-04-25"]
+    assert {e["teamAbbrev"] for e in first} == {"MTL", "COL"}
+    assert {e["teamAbbrev"] for e in second} == {"TOR", "COL"}
+    assert memory_storage.exists("bucket", "raw/standings/2025-04-25.json")
+
+    # A fresh process reads the persisted copy instead of calling the API
+    standings_mod.clear_standings_cache()
+    get_standings("2025-04-25", home_abbr="MTL", away_abbr="COL")
+    assert calls == ["2025-04-25"]
+
+
+def test_unsettled_date_is_not_persisted(monkeypatch, memory_storage):
+    from datetime import date
+
+    today = date.today().isoformat()
+    monkeypatch.setattr(
+        standings_mod, "get_nhl_client", lambda: _fake_client([_make_entry("MTL")])
+    )
+
+    get_standings(today, home_abbr="MTL", away_abbr="COL")
+
+    assert not memory_storage.exists("bucket", f"raw/standings/{today}.json")
+
+
+def test_fetch_locks_do_not_grow_with_dates():
+    from data_fetch import standings
+
+    locks = {
+        id(standings._fetch_lock(f"2024-{m:02d}-{d:02d}"))
+        for m in range(1, 13)
+        for d in range(1, 29)
+    }
+
+    assert len(locks) <= standings._FETCH_LOCK_STRIPES
+    assert standings._fetch_lock("2025-04-25") is standings._fetch_lock("2025-04-25")
+
+
+def test_async_callers_share_one_download_per_date(monkeypatch, memory_storage):
+    import asyncio
+
+    calls = []
+
+    async def fake_get_standings(date=None, **kw):
+        calls.append(date)
+        await asyncio.sleep(0.01)  # let the other callers arrive
+        return {"standings": [_make_entry("MTL"), _make_entry("COL")]}
+
+    monkeypatch.setattr(
+        standings_mod,
+        "get_async_nhl_client",
+        lambda: SimpleNamespace(
+            standings=SimpleNamespace(get_standings=fake_get_standings)
+        ),
+    )
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                standings_mod.get_standings_async(
+                    "2025-04-25", home_abbr="MTL", away_abbr="COL"
+                )
+                for _ in range(5)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == ["2025-04-25"]
+    assert all(len(r) == 2 for r in results)
+    assert memory_storage.exists("bucket", "raw/standings/2025-04-25.json")
@@ -1,33 +1,90 @@
+import gzip
+import json
+import types
+
 import pytest
 
+import config
+
 from gcp_ingestion import (
+    GenerationMismatchError,
     check_file_exists,
     download_json,
+    download_json_or_none,
     download_text,
+    download_json_with_generation,
+    download_json_with_metadata,
+    download_text_or_none,
     override_storage_client,
     reset_storage_client,
     upload_json,
     upload_text,
 )
+from gcp_ingestion import backends
+
+
+# Stand-ins for google.api_core's errors, which other test modules stub away
+# (their NotFound is plain Exception, so it would swallow every failure)
+class NotFound(Exception):
+    pass
+
+
+class PreconditionFailed(Exception):
+    pass
+
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
 
 
 class FakeBlob:
+    """Mimics google-cloud-storage: a download fills in generation, encoding
+    and content type from the response headers, never custom metadata."""
+
     def __init__(self, name: str, store: dict[str, dict]):
         self.name = name
         self._store = store
         self._meta = store.setdefault(name, {})
+        self.generation = None
 
     def exists(self) -> bool:
         return "data" in self._meta
 
-    def download_as_text(self) -> str:
+    def reload(self) -> None:
         if "data" not in self._meta:
-            raise FileNotFoundError(self.name)
+            raise NotFound(self.name)
+        self.content_type = self._meta["content_type"]
+        self.content_encoding = self._meta["content_encoding"]
+        self.metadata = self._meta["metadata"]
+        self.generation = self._meta["generation"]
+
+    def download_as_bytes(
+        self, raw_download: bool = False, if_generation_match=None
+    ) -> bytes:
+        if "data" not in self._meta:
+            raise NotFound(self.name)
+        if (
+            if_generation_match is not None
+            and if_generation_match != self._meta["generation"]
+        ):
+            raise PreconditionFailed(self.name)
+        self.content_type = self._meta["content_type"]
+        self.content_encoding = self._meta["content_encoding"]
+        self.generation = self._meta["generation"]
         return self._meta["data"]
 
-    def upload_from_string(self, *, data: str, content_type: str) -> None:
+    def upload_from_string(
+        self, *, data: bytes, content_type: str, if_generation_match=None
+    ) -> None:
+        current = self._meta.get("generation", 0) if "data" in self._meta else 0
+        if if_generation_match is not None and if_generation_match != current:
+            raise PreconditionFailed(self.name)
         self._meta["data"] = data
         self._meta["content_type"] = content_type
+        self._meta["content_encoding"] = getattr(self, "content_encoding", None)
+        self._meta["metadata"] = getattr(self, "metadata", None)
+        self._meta["generation"] = self._meta.get("generation", 0) + 1
 
 
 class FakeBucket:
@@ -37,6 +94,14 @@ class FakeBucket:
     def blob(self, name: str) -> FakeBlob:
         return FakeBlob(name, self._store)
 
+    def get_blob(self, name: str):
+        blob = self.blob(name)
+        try:
+            blob.reload()
+        except NotFound:
+            return None
+        return blob
+
 
 class FakeClient:
     def __init__(self) -> None:
@@ -47,9 +112,15 @@ class FakeClient:
 
 
 @pytest.fixture
-def fake_client():
+def fake_client(monkeypatch):
+    monkeypatch.setattr(backends, "NotFound", NotFound)
+    monkeypatch.setattr(
+        backends,
+        "google_exceptions",
+        types.SimpleNamespace(PreconditionFailed=PreconditionFailed),
+    )
     client = FakeClient()
-    with override_storage_client(client):
+    with config.override_settings(TEST_SETTINGS), override_storage_client(client):
         yield client
     reset_storage_client()
 
@@ -75,3 +146,84 @@ def test_upload_and_download_text(fake_client):
 
 def test_missing_blob_returns_false(fake_client):
     assert not check_file_exists("bucket", "missing.txt")
+
+
+def test_download_or_none_returns_payload(fake_client):
+    upload_json("bucket", "path.json", {"hello": "world"})
+    upload_text("bucket", "note.txt", "hi")
+
+    assert download_json_or_none("bucket", "path.json") == {"hello": "world"}
+    assert download_text_or_none("bucket", "note.txt") == "hi"
+
+
+def test_download_or_none_returns_none_when_missing(fake_client):
+    assert download_json_or_none("bucket", "missing.json") is None
+    assert download_text_or_none("bucket", "missing.txt") is None
+
+
+def test_upload_json_writes_minified_gzip_with_codec_metadata(fake_client):
+    upload_json("bucket", "path.json", {"hello": "world"})
+
+    meta = fake_client.buckets["bucket"]._store["path.json"]
+    assert meta["content_encoding"] == "gzip"
+    assert meta["metadata"] == {"codec": "gzip"}
+    assert gzip.decompress(meta["data"]) == b'{"hello":"world"}'
+
+
+def test_download_json_reads_legacy_pretty_printed_blobs(fake_client):
+    legacy = json.dumps({"hello": "world"}, indent=2).encode("utf-8")
+    fake_client.bucket("bucket").blob("old.json").upload_from_string(
+        data=legacy, content_type="application/json"
+    )
+
+    assert download_json("bucket", "old.json") == {"hello": "world"}
+
+
+def test_custom_metadata_is_read_back_from_gcs(fake_client):
+    upload_json("bucket", "live.json", {"a": 1}, metadata={"gameState": "LIVE"})
+
+    payload, metadata = download_json_with_metadata("bucket", "live.json")
+
+    assert payload == {"a": 1}
+    assert metadata["gameState"] == "LIVE" and metadata["codec"] == "gzip"
+
+
+def test_plain_reads_take_a_single_request(fake_client, monkeypatch):
+    upload_json("bucket", "doc.json", {"v": 1}, metadata={"tag": "one"})
+    bucket = fake_client.bucket("bucket")
+
+    def no_resource_reads(name):
+        raise AssertionError("plain reads must not fetch the object resource")
+
+    monkeypatch.setattr(bucket, "get_blob", no_resource_reads)
+
+    assert download_json_or_none("bucket", "doc.json") == {"v": 1}
+    assert download_json_with_generation("bucket", "doc.json") == ({"v": 1}, 1)
+
+
+def test_download_is_pinned_to_the_generation_whose_metadata_was_read(
+    fake_client, monkeypatch
+):
+    upload_json("bucket", "doc.json", {"v": 1}, metadata={"tag": "one"})
+    bucket = fake_client.bucket("bucket")
+    real_get_blob = bucket.get_blob
+    replaced = []
+
+    def racing_get_blob(name):
+        blob = real_get_blob(name)
+        if not replaced:  # another writer lands between the two requests
+            replaced.append(True)
+            upload_json("bucket", "doc.json", {"v": 2}, metadata={"tag": "two"})
+        return blob
+
+    monkeypatch.setattr(bucket, "get_blob", racing_get_blob)
+
+    assert download_json_with_metadata("bucket", "doc.json")[0] == {"v": 2}
+    assert download_json_with_metadata("bucket", "doc.json")[1]["tag"] == "two"
+
+
+def test_conditional_upload_maps_precondition_failures(fake_client):
+    upload_json("bucket", "idx.json", {"v": 1}, if_generation_match=0)
+
+    with pytest.raises(GenerationMismatchError):
+        upload_json("bucket", "idx.json", {"v": 2}, if_generation_match=0)
@@ -0,0 +1,146 @@
+"""Tests for gcp_ingestion.backends and backend selection."""
+
+import threading
+
+import pytest
+
+import config
+from engine import date_index
+from engine.date_index import IndexUpdate
+from gcp_ingestion import (
+    GenerationMismatchError,
+    LocalBackend,
+    MemoryBackend,
+    check_file_exists,
+    delete_blob,
+    download_json,
+    download_text_or_none,
+    get_storage_backend,
+    list_blobs,
+    override_storage_backend,
+    reset_storage_backend,
+    upload_json,
+    upload_text,
+)
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+
+@pytest.fixture(params=["memory", "local"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return LocalBackend(tmp_path)
+
+
+def test_put_get_roundtrip_keeps_content_type(backend):
+    backend.put("bucket", "a/b.json", b"{}", content_type="application/json")
+
+    stored = backend.get("bucket", "a/b.json")
+
+    assert stored is not None
+    assert stored.data == b"{}"
+    assert stored.content_type == "application/json"
+
+
+def test_get_missing_returns_none(backend):
+    assert backend.get("bucket", "missing.json") is None
+    assert not backend.exists("bucket", "missing.json")
+
+
+def test_list_filters_by_prefix_and_bucket(backend):
+    backend.put("bucket", "raw/1.json", b"1")
+    backend.put("bucket", "raw/2.json", b"2")
+    backend.put("bucket", "derived/3.txt", b"3")
+    backend.put("other", "raw/4.json", b"4")
+
+    assert backend.list("bucket", "raw/") == ["raw/1.json", "raw/2.json"]
+    assert len(backend.list("bucket")) == 3
+
+
+def test_delete(backend):
+    backend.put("bucket", "x.txt", b"x")
+
+    assert backend.delete("bucket", "x.txt") is True
+    assert backend.delete("bucket", "x.txt") is False
+    assert backend.get("bucket", "x.txt") is None
+
+
+def test_generation_match_writes(backend):
+    backend.put("bucket", "idx.json", b"1", if_generation_match=0)
+    generation = backend.get("bucket", "idx.json").generation
+
+    with pytest.raises(GenerationMismatchError):
+        backend.put("bucket", "idx.json", b"x", if_generation_match=0)
+
+    backend.put("bucket", "idx.json", b"2", if_generation_match=generation)
+
+    with pytest.raises(GenerationMismatchError):
+        backend.put("bucket", "idx.json", b"3", if_generation_match=generation)
+    assert backend.get("bucket", "idx.json").data == b"2"
+    assert backend.get("bucket", "idx.json").generation > generation
+
+
+def test_concurrent_index_updates_lose_nothing(backend, monkeypatch):
+    # Every racing writer retries until it lands; none may be overwritten
+    monkeypatch.setattr(date_index, "_MAX_WRITE_ATTEMPTS", 100)
+    monkeypatch.setattr(date_index, "_RETRY_BASE_DELAY", 0.001)
+    start = threading.Barrier(40)
+
+    def mark(game_id):
+        start.wait()
+        date_index.apply_index_updates(
+            "bucket", "2025-04-01", [IndexUpdate(game_id=game_id, artifact="raw_pbp")]
+        )
+
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        threads = [threading.Thread(target=mark, args=(g,)) for g in range(40)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        index = date_index.load_date_index("bucket", "2025-04-01")
+
+    assert index.complete("raw_pbp") == list(range(40))
+
+
+def test_local_backend_rejects_escaping_names(tmp_path):
+    backend = LocalBackend(tmp_path)
+
+    with pytest.raises(ValueError):
+        backend.put("bucket", "../../etc/passwd", b"nope")
+
+
+def test_storage_helpers_use_override_backend():
+    backend = MemoryBackend()
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        upload_json("bucket", "doc.json", {"a": 1})
+        upload_text("bucket", "note.md", "# hi", content_type="text/markdown")
+
+        assert check_file_exists("bucket", "doc.json")
+        assert download_json("bucket", "doc.json") == {"a": 1}
+        assert download_text_or_none("bucket", "note.md") == "# hi"
+        assert list_blobs("bucket") == ["doc.json", "note.md"]
+        assert delete_blob("bucket", "note.md")
+
+    assert backend.get("bucket", "note.md") is None
+
+
+def test_backend_selected_from_settings(tmp_path):
+    settings = config.Settings(
+        gcs_bucket_name="bucket",
+        openai_api_key="k",
+        openai_model="gpt-4o-mini",
+        storage_backend="local",
+        storage_local_root=str(tmp_path),
+        raw_cache_max_bytes=0,
+    )
+    with config.override_settings(settings):
+        backend = get_storage_backend()
+        upload_text("bucket", "note.txt", "hi")
+
+    assert isinstance(backend, LocalBackend)
+    assert (tmp_path / "bucket" / "note.txt").read_text() == "hi"
+    reset_storage_backend()
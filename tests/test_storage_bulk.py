@@ -0,0 +1,71 @@
+"""Tests for gcp_ingestion.bulk."""
+
+import threading
+
+import config
+from gcp_ingestion import (
+    MemoryBackend,
+    download_many,
+    exists_many,
+    override_storage_backend,
+    upload_many,
+)
+
+TEST_SETTINGS = config.Settings(
+    gcs_bucket_name="bucket", openai_api_key="k", openai_model="gpt-4o-mini"
+)
+
+
+def test_upload_then_download_many():
+    backend = MemoryBackend()
+    payloads = {f"raw/{i}.json": {"id": i} for i in range(20)}
+    with config.override_settings(TEST_SETTINGS), override_storage_backend(backend):
+        uploaded = upload_many("bucket", payloads)
+        downloaded = download_many("bucket", [*payloads, "raw/missing.json"])
+
+    assert uploaded.ok
+    assert downloaded.ok
+    assert downloaded.results["raw/7.json"] == {"id": 7}
+    assert downloaded.results["raw/missing.json"] is None
+
+
+def test_exists_many_and_text_download():
+    backend = MemoryBackend()
+    backend.put("bucket", "a.md", b"# a")
+    with override_storage_backend(backend):
+        exists = exists_many("bucket", ["a.md", "b.md"])
+        texts = download_many("bucket", ["a.md"], as_text=True)
+
+    assert exists.results == {"a.md": True, "b.md": False}
+    assert texts.results == {"a.md": "# a"}
+
+
+class _FlakyBackend(MemoryBackend):
+    def __init__(self, release: threading.Event) -> None:
+        super().__init__()
+        self.release = release
+
+    def get(self, bucket, blob, **kwargs):
+        if blob == "bad.json":
+            raise RuntimeError("boom")
+        if blob == "slow.json":
+            self.release.wait(5)
+        return super().get(bucket, blob, **kwargs)
+
+
+def test_per_item_errors_and_deadline():
+    release = threading.Event()
+    backend = _FlakyBackend(release)
+    backend.put("bucket", "good.json", b"{}")
+    try:
+        with override_storage_backend(backend):
+            result = download_many(
+                "bucket", ["good.json", "bad.json", "slow.json"], timeout=0.2
+            )
+    finally:
+        release.set()
+
+    assert result.results == {"good.json": {}}
+    assert isinstance(result.errors["bad.json"], RuntimeError)
+    assert result.timed_out == ["slow.json"]
+    assert not result.ok
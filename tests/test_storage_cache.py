@@ -0,0 +1,136 @@
+"""Tests for gcp_ingestion.cache.TieredCacheBackend."""
+
+import dataclasses
+
+import config
+from gcp_ingestion import (
+    MemoryBackend,
+    TieredCacheBackend,
+    download_json_or_none,
+    get_cache_stats,
+    get_storage_backend,
+    override_storage_backend,
+    reset_storage_backend,
+    upload_json,
+)
+from gcp_ingestion.backends import StoredBlob
+from gcp_ingestion.cache import ByteLRU
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self) -> None:
+        super().__init__()
+        self.gets = 0
+
+    def get(self, bucket, blob, **kwargs):
+        self.gets += 1
+        return super().get(bucket, blob, **kwargs)
+
+
+def test_memory_tier_serves_repeat_reads():
+    inner = CountingBackend()
+    inner.put("b", "raw/play_by_play/1.json", b'{"plays": []}')
+    cache = TieredCacheBackend(inner, max_memory_bytes=1024)
+
+    with override_storage_backend(cache):
+        for _ in range(3):
+            assert download_json_or_none("b", "raw/play_by_play/1.json") == {
+                "plays": []
+            }
+
+    assert inner.gets == 1
+    stats = cache.stats()
+    assert stats.misses == 1
+    assert stats.memory_hits == 2
+
+
+def test_non_raw_blobs_bypass_cache():
+    inner = CountingBackend()
+    inner.put("b", "indexes/by_date/2025-04-25.json", b"{}")
+    cache = TieredCacheBackend(inner, max_memory_bytes=1024)
+
+    cache.get("b", "indexes/by_date/2025-04-25.json")
+    cache.get("b", "indexes/by_date/2025-04-25.json")
+
+    assert inner.gets == 2
+    assert cache.stats().misses == 0
+
+
+def test_write_through_populates_cache():
+    inner = CountingBackend()
+    cache = TieredCacheBackend(inner, max_memory_bytes=1024)
+
+    with override_storage_backend(cache):
+        upload_json("b", "raw/game_story/1.json", {"summary": {}})
+        assert download_json_or_none("b", "raw/game_story/1.json") == {"summary": {}}
+
+    assert inner.gets == 0
+
+
+def test_metadata_reads_skip_copies_filled_without_metadata():
+    class GCSLikeBackend(CountingBackend):
+        # Plain GCS reads come back without custom metadata
+        def get(self, bucket, blob, *, with_metadata=False):
+            stored = super().get(bucket, blob)
+            if stored is None or with_metadata:
+                return stored
+            return dataclasses.replace(stored, metadata={})
+
+    inner = GCSLikeBackend()
+    inner.put("b", "raw/a.json", b"{}", metadata={"gameState": "LIVE"})
+    cache = TieredCacheBackend(inner, max_memory_bytes=1024)
+
+    assert cache.get("b", "raw/a.json").metadata == {}
+    hit = cache.get("b", "raw/a.json", with_metadata=True)
+    assert hit.metadata == {"gameState": "LIVE"} and inner.gets == 2
+    assert cache.get("b", "raw/a.json", with_metadata=True) is hit
+    assert inner.gets == 2
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    inner = CountingBackend()
+    inner.put("b", "raw/a.json", b"a" * 60)
+    inner.put("b", "raw/b.json", b"b" * 60)
+    cache = TieredCacheBackend(inner, max_memory_bytes=100, disk_dir=str(tmp_path))
+
+    cache.get("b", "raw/a.json")
+    cache.get("b", "raw/b.json")  # evicts a.json from memory
+    assert cache.get("b", "raw/a.json").data == b"a" * 60
+
+    stats = cache.stats()
+    assert inner.gets == 2
+    assert stats.disk_hits == 1
+    assert stats.evictions >= 1
+
+
+def test_byte_lru_evicts_least_recently_used():
+    lru = ByteLRU(max_bytes=10)
+    lru.put(("b", "1"), StoredBlob(data=b"12345"))
+    lru.put(("b", "2"), StoredBlob(data=b"12345"))
+    lru.get(("b", "1"))
+    lru.put(("b", "3"), StoredBlob(data=b"12345"))
+
+    assert lru.get(("b", "2")) is None
+    assert lru.get(("b", "1")) is not None
+    assert lru.size_bytes == 10
+    assert lru.evictions == 1
+
+
+def test_byte_lru_skips_oversized_entries():
+    lru = ByteLRU(max_bytes=4)
+    lru.put(("b", "big"), StoredBlob(data=b"12345"))
+
+    assert len(lru) == 0
+
+
+def test_settings_enable_cache_by_default():
+    settings = config.Settings(
+        gcs_bucket_name="bucket",
+        openai_api_key="k",
+        openai_model="gpt-4o-mini",
+        storage_backend="memory",
+    )
+    with config.override_settings(settings):
+        assert isinstance(get_storage_backend(), TieredCacheBackend)
+        assert get_cache_stats() is not None
+    reset_storage_backend()
@@ -0,0 +1,43 @@
+"""Tests for gcp_ingestion.codec."""
+
+import json
+
+import pytest
+
+from gcp_ingestion import codec
+
+PAYLOAD = {"plays": [{"eventId": i, "typeDescKey": "hit"} for i in range(50)]}
+
+
+@pytest.mark.parametrize("name", ["identity", "gzip"])
+def test_roundtrip(name):
+    encoded = codec.encode_json(PAYLOAD, name)
+
+    assert encoded.metadata == {"codec": name}
+    assert json.loads(codec.decode_bytes(encoded.data)) == PAYLOAD
+
+
+def test_gzip_is_much_smaller_than_pretty_json():
+    pretty = json.dumps(PAYLOAD, indent=2).encode("utf-8")
+    encoded = codec.encode_json(PAYLOAD, "gzip")
+
+    assert encoded.content_encoding == "gzip"
+    assert len(encoded.data) * 4 < len(pretty)
+
+
+def test_zstd_roundtrip():
+    pytest.importorskip("zstandard")
+    encoded = codec.encode_json(PAYLOAD, "zstd")
+
+    assert json.loads(codec.decode_bytes(encoded.data)) == PAYLOAD
+
+
+def test_decode_passes_through_legacy_json():
+    legacy = json.dumps(PAYLOAD, indent=2).encode("utf-8")
+
+    assert codec.decode_bytes(legacy) == legacy
+
+
+def test_unknown_codec_raises():
+    with pytest.raises(ValueError):
+        codec.encode_json(PAYLOAD, "brotli")
@@ -247,3 +247,40 @@ def test_summarize_game_fetch_failure_propagates(monkeypatch):
 
     with pytest.raises(RuntimeError, match="network error"):
         engine.summarize_game.summarize_game(5, use_ai=True)
+
+
+def test_concurrent_ai_requests_share_one_generation(monkeypatch):
+    import threading
+    import time
+
+    release = threading.Event()
+    generated = []
+
+    def fake_generate(*args, **kwargs):
+        generated.append(1)
+        release.wait(1)
+        return "ai summary"
+
+    _patch_ai_deps(monkeypatch, pbp={"plays": []})
+    monkeypatch.setattr("engine.summarize_game.generate_ai_summary", fake_generate)
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                engine.summarize_game.summarize_game(5, use_ai=True)
+            )
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while not generated:
+        pass
+    time.sleep(0.05)  # let the other requests join the in-flight run
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(generated) == 1
+    assert [r.summary_markdown for r in results] == ["ai summary"] * 4